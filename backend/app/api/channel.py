@@ -1,41 +1,147 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Body, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from ..services.youtube_service import YouTubeService
 from ..services.openai_service import OpenAIService
-from typing import Dict, Any
+from ..services.analytics_service import AnalyticsService
+from ..services.job_service import JobService
+from ..services.refresh_scheduler import RefreshScheduler
+from ..config import settings
+from ..models import Channel, Video, Comment, normalize_comments
+from ..responses import FastJSONResponse, dumps
+from typing import Dict, Any, AsyncIterator, List, Optional
+from datetime import datetime, timedelta, timezone
+import asyncio
 
 router = APIRouter()
 youtube_service = YouTubeService()
 openai_service = OpenAIService()
+analytics_service = AnalyticsService()
+job_service = JobService(youtube_service, openai_service, analytics_service, workers=settings.JOB_WORKERS)
+refresh_scheduler = RefreshScheduler(
+    youtube_service,
+    openai_service,
+    analytics_service,
+    daily_quota=settings.REFRESH_DAILY_QUOTA,
+    window=(settings.REFRESH_WINDOW_START, settings.REFRESH_WINDOW_END),
+    interval=settings.REFRESH_INTERVAL,
+    min_age=settings.REFRESH_MIN_AGE,
+    auto_track=settings.REFRESH_AUTO_TRACK,
+    access_half_life=settings.REFRESH_ACCESS_HALF_LIFE,
+    timezone=settings.ANALYTICS_TIMEZONE,
+)
+
+# 히스토리 다운샘플링 단위 -> 초
+HISTORY_BUCKETS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+
+# compact=true 이면 카운트를 숫자로, 길이를 초 단위로 변환한 모델로 응답하고
+# 채널 댓글은 비디오 정보를 한 번만 싣는 정규화 형식으로 보냅니다.
 
 @router.get("/channel/{channel_id}")
-async def get_channel_info(channel_id: str) -> Dict[str, Any]:
+async def get_channel_info(channel_id: str, compact: bool = False) -> Dict[str, Any]:
     channel_info = await youtube_service.get_channel_info(channel_id)
     if not channel_info:
         raise HTTPException(status_code=404, detail="Channel not found")
+    # 갱신 우선순위를 위해 채널이 열린 횟수를 기록
+    refresh_scheduler.record_access(channel_id)
+    if compact:
+        return FastJSONResponse(Channel.from_dict(channel_info))
     return channel_info
 
+@router.post("/channels/batch")
+async def get_channels_batch(
+    channel_ids: List[str] = Body(..., embed=True, min_length=1, max_length=500),
+    include_videos: bool = Body(False, embed=True),
+    max_videos: int = Body(50, embed=True, ge=1, le=500)
+):
+    channels = await youtube_service.get_channels_info(channel_ids)
+    result: Dict[str, Any] = {"channels": channels}
+    if include_videos:
+        result["videos"] = await youtube_service.get_channels_videos(channels, max_results=max_videos)
+    return result
+
 @router.get("/channel/{channel_id}/videos")
-async def get_channel_videos(channel_id: str):
-    videos = await youtube_service.get_channel_videos(channel_id)
+async def get_channel_videos(channel_id: str, incremental: bool = False, compact: bool = False):
+    videos = await youtube_service.get_channel_videos(channel_id, incremental=incremental)
     if not videos:
         raise HTTPException(status_code=404, detail="Videos not found")
+    if compact:
+        return FastJSONResponse([Video.from_dict(video) for video in videos])
     return videos
 
+@router.get("/channel/{channel_id}/videos/stream")
+async def stream_channel_videos(channel_id: str, format: str = "ndjson"):
+    return _stream_pages(youtube_service.iter_channel_videos(channel_id), format)
+
+@router.get("/channel/{channel_id}/metrics")
+async def get_channel_metrics(channel_id: str, incremental: bool = True, refresh: bool = False):
+    # 대시보드를 열 때마다 동기화하지 않도록 최근 동기화 결과를 재사용 (refresh 면 즉시 동기화).
+    # 추적 채널은 최근 갱신 창에서 미리 동기화한 결과를 다음 창까지 씀
+    max_age = 0 if refresh else refresh_scheduler.sync_max_age(channel_id, settings.VIDEO_SYNC_MAX_AGE)
+    videos = await youtube_service.get_channel_videos(channel_id, incremental=incremental, max_age=max_age)
+    if not videos:
+        raise HTTPException(status_code=404, detail="Videos not found")
+    return analytics_service.compute(videos)
+
+@router.get("/channel/{channel_id}/history")
+async def get_channel_history(
+    channel_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket: str = Query("day", pattern="^(hour|day|week)$"),
+    video_id: Optional[str] = None
+):
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=30)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    store = youtube_service.snapshot_store
+    bucket_seconds = HISTORY_BUCKETS[bucket]
+    try:
+        # 파일 스캔이 이벤트 루프를 막지 않도록 스레드에서 실행
+        channel, videos = await asyncio.gather(
+            asyncio.to_thread(store.channel_history, channel_id, start.timestamp(), end.timestamp(), bucket_seconds),
+            asyncio.to_thread(store.video_history, channel_id, start.timestamp(), end.timestamp(), bucket_seconds, video_id),
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid channel id")
+    return {"bucket": bucket, "channel": channel, "videos": videos}
+
 @router.get("/videos/{video_id}/comments")
-async def get_video_comments(video_id: str):
-    comments = await youtube_service.get_video_comments(video_id)
+async def get_video_comments(
+    video_id: str,
+    response: Response,
+    max_comments: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    compact: bool = False
+):
+    report: Dict[str, Any] = {}
+    comments = await youtube_service.get_video_comments(
+        video_id, max_comments, max_pages, time_budget, report
+    )
     if not comments:
         raise HTTPException(status_code=404, detail="Comments not found")
+    response.headers["X-Comments-Fetched"] = str(report.get("fetched", len(comments)))
+    response.headers["X-Comments-Skipped"] = str(report.get("skipped", 0))
+    if compact:
+        return FastJSONResponse(
+            [Comment.from_dict(comment) for comment in comments], headers=dict(response.headers)
+        )
     return comments
 
 @router.get("/videos/{video_id}/analysis")
-async def analyze_video_comments(video_id: str):
-    comments = await youtube_service.get_video_comments(video_id)
+async def analyze_video_comments(video_id: str, full: bool = False):
+    # full 이면 한도 없이 모든 댓글을 map-reduce 로 분석
+    if full:
+        comments = await youtube_service.get_video_comments(video_id, max_comments=0, max_pages=0)
+    else:
+        comments = await youtube_service.get_video_comments(video_id)
     if not comments:
         raise HTTPException(status_code=404, detail="Comments not found")
     
     comment_texts = [comment["text"] for comment in comments]
-    analysis = await openai_service.analyze_comments(comment_texts)
+    analysis = await openai_service.analyze_comments(comment_texts, video_id=video_id, map_reduce=full)
     
     if not analysis:
         raise HTTPException(status_code=500, detail="Comment analysis failed")
@@ -43,18 +149,209 @@ async def analyze_video_comments(video_id: str):
     return analysis
 
 @router.get("/channel/{channel_id}/comments")
-async def get_channel_comments(channel_id: str):
+async def get_channel_comments(channel_id: str, compact: bool = False):
     comments = await youtube_service.get_channel_comments(channel_id)
     if not comments:
         raise HTTPException(status_code=404, detail="Comments not found")
+    if compact:
+        return FastJSONResponse(normalize_comments(comments))
     return comments
 
+@router.get("/channel/{channel_id}/comments/stream")
+async def stream_channel_comments(channel_id: str, format: str = "ndjson"):
+    return _stream_pages(youtube_service.iter_channel_comments(channel_id), format)
+
+@router.get("/channel/{channel_id}/core-fans")
+async def get_core_fans(
+    channel_id: str,
+    min_comments: int = Query(3, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    sort: str = Query("comments", pattern="^(comments|likes|videos|recent)$"),
+    refresh: bool = False
+):
+    pending = await _ensure_comment_index(channel_id, refresh)
+    if pending is not None:
+        return pending
+    return youtube_service.fan_index.top_fans(channel_id, min_comments, limit, offset, sort)
+
+@router.get("/channel/{channel_id}/core-fans/{author_channel_id}/comments")
+async def get_core_fan_comments(
+    channel_id: str,
+    author_channel_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    return youtube_service.fan_index.fan_comments(channel_id, author_channel_id, limit, offset)
+
+@router.get("/channel/{channel_id}/search")
+async def search_channel(
+    channel_id: str,
+    q: str = Query(..., min_length=1),
+    kind: Optional[str] = Query(None, pattern="^(comment|video)$"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    refresh: bool = False
+):
+    pending = await _ensure_comment_index(channel_id, refresh)
+    if pending is not None:
+        return pending
+    return youtube_service.search_index.search(channel_id, q, kind, limit, offset)
+
+@router.get("/channel/{channel_id}/terms")
+async def get_top_terms(
+    channel_id: str,
+    kind: str = Query("comment", pattern="^(comment|video)$"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    refresh: bool = False
+):
+    pending = await _ensure_comment_index(channel_id, refresh)
+    if pending is not None:
+        return pending
+    return youtube_service.search_index.top_terms(channel_id, kind, limit, offset)
+
+@router.get("/channel/{channel_id}/terms/frequency")
+async def get_term_frequencies(
+    channel_id: str,
+    terms: List[str] = Query(..., min_length=1, max_length=50),
+    kind: str = Query("comment", pattern="^(comment|video)$")
+):
+    pending = await _ensure_comment_index(channel_id, False)
+    if pending is not None:
+        return pending
+    return youtube_service.search_index.term_frequencies(channel_id, terms, kind)
+
+@router.post("/channel/{channel_id}/ingest", status_code=202)
+async def submit_ingest_job(channel_id: str, analyze: bool = True):
+    return await job_service.submit(channel_id, analyze=analyze)
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_service.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, interval: float = Query(1.0, ge=0.2, le=10.0)):
+    if not job_service.get(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events() -> AsyncIterator[bytes]:
+        # 진행 상황이 바뀔 때마다 이벤트를 보내고, 작업이 끝나면 종료
+        last_updated = None
+        while True:
+            job = job_service.get(job_id)
+            if job["updatedAt"] != last_updated:
+                last_updated = job["updatedAt"]
+                yield b"event: progress\ndata: " + dumps(job) + b"\n\n"
+            if job["status"] in ("done", "failed"):
+                return
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@router.get("/tracked-channels")
+async def get_tracked_channels():
+    return {"budget": refresh_scheduler.budget(), "channels": refresh_scheduler.tracked_channels()}
+
+@router.put("/tracked-channels/{channel_id}")
+async def track_channel(channel_id: str):
+    return refresh_scheduler.track(channel_id)
+
+@router.delete("/tracked-channels/{channel_id}", status_code=204)
+async def untrack_channel(channel_id: str):
+    if not refresh_scheduler.untrack(channel_id):
+        raise HTTPException(status_code=404, detail="Channel is not tracked")
+
+@router.post("/tracked-channels/{channel_id}/refresh", status_code=202)
+async def refresh_tracked_channel(channel_id: str):
+    # 예산/시간대와 무관하게 즉시 갱신 (쓴 할당량은 오늘 예산에 포함).
+    # 갱신은 백그라운드로 돌리고 바로 반환하므로 완료 여부는 /tracked-channels 의 lastRefreshed 로 확인
+    if refresh_scheduler.get(channel_id) is None:
+        raise HTTPException(status_code=404, detail="Channel is not tracked")
+    return refresh_scheduler.start_refresh(channel_id)
+
 @router.post("/analysis/chart")
 async def analyze_chart(
     chart_type: str,
     data: dict
 ):
+    errors = openai_service.chart_input_errors({chart_type: data})
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
     analysis = await openai_service.analyze_chart_data(chart_type, data)
     if not analysis:
         raise HTTPException(status_code=500, detail="Analysis failed")
-    return {"analysis": analysis} 
\ No newline at end of file
+    return {"analysis": analysis}
+
+@router.post("/analysis/charts")
+async def analyze_charts(charts: Dict[str, Dict[str, Any]] = Body(..., embed=True)):
+    errors = openai_service.chart_input_errors(charts)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    insights = await openai_service.analyze_charts(charts)
+    if not any(insights.values()):
+        raise HTTPException(status_code=500, detail="Analysis failed")
+    return {"insights": insights}
+
+@router.get("/channel/{channel_id}/insights")
+async def get_channel_insights(channel_id: str, refresh: bool = False):
+    max_age = 0 if refresh else refresh_scheduler.sync_max_age(channel_id, settings.VIDEO_SYNC_MAX_AGE)
+    videos = await youtube_service.get_channel_videos(channel_id, incremental=True, max_age=max_age)
+    if not videos:
+        raise HTTPException(status_code=404, detail="Videos not found")
+
+    charts = analytics_service.compute(videos)["chartInputs"]
+    # 핵심 팬 요약은 이미 색인된 경우에만 포함
+    core_fans = youtube_service.fan_index.chart_summary(channel_id)
+    if core_fans:
+        charts["core_fans"] = core_fans
+
+    return {"insights": await openai_service.analyze_charts(charts)} 
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    stats = youtube_service.get_cache_stats()
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Cache disabled")
+    return stats
+
+
+async def _ensure_comment_index(channel_id: str, refresh: bool) -> Optional[FastJSONResponse]:
+    """핵심 팬/검색 색인이 준비되었으면 None, 아니면 수집 작업을 넣고 202 응답을 돌려줍니다.
+
+    채널 전체 댓글 수집은 요청 안에서 하기엔 너무 오래 걸리므로 수집 작업(JobService)에
+    맡깁니다. 같은 채널에 진행 중인 작업이 있으면 그 작업을 돌려주므로, 클라이언트는
+    `/jobs/{job_id}` 로 완료를 확인한 뒤 다시 요청하면 됩니다. 댓글이 없는 채널도 한 번
+    색인하면 완료 표시가 남아 다시 수집하지 않습니다.
+    """
+    if not refresh and youtube_service.fan_index.indexed_at(channel_id) is not None:
+        return None
+    job = await job_service.submit(channel_id, analyze=False)
+    return FastJSONResponse({"status": "indexing", "job": job}, status_code=202)
+
+def _stream_pages(pages: AsyncIterator[List[Dict[str, Any]]], format: str) -> StreamingResponse:
+    """페이지 단위 비동기 제너레이터를 NDJSON(항목당 한 줄) 또는 SSE(페이지당 이벤트)로 스트리밍합니다."""
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            async for page in pages:
+                if format == "sse":
+                    yield b"data: " + dumps(page) + b"\n\n"
+                else:
+                    yield b"".join(dumps(item) + b"\n" for item in page)
+        except Exception as e:
+            # 응답이 이미 시작되었으므로 상태 코드 대신 오류 레코드로 알립니다.
+            print(f"Error while streaming: {str(e)}")
+            error = dumps({"error": str(e)})
+            yield b"event: error\ndata: " + error + b"\n\n" if format == "sse" else error + b"\n"
+        else:
+            if format == "sse":
+                yield b"event: end\ndata: {}\n\n"
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type)
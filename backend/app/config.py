@@ -4,6 +4,70 @@ class Settings(BaseSettings):
     YOUTUBE_API_KEY: str
     OPENAI_API_KEY: str
     DATABASE_URL: str = "sqlite:///./youtube.db"
+
+    # YouTube API 클라이언트
+    YOUTUBE_API_BASE_URL: str = "https://www.googleapis.com/youtube/v3"
+    YOUTUBE_REQUESTS_PER_SECOND: float = 10.0
+    YOUTUBE_COMMENT_CONCURRENCY: int = 8
+
+    # 비디오별 댓글 수집 한도 (0 이면 제한 없음)
+    COMMENT_MAX_PER_VIDEO: int = 1000
+    COMMENT_MAX_PAGES: int = 10
+    COMMENT_TIME_BUDGET: float = 30.0
+    COMMENT_INCLUDE_REPLIES: bool = True
+    # 스레드당 추가로 조회할 답글 페이지 수 (페이지당 최대 100개, 0 이면 제한 없음)
+    COMMENT_MAX_REPLY_PAGES: int = 2
+
+    # LLM 댓글 분석
+    LLM_CACHE_TTL: float = 30 * 24 * 60 * 60
+    LLM_CACHE_MEMORY_SIZE: int = 256
+    LLM_CACHE_MAX_ROWS: int = 10_000
+    LLM_CHUNK_TOKENS: int = 6000
+    LLM_MAP_CONCURRENCY: int = 4
+    # 키워드/감성은 로컬에서 계산하고 LLM 에는 요약과 대표 댓글만 전달
+    LLM_LOCAL_PREPASS: bool = True
+    LLM_EXAMPLE_COMMENTS: int = 30
+    CHART_INSIGHT_TTL: float = 24 * 60 * 60
+
+    # 백그라운드 수집 작업
+    JOB_WORKERS: int = 2
+
+    # 추적 채널 백그라운드 갱신: 한가한 시간대(ANALYTICS_TIMEZONE 기준 시각, 시작 == 끝이면 종일)에
+    # 하루 할당량 예산을 고르게 나눠 쓰며 자주 열리고 오래된 채널부터 갱신.
+    # 사용자 요청 없이 할당량을 쓰므로 갱신과 자동 추적(처음 연 채널을 추적 목록에 추가) 모두 기본은 꺼져 있음
+    REFRESH_ENABLED: bool = False
+    REFRESH_DAILY_QUOTA: int = 3000
+    REFRESH_WINDOW_START: int = 1
+    REFRESH_WINDOW_END: int = 7
+    REFRESH_INTERVAL: float = 5 * 60
+    REFRESH_MIN_AGE: float = 6 * 60 * 60
+    REFRESH_AUTO_TRACK: bool = False
+    REFRESH_ACCESS_HALF_LIFE: float = 7 * 24 * 60 * 60
+
+    # 통계 스냅샷 (시계열)
+    SNAPSHOT_DIR: str = "./snapshots"
+    SNAPSHOT_MIN_INTERVAL: float = 60 * 60
+
+    # 지표/인사이트 조회 시 이 시간(초) 안에 동기화한 비디오 목록은 다시 동기화하지 않음
+    VIDEO_SYNC_MAX_AGE: float = 30 * 60
+
+    # 채널 지표 계산 시 요일/시간대 기준 시간대
+    ANALYTICS_TIMEZONE: str = "Asia/Seoul"
+
+    # 요청 계측: 응답에 Server-Timing 헤더를 붙일지 여부
+    SERVER_TIMING_ENABLED: bool = False
+
+    # 응답 압축: 이 크기(바이트) 이상인 응답만 brotli/gzip 으로 압축
+    COMPRESSION_MIN_SIZE: int = 1000
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+
+    # 응답 캐시
+    CACHE_ENABLED: bool = True
+    CACHE_MEMORY_SIZE: int = 1024
+    # 만료된 응답을 ETag 재검증용으로 남겨 두는 기간과 디스크에 둘 최대 항목 수
+    CACHE_STALE_TTL: float = 7 * 24 * 60 * 60
+    CACHE_MAX_ROWS: int = 100_000
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,32 @@
+import sqlite3
+import threading
+from typing import Optional
+from .config import settings
+
+_connection: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+
+def get_database_path(database_url: Optional[str] = None) -> str:
+    """`sqlite:///./youtube.db` 형식의 DATABASE_URL 에서 파일 경로를 꺼냅니다."""
+    database_url = database_url or settings.DATABASE_URL
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Only sqlite DATABASE_URL is supported: {database_url}")
+    return database_url[len(prefix):] or ":memory:"
+
+
+def get_connection() -> sqlite3.Connection:
+    """프로세스 전체가 공유하는 SQLite 연결을 반환합니다."""
+    global _connection
+    with _lock:
+        if _connection is None:
+            _connection = sqlite3.connect(
+                get_database_path(),
+                check_same_thread=False,
+                isolation_level=None,  # autocommit, 필요한 곳에서만 명시적 트랜잭션
+            )
+            _connection.row_factory = sqlite3.Row
+            _connection.execute("PRAGMA journal_mode=WAL")
+            _connection.execute("PRAGMA synchronous=NORMAL")
+        return _connection
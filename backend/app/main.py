@@ -1,8 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from .api import channel
+from .config import settings
+from .metrics import MetricsMiddleware, registry
+from .responses import CompressionMiddleware, FastJSONResponse
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 백그라운드 수집 작업자 시작 (중단된 작업 재개)
+    await channel.job_service.start()
+    # 추적 채널을 한가한 시간대에 미리 갱신
+    if settings.REFRESH_ENABLED:
+        await channel.refresh_scheduler.start()
+    yield
+    await channel.refresh_scheduler.stop()
+    await channel.job_service.stop()
+    # 공유 커넥션 풀 정리
+    await channel.youtube_service.aclose()
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -10,10 +28,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Comments-Fetched", "X-Comments-Skipped", "Server-Timing"],
+)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.GZIP_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
 )
+app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
 
 app.include_router(channel.router, prefix="/api")
 
 @app.get("/")
 async def root():
-    return {"message": "YouTube Analyzer API"} 
\ No newline at end of file
+    return {"message": "YouTube Analyzer API"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4") 
\ No newline at end of file
@@ -0,0 +1,230 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List, Tuple, Iterator
+
+# 초 단위 지연 시간 버킷. 채널 전체 수집처럼 긴 요청을 위해 30/60초까지 둡니다.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+QUOTA_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+# YouTube Data API 리소스별 호출 1회당 할당량 단위 (list 호출은 1, search 는 100)
+YOUTUBE_QUOTA_COSTS = {'search': 100}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """카운터와 히스토그램을 메모리에 모아 Prometheus 텍스트 형식으로 내보냅니다."""
+
+    def __init__(self):
+        self._descriptions: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+
+    def counter(self, name: str, help: str) -> None:
+        self._descriptions[name] = ('counter', help, ())
+        self._counters.setdefault(name, {})
+
+    def histogram(self, name: str, help: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self._descriptions[name] = ('histogram', help, buckets)
+        self._histograms.setdefault(name, {})
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        series = self._counters[name]
+        key = self._labels(labels)
+        series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        series = self._histograms[name]
+        key = self._labels(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(self._descriptions[name][2])
+        histogram.observe(value)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, (kind, help, _) in self._descriptions.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == 'counter':
+                for labels, value in self._counters[name].items():
+                    lines.append(f"{name}{self._format(labels)} {value:g}")
+                continue
+            for labels, histogram in self._histograms[name].items():
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{self._format(labels + (('le', f'{bound:g}'),))} {cumulative}")
+                lines.append(f"{name}_bucket{self._format(labels + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"{name}_sum{self._format(labels)} {histogram.sum:g}")
+                lines.append(f"{name}_count{self._format(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _labels(labels: Dict[str, Any]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    @staticmethod
+    def _format(labels: Labels) -> str:
+        if not labels:
+            return ''
+        escaped = (
+            (key, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for key, value in labels
+        )
+        return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+class RequestMetrics:
+    """한 HTTP 요청 동안의 외부 호출/할당량/토큰/캐시 사용량. Server-Timing 헤더에 씁니다."""
+
+    __slots__ = ('started', 'upstream', 'quota_units', 'tokens', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.upstream: Dict[str, List[float]] = {}  # 서비스 -> [호출 수, 누적 초]
+        self.quota_units = 0
+        self.tokens = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def server_timing(self) -> str:
+        entries = [
+            f'{service};desc="{int(count)} calls";dur={duration * 1000:.1f}'
+            for service, (count, duration) in self.upstream.items()
+        ]
+        if self.cache_hits or self.cache_misses:
+            entries.append(f'cache;desc="hits={self.cache_hits} misses={self.cache_misses}"')
+        if self.quota_units:
+            entries.append(f'quota;desc="{self.quota_units} units"')
+        if self.tokens:
+            entries.append(f'tokens;desc="{self.tokens} tokens"')
+        entries.append(f'app;dur={(time.perf_counter() - self.started) * 1000:.1f}')
+        return ', '.join(entries)
+
+
+registry = MetricsRegistry()
+registry.histogram('http_request_duration_seconds', 'HTTP request latency by endpoint.')
+registry.counter('http_requests_total', 'HTTP requests by endpoint and status.')
+registry.histogram('upstream_request_duration_seconds', 'Upstream (YouTube/OpenAI) call latency.')
+registry.counter('upstream_requests_total', 'Upstream (YouTube/OpenAI) calls by outcome.')
+registry.counter('youtube_quota_units_total', 'YouTube Data API quota units spent, by resource.')
+registry.histogram('http_request_youtube_quota_units', 'YouTube quota units spent per HTTP request.', QUOTA_BUCKETS)
+registry.counter('openai_tokens_total', 'OpenAI tokens used, by model and token type.')
+registry.counter('cache_lookups_total', 'Cache lookups by cache table and result (hit/stale/miss).')
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar('request_metrics', default=None)
+
+
+@contextmanager
+def track_usage() -> Iterator[RequestMetrics]:
+    """HTTP 요청 밖(백그라운드 작업 등)에서 외부 호출/할당량/토큰 사용량을 모읍니다."""
+    current = RequestMetrics()
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+
+
+def record_upstream(service: str, operation: str, status: Any, duration: float) -> None:
+    registry.observe('upstream_request_duration_seconds', duration, service=service, operation=operation)
+    registry.inc('upstream_requests_total', service=service, operation=operation, status=status)
+    current = _current.get()
+    if current is not None:
+        totals = current.upstream.setdefault(service, [0, 0.0])
+        totals[0] += 1
+        totals[1] += duration
+
+
+def record_youtube_quota(resource: str) -> None:
+    units = YOUTUBE_QUOTA_COSTS.get(resource, 1)
+    registry.inc('youtube_quota_units_total', units, resource=resource)
+    current = _current.get()
+    if current is not None:
+        current.quota_units += units
+
+
+def record_tokens(model: str, usage: Any) -> None:
+    if usage is None:
+        return
+    registry.inc('openai_tokens_total', usage.prompt_tokens, model=model, type='prompt')
+    registry.inc('openai_tokens_total', usage.completion_tokens, model=model, type='completion')
+    current = _current.get()
+    if current is not None:
+        current.tokens += usage.prompt_tokens + usage.completion_tokens
+
+
+def record_cache(table: str, result: str) -> None:
+    registry.inc('cache_lookups_total', table=table, result=result)
+    current = _current.get()
+    if current is not None:
+        if result == 'hit':
+            current.cache_hits += 1
+        else:
+            current.cache_misses += 1
+
+
+class MetricsMiddleware:
+    """요청별 지연 시간과 외부 호출 사용량을 기록하는 ASGI 미들웨어.
+
+    스트리밍 응답도 마지막 본문을 보낼 때까지를 지연 시간으로 잽니다.
+    `server_timing` 이면 응답 시작 시점까지의 외부 호출 시간을 Server-Timing
+    헤더로 붙입니다.
+    """
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        current = RequestMetrics()
+        token = _current.set(current)
+        status = {'code': 500}
+
+        async def send_with_metrics(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+                if self.server_timing:
+                    headers = list(message.get('headers', []))
+                    headers.append((b'server-timing', current.server_timing().encode('latin-1')))
+                    message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _current.reset(token)
+            # 채널 ID 등으로 시계열이 늘지 않도록 경로 템플릿을 레이블로 사용
+            route = scope.get('route')
+            endpoint = getattr(route, 'path', 'unmatched')
+            method = scope['method']
+            registry.observe(
+                'http_request_duration_seconds', time.perf_counter() - current.started,
+                method=method, endpoint=endpoint,
+            )
+            registry.inc('http_requests_total', method=method, endpoint=endpoint, status=status['code'])
+            registry.observe('http_request_youtube_quota_units', current.quota_units, endpoint=endpoint)
@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List
+from .services.analytics_service import parse_duration
+
+# 필드 이름은 API 의 JSON 키와 같게 둡니다 (인코더가 변환 없이 그대로 직렬화하도록).
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass(slots=True)
+class Channel:
+    id: str
+    title: str
+    description: str
+    subscriberCount: int
+    videoCount: int
+    viewCount: int
+    thumbnail: str
+    customUrl: str
+    publishedAt: str
+    uploadsPlaylistId: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Channel':
+        return cls(
+            id=data['id'],
+            title=data.get('title', ''),
+            description=data.get('description', ''),
+            subscriberCount=_to_int(data.get('subscriberCount')),
+            videoCount=_to_int(data.get('videoCount')),
+            viewCount=_to_int(data.get('viewCount')),
+            thumbnail=data.get('thumbnail', ''),
+            customUrl=data.get('customUrl', ''),
+            publishedAt=data.get('publishedAt', ''),
+            uploadsPlaylistId=data.get('uploadsPlaylistId', ''),
+        )
+
+
+@dataclass(slots=True)
+class Video:
+    id: str
+    title: str
+    description: str
+    thumbnail: str
+    publishedAt: str
+    viewCount: int
+    likeCount: int
+    commentCount: int
+    duration: str
+    durationSeconds: int
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Video':
+        return cls(
+            id=data['id'],
+            title=data.get('title', ''),
+            description=data.get('description', ''),
+            thumbnail=data.get('thumbnail', ''),
+            publishedAt=data.get('publishedAt', ''),
+            viewCount=_to_int(data.get('viewCount')),
+            likeCount=_to_int(data.get('likeCount')),
+            commentCount=_to_int(data.get('commentCount')),
+            duration=data.get('duration', ''),
+            durationSeconds=parse_duration(data.get('duration')),
+        )
+
+
+@dataclass(slots=True)
+class VideoRef:
+    """댓글이 참조하는 비디오 정보. 정규화된 댓글 응답에 비디오당 한 번만 실립니다."""
+    title: str
+    publishedAt: str
+
+
+@dataclass(slots=True)
+class Comment:
+    id: Optional[str]
+    parentId: Optional[str]
+    author: str
+    authorChannelId: Optional[str]
+    text: str
+    publishedAt: str
+    likeCount: int
+    videoId: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Comment':
+        # YouTube 는 작성자 채널을 {'value': ...} 로 주므로 ID 문자열만 남김
+        author_channel = data.get('authorChannelId') or {}
+        return cls(
+            id=data.get('id'),
+            parentId=data.get('parentId'),
+            author=data.get('author', ''),
+            authorChannelId=author_channel.get('value') if isinstance(author_channel, dict) else author_channel,
+            text=data.get('text', ''),
+            publishedAt=data.get('publishedAt', ''),
+            likeCount=_to_int(data.get('likeCount')),
+            videoId=data.get('videoId'),
+        )
+
+
+def normalize_comments(comments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """댓글마다 반복되는 비디오 제목/게시일을 `videos` 로 모으고 댓글은 videoId 로만 참조합니다.
+
+        {"videos": {"<videoId>": {"title": ..., "publishedAt": ...}}, "comments": [...]}
+    """
+    videos: Dict[str, VideoRef] = {}
+    for comment in comments:
+        video_id = comment.get('videoId')
+        if video_id and video_id not in videos and 'videoTitle' in comment:
+            videos[video_id] = VideoRef(comment['videoTitle'], comment.get('videoPublishedAt', ''))
+    return {'videos': videos, 'comments': [Comment.from_dict(comment) for comment in comments]}
@@ -0,0 +1,265 @@
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List
+from zoneinfo import ZoneInfo
+import re
+from ..config import settings
+
+DAY_NAMES = ['일', '월', '화', '수', '목', '금', '토']
+DURATION_CATEGORIES = ['shorts', 'short', 'medium', 'long']
+DURATION_CATEGORY_NAMES = {
+    'shorts': '쇼츠',
+    'short': '10분 미만',
+    'medium': '10-20분',
+    'long': '20분 이상',
+}
+TITLE_LENGTH_CATEGORIES = ['short', 'medium', 'long']
+
+_DURATION_PATTERN = re.compile(
+    r'P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?'
+)
+
+
+def parse_duration(duration: Optional[str]) -> int:
+    """ISO 8601 기간(PT1H2M3S)을 초 단위로 변환합니다."""
+    if not duration:
+        return 0
+    match = _DURATION_PATTERN.fullmatch(duration)
+    if not match:
+        return 0
+    parts = {key: int(value or 0) for key, value in match.groupdict().items()}
+    return parts['days'] * 86400 + parts['hours'] * 3600 + parts['minutes'] * 60 + parts['seconds']
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class VideoTable:
+    """채널 비디오 목록의 열 지향 표현.
+
+    문자열 카운트와 ISO 8601 길이, 게시 시각은 적재할 때 한 번만 변환해
+    정수 배열로 보관하고, 모든 지표는 이 열들을 순회하며 계산합니다.
+    """
+
+    def __init__(self, videos: List[Dict[str, Any]], tz: Optional[ZoneInfo] = None):
+        self.tz = tz = tz or ZoneInfo(settings.ANALYTICS_TIMEZONE)
+        self.size = len(videos)
+        self.ids: List[str] = []
+        self.titles: List[str] = []
+        self.published = array('d')
+        self.weekday = array('b')  # 0=일요일 (JavaScript getDay 와 동일)
+        self.hour = array('b')
+        self.views = array('q')
+        self.likes = array('q')
+        self.comments = array('q')
+        self.duration = array('l')
+        self.vertical = array('b')
+
+        for video in videos:
+            published = datetime.fromisoformat(video['publishedAt'].replace('Z', '+00:00')).astimezone(tz)
+            self.ids.append(video['id'])
+            self.titles.append(video.get('title', ''))
+            self.published.append(published.timestamp())
+            self.weekday.append((published.weekday() + 1) % 7)
+            self.hour.append(published.hour)
+            self.views.append(_to_int(video.get('viewCount')))
+            self.likes.append(_to_int(video.get('likeCount')))
+            self.comments.append(_to_int(video.get('commentCount')))
+            self.duration.append(parse_duration(video.get('duration')))
+            width, height = video.get('width'), video.get('height')
+            self.vertical.append(1 if width and height and width < height else 0)
+
+
+class AnalyticsService:
+    """대시보드 차트에 쓰이는 채널 지표를 서버에서 한 번에 계산합니다."""
+
+    def __init__(self, top_keywords: int = 5, growth_window_days: int = 30):
+        self.top_keywords = top_keywords
+        self.growth_window_days = growth_window_days
+
+    def compute(self, videos: List[Dict[str, Any]], now: Optional[datetime] = None) -> Dict[str, Any]:
+        table = VideoTable(videos)
+        metrics = {
+            'videoCount': table.size,
+            'engagement': self._engagement(table),
+            'growth': self._growth(table, now or datetime.now(timezone.utc)),
+            'upload': self._upload(table),
+            'contentPerformance': self._content_performance(table),
+            'titles': self._titles(table),
+        }
+        metrics['chartInputs'] = self._chart_inputs(metrics)
+        return metrics
+
+    def _engagement(self, table: VideoTable) -> Dict[str, Any]:
+        # 조회수가 0인 영상은 비율 계산에서 제외
+        rows = [i for i, views in enumerate(table.views) if views > 0]
+        like_ratio = [table.likes[i] / table.views[i] * 100 for i in rows]
+        comment_ratio = [table.comments[i] / table.views[i] * 100 for i in rows]
+        total = [like + comment for like, comment in zip(like_ratio, comment_ratio)]
+        count = len(rows)
+
+        trend = sorted(
+            (
+                {
+                    'date': datetime.fromtimestamp(table.published[i], table.tz).strftime('%Y-%m-%d'),
+                    'publishedAt': table.published[i],
+                    'title': table.titles[i],
+                    'views': table.views[i],
+                    'engagement': engagement,
+                }
+                for i, engagement in zip(rows, total)
+            ),
+            key=lambda row: row['publishedAt']
+        )
+        for row in trend:
+            del row['publishedAt']
+
+        return {
+            'likeRatio': sum(like_ratio) / count if count else 0,
+            'commentRatio': sum(comment_ratio) / count if count else 0,
+            'totalEngagement': sum(total) / count if count else 0,
+            'excludedCount': table.size - count,
+            'trend': trend,
+        }
+
+    def _growth(self, table: VideoTable, now: datetime) -> Dict[str, Any]:
+        cutoff = (now - timedelta(days=self.growth_window_days)).timestamp()
+        recent = [i for i, published in enumerate(table.published) if published >= cutoff]
+        older = [i for i, published in enumerate(table.published) if published < cutoff]
+
+        def avg_views(rows: List[int]) -> float:
+            return sum(table.views[i] for i in rows) / (len(rows) or 1)
+
+        def avg_engagement(rows: List[int]) -> float:
+            return sum(
+                (table.likes[i] + table.comments[i]) / (table.views[i] or 1) for i in rows
+            ) / (len(rows) or 1)
+
+        def change(recent_value: float, older_value: float) -> Optional[float]:
+            if not older_value:
+                return None
+            return (recent_value - older_value) / older_value * 100
+
+        total_views = sum(table.views)
+        return {
+            'totalViews': total_views,
+            'avgViews': total_views / table.size if table.size else 0,
+            'recentCount': len(recent),
+            'viewGrowth': change(avg_views(recent), avg_views(older)),
+            'engagementGrowth': change(avg_engagement(recent), avg_engagement(older)),
+        }
+
+    def _upload(self, table: VideoTable) -> Dict[str, Any]:
+        days = Counter(table.weekday)
+        hours = Counter(table.hour)
+        published = sorted(table.published)
+        intervals = [b - a for a, b in zip(published, published[1:])]
+
+        top_day = max(range(7), key=lambda day: days[day]) if table.size else None
+        top_hour = max(range(24), key=lambda hour: hours[hour]) if table.size else None
+        return {
+            'byDay': [{'name': name, 'count': days[day]} for day, name in enumerate(DAY_NAMES)],
+            'byHour': [{'name': f'{hour}시', 'count': hours[hour]} for hour in range(24)],
+            'topDay': DAY_NAMES[top_day] if top_day is not None else None,
+            'topHour': top_hour,
+            'uploadInterval': sum(intervals) / len(intervals) / 86400 if intervals else None,
+        }
+
+    def _content_performance(self, table: VideoTable) -> Dict[str, Any]:
+        groups: Dict[str, List[int]] = {category: [] for category in DURATION_CATEGORIES}
+        for i, views in enumerate(table.views):
+            if views <= 0:
+                continue
+            duration = table.duration[i]
+            # 숏폼: 60초 이하이면서 세로형 (프론트엔드와 같은 기준, 해상도 정보가 없으면 일반 영상)
+            if duration <= 60 and table.vertical[i]:
+                category = 'shorts'
+            else:
+                category = 'short' if duration < 600 else 'medium' if duration < 1200 else 'long'
+            groups[category].append(i)
+
+        stats = {}
+        for category, rows in groups.items():
+            count = len(rows)
+            stats[category] = {
+                'count': count,
+                'avgViews': sum(table.views[i] for i in rows) / count if count else 0,
+                'avgEngagement': sum(
+                    (table.likes[i] + table.comments[i]) / table.views[i] for i in rows
+                ) / count if count else 0,
+                'avgDuration': sum(table.duration[i] for i in rows) / count if count else 0,
+                'verticalCount': sum(table.vertical[i] for i in rows),
+            }
+
+        best = max(DURATION_CATEGORIES, key=lambda category: stats[category]['avgViews'])
+        return {
+            'categories': stats,
+            'bestCategory': best,
+            'excludedCount': table.size - sum(len(rows) for rows in groups.values()),
+        }
+
+    def _titles(self, table: VideoTable) -> Dict[str, Any]:
+        lengths = {category: {'count': 0, 'totalViews': 0} for category in TITLE_LENGTH_CATEGORIES}
+        keywords: Dict[str, Dict[str, int]] = defaultdict(lambda: {'count': 0, 'totalViews': 0})
+
+        for title, views in zip(table.titles, table.views):
+            length = len(title)
+            bucket = lengths['short' if length < 20 else 'medium' if length < 40 else 'long']
+            bucket['count'] += 1
+            bucket['totalViews'] += views
+            for word in title.lower().split():
+                if len(word) < 2:  # 짧은 단어 제외
+                    continue
+                keywords[word]['count'] += 1
+                keywords[word]['totalViews'] += views
+
+        for bucket in lengths.values():
+            bucket['avgViews'] = bucket['totalViews'] / bucket['count'] if bucket['count'] else 0
+
+        top = sorted(keywords.items(), key=lambda item: item[1]['totalViews'], reverse=True)
+        return {
+            'lengthPerformance': lengths,
+            'topKeywords': [{'word': word, **stats} for word, stats in top[:self.top_keywords]],
+        }
+
+    @staticmethod
+    def _chart_inputs(metrics: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """`OpenAIService.analyze_chart_data` 프롬프트에 그대로 넣을 수 있는 값."""
+        engagement = metrics['engagement']
+        growth = metrics['growth']
+        upload = metrics['upload']
+        performance = metrics['contentPerformance']
+        categories = performance['categories']
+        best = performance['bestCategory']
+
+        return {
+            'engagement': {
+                'like_ratio': round(engagement['likeRatio'], 2),
+                'comment_ratio': round(engagement['commentRatio'], 2),
+                'total_engagement': round(engagement['totalEngagement'], 2),
+            },
+            'growth': {
+                'total_views': growth['totalViews'],
+                'avg_views': round(growth['avgViews']),
+                'view_growth': round(growth['viewGrowth'], 1) if growth['viewGrowth'] is not None else 0,
+            },
+            'upload': {
+                'top_day': upload['topDay'],
+                'top_hour': upload['topHour'],
+                'upload_interval': round(upload['uploadInterval'], 1) if upload['uploadInterval'] is not None else 0,
+            },
+            'content_performance': {
+                'best_duration': DURATION_CATEGORY_NAMES[best],
+                'best_views': round(categories[best]['avgViews']),
+                'best_engagement': round(categories[best]['avgEngagement'] * 100, 1),
+                'shorts_views': round(categories['shorts']['avgViews']),
+                'short_views': round(categories['short']['avgViews']),
+                'medium_views': round(categories['medium']['avgViews']),
+                'long_views': round(categories['long']['avgViews']),
+            },
+        }
@@ -0,0 +1,155 @@
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+from ..db import get_connection
+from ..metrics import record_cache
+
+# 리소스별 기본 TTL(초). 채널 통계는 자주 바뀌고, 비디오 메타데이터는 오래 유지됩니다.
+RESOURCE_TTLS: Dict[str, float] = {
+    'channels': 10 * 60,
+    'playlistItems': 30 * 60,
+    'videos': 6 * 60 * 60,
+    'commentThreads': 60 * 60,
+    'comments': 60 * 60,
+}
+
+# 이만큼 쓸 때마다 오래된 항목을 정리
+PRUNE_EVERY = 500
+
+
+class CacheEntry:
+    __slots__ = ('body', 'etag', 'expires_at')
+
+    def __init__(self, body: Dict[str, Any], etag: Optional[str], expires_at: float):
+        self.body = body
+        self.etag = etag
+        self.expires_at = expires_at
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class ResponseCache:
+    """YouTube API 응답을 SQLite 에 영구 저장하는 캐시.
+
+    자주 쓰는 항목은 앞단의 메모리 LRU(`memory_size` 개)에서 바로 돌려줍니다.
+    만료된 항목도 ETag 재검증을 위해 `stale_ttl` 동안 남겨 두고, 그보다 오래된
+    항목과 `max_rows` 를 넘는 항목(만료가 이른 순)은 주기적으로 지웁니다.
+    `table` 을 달리하면 다른 종류의 JSON 결과(LLM 분석 등)도 같은 방식으로
+    저장할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        connection: Optional[sqlite3.Connection] = None,
+        memory_size: int = 1024,
+        table: str = 'api_cache',
+        stale_ttl: float = 7 * 24 * 60 * 60,
+        max_rows: int = 0,
+    ):
+        self.db = connection or get_connection()
+        self.memory_size = memory_size
+        self.table = table
+        self.stale_ttl = stale_ttl
+        self.max_rows = max_rows
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._writes = 0
+        self.stats = {'hits': 0, 'memory_hits': 0, 'misses': 0, 'stale': 0, 'revalidated': 0, 'pruned': 0}
+        self.db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                body TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_{table}_expires ON {table} (expires_at);
+        """)
+        self.prune()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            if entry.is_fresh():
+                self.stats['hits'] += 1
+                self.stats['memory_hits'] += 1
+                record_cache(self.table, 'hit')
+            else:
+                self.stats['stale'] += 1
+                record_cache(self.table, 'stale')
+            return entry
+
+        row = self.db.execute(
+            f"SELECT etag, body, expires_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.stats['misses'] += 1
+            record_cache(self.table, 'miss')
+            return None
+
+        entry = CacheEntry(json.loads(row['body']), row['etag'], row['expires_at'])
+        self._remember(key, entry)
+        if entry.is_fresh():
+            self.stats['hits'] += 1
+            record_cache(self.table, 'hit')
+        else:
+            self.stats['stale'] += 1
+            record_cache(self.table, 'stale')
+        return entry
+
+    def set(self, key: str, body: Dict[str, Any], etag: Optional[str], ttl: float) -> None:
+        entry = CacheEntry(body, etag, time.time() + ttl)
+        self.db.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, etag, body, expires_at) VALUES (?, ?, ?, ?)",
+            (key, etag, json.dumps(body, ensure_ascii=False), entry.expires_at),
+        )
+        self._remember(key, entry)
+        self._writes += 1
+        if self._writes % PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """`stale_ttl` 보다 오래 만료된 항목과 `max_rows` 를 넘는 항목을 지우고 지운 수를 반환합니다."""
+        cutoff = (now or time.time()) - self.stale_ttl
+        with self.db:
+            self.db.execute("BEGIN")
+            removed = self.db.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (cutoff,)).rowcount
+            if self.max_rows > 0:
+                removed += self.db.execute(
+                    f"DELETE FROM {self.table} WHERE key IN "
+                    f"(SELECT key FROM {self.table} ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                ).rowcount
+        for key in [key for key, entry in self._memory.items() if entry.expires_at < cutoff]:
+            del self._memory[key]
+        self.stats['pruned'] += removed
+        return removed
+
+    def revalidated(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        """304 응답으로 재검증된 항목의 만료 시각을 연장합니다."""
+        self.stats['revalidated'] += 1
+        entry.expires_at = time.time() + ttl
+        self.db.execute(
+            f"UPDATE {self.table} SET expires_at = ? WHERE key = ?", (entry.expires_at, key)
+        )
+        self._remember(key, entry)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['misses'] + self.stats['stale']
+        return {
+            **self.stats,
+            'hit_rate': round(self.stats['hits'] / lookups, 4) if lookups else 0.0,
+            'memory_entries': len(self._memory),
+            'memory_size': self.memory_size,
+            'disk_entries': self.db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0],
+        }
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        if self.memory_size <= 0:
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
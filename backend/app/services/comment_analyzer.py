@@ -0,0 +1,152 @@
+import hashlib
+from collections import Counter
+from typing import Dict, Any, List, Tuple
+from .tokenizer import words, normalize
+
+# 감성 어간 사전. 단어가 이 어간으로 시작하면 해당 극성으로 봅니다 ("좋아요", "좋네요" -> "좋").
+POSITIVE_STEMS = {
+    '좋', '최고', '감사', '고마', '고맙', '사랑', '재밌', '재미있', '멋지', '멋져', '멋있', '대박',
+    '웃기', '웃겨', '행복', '응원', '훌륭', '완벽', '귀엽', '귀여', '예쁘', '예뻐', '이쁘', '이뻐',
+    '잘생', '유익', '추천', '힐링', '감동', '존경', '레전드', '짱', '최애', '기대', '축하', '신기',
+    'ㅋㅋ', 'ㅎㅎ', 'good', 'great', 'love', 'awesome', 'amazing', 'best', 'nice', 'thank',
+    'cool', 'funny', 'beautiful', 'perfect',
+}
+NEGATIVE_STEMS = {
+    '싫', '별로', '최악', '실망', '짜증', '노잼', '재미없', '지루', '구리', '구려', '불편', '아쉽',
+    '아쉬', '화나', '화가', '답답', '거짓', '쓰레기', '비추', '슬프', '슬퍼', '어이없', '역겹',
+    '불쾌', '극혐', '속상', '실패', '사기', '억지', '후회',
+    'bad', 'worst', 'hate', 'boring', 'terrible', 'awful', 'sad', 'disappoint', 'fake',
+}
+_MAX_STEM_LENGTH = max(len(stem) for stem in POSITIVE_STEMS | NEGATIVE_STEMS)
+
+# 뒤 단어의 극성을 뒤집는 부정어와, 앞 단어의 극성을 뒤집는 부정 어미
+NEGATORS_BEFORE = {'안', '못', 'not', 'no', 'never', 'dont', 'isnt'}
+NEGATORS_AFTER = ('않', '아니', '없')
+
+# 동사/형용사 활용형은 키워드에서 제외 ("봤습니다", "좋지")
+PREDICATE_ENDINGS = ('다', '요', '지', '네', '니까', '는데', '지만', '했', '해')
+
+SENTIMENT_LABELS = ('positive', 'negative', 'neutral')
+
+
+class CommentAnalyzer:
+    """댓글의 키워드 빈도와 감성 비율을 LLM 없이 로컬에서 계산합니다.
+
+    모든 댓글을 한 번 훑으며 토큰화, 키워드 집계, 사전 기반 감성 점수 계산을
+    함께 처리합니다. 단어별 극성은 한 번만 찾아 기억하므로 같은 단어가 반복되는
+    댓글 묶음에서 비용이 거의 늘지 않습니다.
+    """
+
+    def __init__(self, top_keywords: int = 10, max_examples: int = 2):
+        self.top_keywords = top_keywords
+        self.max_examples = max_examples
+        self._polarity_cache: Dict[str, int] = {}
+
+    def analyze(self, comments: List[str]) -> Dict[str, Any]:
+        """`COMMENT_ANALYSIS_PROMPT` 의 keywords/sentiment 와 같은 형식으로 결과를 만듭니다."""
+        token_sets: List[set] = []
+        scores: List[int] = []
+        counts: Counter = Counter()
+        for comment in comments:
+            raw_words = words(comment)
+            tokens = normalize(raw_words)
+            counts.update(tokens)
+            token_sets.append(set(tokens))
+            scores.append(self._score(raw_words))
+
+        keywords = [
+            {'word': word, 'count': count, 'examples': []}
+            for word, count in counts.most_common()
+            if not word.startswith(NEGATORS_AFTER) and not word.endswith(PREDICATE_ENDINGS)
+        ][:self.top_keywords]
+        by_word = {keyword['word']: keyword for keyword in keywords}
+        for comment, tokens in zip(comments, token_sets):
+            for word in tokens & by_word.keys():
+                examples = by_word[word]['examples']
+                if len(examples) < self.max_examples:
+                    examples.append(comment)
+
+        labels = ['positive' if score > 0 else 'negative' if score < 0 else 'neutral' for score in scores]
+        return {
+            'keywords': keywords,
+            'sentiment': {
+                **self._percentages(Counter(labels), len(comments)),
+                'examples': self._sentiment_examples(comments, scores, labels),
+            },
+        }
+
+    def representative_examples(self, comments: List[str], analysis: Dict[str, Any], limit: int) -> List[str]:
+        """LLM 에 보낼 대표 댓글: 키워드/감성 예시를 먼저 넣고, 나머지는 해시 순서로 고르게 채웁니다."""
+        selected = dict.fromkeys(
+            example
+            for keyword in analysis['keywords']
+            for example in keyword['examples']
+        )
+        for label in SENTIMENT_LABELS:
+            selected.update(dict.fromkeys(analysis['sentiment']['examples'][label]))
+        examples = list(selected)[:limit]
+        if len(examples) < limit:
+            chosen = set(examples)
+            rest = sorted(
+                (comment for comment in comments if comment not in chosen),
+                key=lambda comment: hashlib.sha1(comment.encode('utf-8')).hexdigest(),
+            )
+            examples.extend(rest[:limit - len(examples)])
+        return examples
+
+    def _score(self, raw_words: List[str]) -> int:
+        score = 0
+        last = 0  # 직전 감성 단어의 기여값 (부정 어미가 오면 뒤집기 위해)
+        negate_next = False
+        for word in raw_words:
+            if word in NEGATORS_BEFORE:
+                negate_next = True
+                continue
+            if word.startswith(NEGATORS_AFTER) and last:
+                score -= 2 * last
+                last = 0
+                continue
+            polarity = self._polarity(word)
+            if polarity:
+                last = -polarity if negate_next else polarity
+                score += last
+            negate_next = False
+        return score
+
+    def _polarity(self, word: str) -> int:
+        polarity = self._polarity_cache.get(word)
+        if polarity is None:
+            polarity = 0
+            # 가장 긴 어간부터 확인 ("재미없" 이 "재미있" 보다 먼저 걸리도록)
+            for length in range(min(len(word), _MAX_STEM_LENGTH), 0, -1):
+                prefix = word[:length]
+                if prefix in NEGATIVE_STEMS:
+                    polarity = -1
+                    break
+                if prefix in POSITIVE_STEMS:
+                    polarity = 1
+                    break
+            self._polarity_cache[word] = polarity
+        return polarity
+
+    def _sentiment_examples(self, comments: List[str], scores: List[int], labels: List[str]) -> Dict[str, List[str]]:
+        """감성별로 점수가 가장 뚜렷한 댓글을 예시로 고릅니다."""
+        ranked: Dict[str, List[Tuple[int, int]]] = {label: [] for label in SENTIMENT_LABELS}
+        for i, (score, label) in enumerate(zip(scores, labels)):
+            ranked[label].append((-abs(score), i))
+        return {
+            label: [comments[i] for _, i in sorted(items)[:self.max_examples]]
+            for label, items in ranked.items()
+        }
+
+    @staticmethod
+    def _percentages(counts: Counter, total: int) -> Dict[str, int]:
+        """합이 정확히 100 이 되도록 최대 나머지 방식으로 반올림합니다."""
+        if not total:
+            return {'positive': 0, 'negative': 0, 'neutral': 100}
+        exact = {label: counts[label] * 100 / total for label in SENTIMENT_LABELS}
+        result = {label: int(value) for label, value in exact.items()}
+        remainder = 100 - sum(result.values())
+        for label in sorted(SENTIMENT_LABELS, key=lambda label: result[label] - exact[label])[:remainder]:
+            result[label] += 1
+        return result
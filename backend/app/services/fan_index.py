@@ -0,0 +1,234 @@
+import sqlite3
+import time
+from typing import Optional, Dict, Any, List, Iterable
+from ..db import get_connection
+
+# 정렬 기준 -> ORDER BY 절
+FAN_SORT_COLUMNS = {
+    'comments': 'comment_count DESC, total_likes DESC',
+    'likes': 'total_likes DESC, comment_count DESC',
+    'videos': 'unique_videos DESC, comment_count DESC',
+    'recent': 'last_at DESC',
+}
+
+
+class FanIndex:
+    """채널별 댓글 작성자(authorChannelId) 통계를 SQLite 에 증분 유지합니다.
+
+    댓글을 수집할 때마다 `add_comments` 로 넣으면 같은 댓글은 한 번만 집계되고,
+    좋아요 수가 바뀐 댓글은 차이만큼만 반영됩니다. 채널 댓글을 끝까지 색인하면
+    `mark_indexed` 로 완료 시각을 남깁니다. 댓글이 하나도 없는 채널도 표시가 남으므로
+    색인 여부는 통계 행이 아니라 이 표시로 판단합니다 (검색 색인도 같은 수집에서 채워짐).
+    """
+
+    def __init__(self, connection: Optional[sqlite3.Connection] = None):
+        self.db = connection or get_connection()
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS fan_comments (
+                channel_id TEXT NOT NULL,
+                comment_id TEXT NOT NULL,
+                author_id TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                video_title TEXT,
+                text TEXT NOT NULL,
+                like_count INTEGER NOT NULL,
+                published_at TEXT NOT NULL,
+                PRIMARY KEY (channel_id, comment_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_fan_comments_author
+                ON fan_comments (channel_id, author_id, published_at DESC);
+            CREATE TABLE IF NOT EXISTS fan_videos (
+                channel_id TEXT NOT NULL,
+                author_id TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                PRIMARY KEY (channel_id, author_id, video_id)
+            );
+            CREATE TABLE IF NOT EXISTS fan_stats (
+                channel_id TEXT NOT NULL,
+                author_id TEXT NOT NULL,
+                author TEXT NOT NULL,
+                comment_count INTEGER NOT NULL,
+                total_likes INTEGER NOT NULL,
+                unique_videos INTEGER NOT NULL,
+                first_at TEXT NOT NULL,
+                last_at TEXT NOT NULL,
+                last_comment TEXT NOT NULL,
+                PRIMARY KEY (channel_id, author_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_fan_stats_count
+                ON fan_stats (channel_id, comment_count DESC);
+            CREATE TABLE IF NOT EXISTS comment_index_state (
+                channel_id TEXT PRIMARY KEY,
+                indexed_at REAL NOT NULL
+            );
+            -- 완료 표시가 생기기 전에 색인한 채널은 색인된 것으로 간주
+            INSERT OR IGNORE INTO comment_index_state (channel_id, indexed_at)
+                SELECT DISTINCT channel_id, 0 FROM fan_stats;
+        """)
+
+    def add_comments(self, channel_id: str, comments: Iterable[Dict[str, Any]]) -> int:
+        """댓글을 색인에 반영하고 새로 추가된 댓글 수를 반환합니다. 채널 주인의 댓글은 제외합니다."""
+        added = 0
+        with self.db:
+            self.db.execute("BEGIN")
+            for comment in comments:
+                author_id = self.author_key(comment)
+                if not comment.get('id') or author_id == channel_id:
+                    continue
+                like_count = int(comment.get('likeCount') or 0)
+
+                previous = self.db.execute(
+                    "SELECT like_count FROM fan_comments WHERE channel_id = ? AND comment_id = ?",
+                    (channel_id, comment['id']),
+                ).fetchone()
+                if previous is not None:
+                    # 이미 집계된 댓글은 좋아요 변화량만 반영
+                    delta = like_count - previous['like_count']
+                    if delta:
+                        self.db.execute(
+                            "UPDATE fan_comments SET like_count = ? WHERE channel_id = ? AND comment_id = ?",
+                            (like_count, channel_id, comment['id']),
+                        )
+                        self.db.execute(
+                            "UPDATE fan_stats SET total_likes = total_likes + ? "
+                            "WHERE channel_id = ? AND author_id = ?",
+                            (delta, channel_id, author_id),
+                        )
+                    continue
+
+                added += 1
+                self.db.execute(
+                    "INSERT INTO fan_comments (channel_id, comment_id, author_id, video_id, video_title, "
+                    "text, like_count, published_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (channel_id, comment['id'], author_id, comment.get('videoId', ''),
+                     comment.get('videoTitle'), comment['text'], like_count, comment['publishedAt']),
+                )
+                new_video = self.db.execute(
+                    "INSERT OR IGNORE INTO fan_videos (channel_id, author_id, video_id) VALUES (?, ?, ?)",
+                    (channel_id, author_id, comment.get('videoId', '')),
+                ).rowcount
+                self.db.execute("""
+                    INSERT INTO fan_stats (channel_id, author_id, author, comment_count, total_likes,
+                                           unique_videos, first_at, last_at, last_comment)
+                    VALUES (:channel_id, :author_id, :author, 1, :likes, 1, :published_at, :published_at, :text)
+                    ON CONFLICT (channel_id, author_id) DO UPDATE SET
+                        author = CASE WHEN :published_at >= last_at THEN :author ELSE author END,
+                        last_comment = CASE WHEN :published_at >= last_at THEN :text ELSE last_comment END,
+                        comment_count = comment_count + 1,
+                        total_likes = total_likes + :likes,
+                        unique_videos = unique_videos + :new_video,
+                        first_at = MIN(first_at, :published_at),
+                        last_at = MAX(last_at, :published_at)
+                """, {
+                    'channel_id': channel_id,
+                    'author_id': author_id,
+                    'author': comment['author'],
+                    'likes': like_count,
+                    'published_at': comment['publishedAt'],
+                    'text': comment['text'],
+                    'new_video': new_video,
+                })
+        return added
+
+    def mark_indexed(self, channel_id: str, indexed_at: Optional[float] = None) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO comment_index_state (channel_id, indexed_at) VALUES (?, ?)",
+            (channel_id, indexed_at or time.time()),
+        )
+
+    def indexed_at(self, channel_id: str) -> Optional[float]:
+        row = self.db.execute(
+            "SELECT indexed_at FROM comment_index_state WHERE channel_id = ?", (channel_id,)
+        ).fetchone()
+        return row['indexed_at'] if row else None
+
+    def has_channel(self, channel_id: str) -> bool:
+        row = self.db.execute(
+            "SELECT 1 FROM fan_stats WHERE channel_id = ? LIMIT 1", (channel_id,)
+        ).fetchone()
+        return row is not None
+
+    def top_fans(
+        self,
+        channel_id: str,
+        min_comments: int = 3,
+        limit: int = 10,
+        offset: int = 0,
+        sort: str = 'comments',
+    ) -> Dict[str, Any]:
+        order_by = FAN_SORT_COLUMNS[sort]
+        total = self.db.execute(
+            "SELECT COUNT(*) FROM fan_stats WHERE channel_id = ? AND comment_count >= ?",
+            (channel_id, min_comments),
+        ).fetchone()[0]
+        video_count = self.db.execute(
+            "SELECT COUNT(DISTINCT video_id) FROM fan_videos WHERE channel_id = ?", (channel_id,)
+        ).fetchone()[0]
+        rows = self.db.execute(
+            f"SELECT * FROM fan_stats WHERE channel_id = ? AND comment_count >= ? "
+            f"ORDER BY {order_by} LIMIT ? OFFSET ?",
+            (channel_id, min_comments, limit, offset),
+        ).fetchall()
+
+        return {
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'items': [
+                {
+                    'authorChannelId': row['author_id'],
+                    'author': row['author'],
+                    'commentCount': row['comment_count'],
+                    'totalLikes': row['total_likes'],
+                    'uniqueVideos': row['unique_videos'],
+                    'firstActivityDate': row['first_at'],
+                    'lastActivityDate': row['last_at'],
+                    'lastComment': row['last_comment'],
+                    # 댓글이 달린 전체 비디오 중 이 팬이 참여한 비율
+                    'engagementRate': row['unique_videos'] / video_count if video_count else 0,
+                }
+                for row in rows
+            ],
+        }
+
+    def chart_summary(self, channel_id: str, min_comments: int = 3) -> Optional[Dict[str, Any]]:
+        """`analyze_chart_data('core_fans', ...)` 에 넣을 핵심 팬 요약값을 계산합니다."""
+        fans = self.top_fans(channel_id, min_comments, limit=1000)
+        items = fans['items']
+        if not items:
+            return None
+        top = items[0]
+        return {
+            'total_core_fans': fans['total'],
+            'top_fan_comments': top['commentCount'],
+            'top_fan_likes': top['totalLikes'],
+            'top_fan_engagement': round(top['engagementRate'] * 100, 1),
+            'avg_comments_per_fan': sum(fan['commentCount'] for fan in items) / len(items),
+            'avg_engagement_rate': sum(fan['engagementRate'] for fan in items) / len(items) * 100,
+        }
+
+    def fan_comments(self, channel_id: str, author_id: str, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+        rows = self.db.execute(
+            "SELECT comment_id, video_id, video_title, text, like_count, published_at FROM fan_comments "
+            "WHERE channel_id = ? AND author_id = ? ORDER BY published_at DESC LIMIT ? OFFSET ?",
+            (channel_id, author_id, limit, offset),
+        ).fetchall()
+        return [
+            {
+                'id': row['comment_id'],
+                'videoId': row['video_id'],
+                'videoTitle': row['video_title'],
+                'text': row['text'],
+                'likeCount': row['like_count'],
+                'publishedAt': row['published_at'],
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def author_key(comment: Dict[str, Any]) -> str:
+        author_channel = comment.get('authorChannelId') or {}
+        if isinstance(author_channel, dict) and author_channel.get('value'):
+            return author_channel['value']
+        # 채널 ID 가 없는 작성자는 표시 이름으로 구분
+        return f"name:{comment.get('author', '')}"
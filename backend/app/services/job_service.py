@@ -0,0 +1,194 @@
+import asyncio
+import json
+import sqlite3
+import time
+import uuid
+from typing import Optional, Dict, Any, List
+from ..db import get_connection
+from ..metrics import track_usage
+from .youtube_service import YouTubeService
+from .openai_service import OpenAIService
+from .analytics_service import AnalyticsService
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class JobService:
+    """채널 수집 작업을 백그라운드 작업자 풀에서 실행합니다.
+
+    작업은 SQLite 에 저장되어 재시작 후에도 마지막으로 처리한 재생목록 페이지
+    토큰부터 이어서 실행됩니다. 같은 채널에 진행 중인 작업이 있으면 새로 만들지
+    않고 기존 작업을 돌려줍니다.
+    """
+
+    def __init__(
+        self,
+        youtube_service: YouTubeService,
+        openai_service: OpenAIService,
+        analytics_service: AnalyticsService,
+        workers: int = 2,
+        connection: Optional[sqlite3.Connection] = None,
+    ):
+        self.youtube_service = youtube_service
+        self.openai_service = openai_service
+        self.analytics_service = analytics_service
+        self.workers = workers
+        self.db = connection or get_connection()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._lock = asyncio.Lock()
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                channel_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                stage TEXT,
+                analyze INTEGER NOT NULL,
+                page_token TEXT,
+                progress TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_channel ON jobs (channel_id, status);
+        """)
+
+    async def start(self) -> None:
+        """작업자를 띄우고, 끝나지 않은 작업(재시작 전 실행 중이던 작업 포함)을 다시 큐에 넣습니다."""
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        rows = self.db.execute(
+            "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at", ACTIVE_STATUSES
+        ).fetchall()
+        for row in rows:
+            self._queue.put_nowait(row['id'])
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, channel_id: str, analyze: bool = True) -> Dict[str, Any]:
+        # 큐가 없으면 넣은 작업을 아무도 꺼내지 않아 'queued' 로 영영 남으므로 먼저 확인
+        if self._queue is None:
+            raise RuntimeError("JobService has not been started")
+        async with self._lock:
+            row = self.db.execute(
+                "SELECT id FROM jobs WHERE channel_id = ? AND status IN (?, ?)",
+                (channel_id, *ACTIVE_STATUSES),
+            ).fetchone()
+            if row is not None:
+                return self.get(row['id'])
+
+            # 마지막 작업이 수집 도중 실패했다면 그 페이지부터 이어서 수집
+            last = self.db.execute(
+                "SELECT status, stage, page_token, progress FROM jobs WHERE channel_id = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (channel_id,),
+            ).fetchone()
+            if last is not None and last['status'] == 'failed' and last['stage'] == 'crawl' and last['page_token']:
+                page_token, progress = last['page_token'], last['progress']
+            else:
+                page_token = None
+                progress = json.dumps({'pages': 0, 'videos': 0, 'comments': 0, 'failedVideos': 0, 'quotaUnits': 0})
+
+            job_id = uuid.uuid4().hex
+            now = time.time()
+            self.db.execute(
+                "INSERT INTO jobs (id, channel_id, status, stage, analyze, page_token, progress, "
+                "created_at, updated_at) VALUES (?, ?, 'queued', NULL, ?, ?, ?, ?, ?)",
+                (job_id, channel_id, int(analyze), page_token, progress, now, now),
+            )
+        await self._queue.put(job_id)
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self.db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'id': row['id'],
+            'channelId': row['channel_id'],
+            'status': row['status'],
+            'stage': row['stage'],
+            'progress': json.loads(row['progress']),
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error'],
+            'createdAt': row['created_at'],
+            'updatedAt': row['updated_at'],
+        }
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            with track_usage() as usage:
+                try:
+                    await self._run(job_id)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"Job {job_id} failed: {str(e)}")
+                    self._update(job_id, status='failed', error=str(e))
+                finally:
+                    # 실패/재개한 실행도 포함해 작업이 쓴 YouTube 할당량을 누적
+                    self._add_quota(job_id, usage.quota_units)
+                    self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        row = self.db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or row['status'] not in ACTIVE_STATUSES:
+            return
+
+        channel_id = row['channel_id']
+        progress = json.loads(row['progress'])
+        youtube = self.youtube_service
+
+        # 1. 비디오/댓글 수집: 페이지마다 저장하고 다음 페이지 토큰을 기록
+        if row['stage'] in (None, 'crawl'):
+            self._update(job_id, status='running', stage='crawl')
+            async for videos, next_page_token in youtube.iter_video_pages(channel_id, row['page_token']):
+                youtube.video_store.add_videos(channel_id, videos)
+                youtube.search_index.add_videos(channel_id, videos)
+                stats = await youtube.ingest_video_comments(channel_id, videos)
+                progress['pages'] += 1
+                progress['videos'] += len(videos)
+                progress['comments'] += stats['comments']
+                progress['failedVideos'] += stats['failed']
+                self._update(job_id, progress=progress, page_token=next_page_token)
+
+            youtube.video_store.mark_synced(channel_id, await youtube.get_uploads_playlist_id(channel_id))
+            youtube.fan_index.mark_indexed(channel_id)
+            await youtube.record_snapshot(channel_id=channel_id, videos=youtube.video_store.get_videos(channel_id))
+
+        # 2. 차트 인사이트 생성
+        result = {}
+        if row['analyze']:
+            self._update(job_id, status='running', stage='analyze')
+            videos = youtube.video_store.get_videos(channel_id)
+            charts = self.analytics_service.compute(videos)['chartInputs'] if videos else {}
+            core_fans = youtube.fan_index.chart_summary(channel_id)
+            if core_fans:
+                charts['core_fans'] = core_fans
+            result['insights'] = await self.openai_service.analyze_charts(charts) if charts else {}
+
+        self._update(job_id, status='done', stage=None, result=result)
+
+    def _add_quota(self, job_id: str, units: int) -> None:
+        row = self.db.execute("SELECT progress FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or not units:
+            return
+        progress = json.loads(row['progress'])
+        progress['quotaUnits'] = progress.get('quotaUnits', 0) + units
+        self._update(job_id, progress=progress)
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        for name in ('progress', 'result'):
+            if name in fields:
+                fields[name] = json.dumps(fields[name], ensure_ascii=False)
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        self.db.execute(
+            f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ?",
+            (*fields.values(), time.time(), job_id),
+        )
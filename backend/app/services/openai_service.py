@@ -1,177 +1,557 @@
 from openai import AsyncOpenAI
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple, Callable, Awaitable
+import asyncio
+import hashlib
 import os
 import json
+import re
+import textwrap
+import time
 from dotenv import load_dotenv
-import random
+from ..config import settings
+from ..metrics import record_upstream, record_tokens
+from .cache_service import ResponseCache
+from .singleflight import SingleFlight
+from .comment_analyzer import CommentAnalyzer
 
 load_dotenv()
 
+# 프롬프트나 결과 형식을 바꾸면 올려서 이전 캐시를 무효화합니다.
+COMMENT_PROMPT_VERSION = "comments-v2"
+
+COMMENT_ANALYSIS_PROMPT = """다음 유튜브 댓글들을 분석해주세요:
+
+{comments}
+
+다음 형식의 JSON으로 응답해주세요:
+{{
+    "keywords": [
+        {{"word": "키워드", "count": 출현횟수, "examples": ["예시 댓글1", "예시 댓글2"]}}
+    ],
+    "sentiment": {{
+        "positive": 긍정비율(0-100),
+        "negative": 부정비율(0-100),
+        "neutral": 중립비율(0-100),
+        "examples": {{
+            "positive": ["긍정 댓글1", "긍정 댓글2"],
+            "negative": ["부정 댓글1", "부정 댓글2"],
+            "neutral": ["중립 댓글1", "중립 댓글2"]
+        }}
+    }},
+    "categories": [
+        {{"name": "주제", "examples": ["관련 댓글1", "관련 댓글2"]}}
+    ],
+    "feedback": [
+        {{"type": "피드백 유형", "content": "피드백 내용", "examples": ["관련 댓글1", "관련 댓글2"]}}
+    ]
+}}"""
+
+# 로컬 사전 집계 후 LLM 에는 주제와 피드백만 요청
+COMMENT_INSIGHT_PROMPT = """다음은 유튜브 댓글 {total}개를 미리 집계한 결과입니다.
+감성 비율: 긍정 {positive}%, 부정 {negative}%, 중립 {neutral}%
+주요 키워드: {keywords}
+
+대표 댓글:
+{comments}
+
+댓글의 주제와 시청자 피드백을 다음 형식의 JSON으로 응답해주세요:
+{{
+    "categories": [
+        {{"name": "주제", "examples": ["관련 댓글1", "관련 댓글2"]}}
+    ],
+    "feedback": [
+        {{"type": "피드백 유형", "content": "피드백 내용", "examples": ["관련 댓글1", "관련 댓글2"]}}
+    ]
+}}"""
+
+CHART_PROMPTS = {
+    'engagement': """
+        다음은 유튜브 채널의 참여율 데이터입니다:
+        평균 좋아요 비율: {like_ratio}%
+        평균 댓글 비율: {comment_ratio}%
+        평균 총 참여율: {total_engagement}%
+
+        이 데이터를 바탕으로 채널의 시청자 참여도에 대해 한 문장으로 분석해주세요.
+        전문적이고 통찰력 있게 작성해주세요.
+    """,
+    'growth': """
+        다음은 유튜브 채널의 성장 지표입니다:
+        총 조회수: {total_views}
+        평균 조회수: {avg_views}
+        조회수 증가율: {view_growth}%
+
+        이 데이터를 바탕으로 채널의 성장세에 대해 한 문장으로 분석해주세요.
+        전문적이고 통찰력 있게 작성해주세요.
+    """,
+    'upload': """
+        다음은 유튜브 채널의 업로드 패턴 데이터입니다:
+        가장 많이 업로드하는 요일: {top_day}
+        가장 많이 업로드하는 시간대: {top_hour}
+        평균 업로드 주기: {upload_interval}일
+
+        이 데이터를 바탕으로 채널의 콘텐츠 업로드 전략에 대해 한 문장으로 분석해주세요.
+        전문적이고 통찰력 있게 작성해주세요.
+    """,
+    'content_performance': """
+        다음은 유튜브 채널의 영상 길이별 성과 데이터입니다:
+        가장 성과가 좋은 길이: {best_duration}
+        - 평균 조회수: {best_views}회
+        - 평균 참여율: {best_engagement}%
+
+        10분 미만 영상 평균 조회수: {short_views}회
+        10-20분 영상 평균 조회수: {medium_views}회
+        20분 이상 영상 평균 조회수: {long_views}회
+
+        이 데이터를 바탕으로 최적의 영상 길이 전략에 대해 한 문장으로 분석해주세요.
+        전문적이고 통찰력 있게 작성해주세요.
+    """,
+    'core_fans': """
+        다음은 유튜브 채널의 핵심 팬 데이터입니다:
+        핵심 팬 수: {total_core_fans}명
+        최고 활동 팬:
+        - 댓글 수: {top_fan_comments}개
+        - 받은 좋아요: {top_fan_likes}개
+        - 참여율: {top_fan_engagement}%
+
+        핵심 팬 평균:
+        - 팬당 평균 댓글 수: {avg_comments_per_fan:.1f}개
+        - 평균 참여율: {avg_engagement_rate:.1f}%
+
+        이 데이터를 바탕으로 채널의 팬 커뮤니티 특성에 대해 한 문장으로 분석해주세요.
+        전문적이고 통찰력 있게 작성해주세요.
+    """
+}
+
+CHART_PROMPT_VERSION = "charts-v1"
+
+CHART_SYSTEM_PROMPT = "당신은 유튜브 채널 분석 전문가입니다. 데이터를 바탕으로 전문적이고 통찰력 있는 분석을 제공합니다."
+
+# 병합 결과에 남길 예시/항목 수
+MAX_EXAMPLES = 3
+MAX_MERGED_ITEMS = 10
+
+
 class OpenAIService:
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        chart_cache: Optional[ResponseCache] = None,
+        comment_analyzer: Optional[CommentAnalyzer] = None,
+    ):
         self.client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        self.comment_analyzer = comment_analyzer or CommentAnalyzer()
+        # LLM 결과는 재검증할 ETag 가 없으므로 만료되면 바로 정리 대상
+        self.cache = cache or ResponseCache(
+            memory_size=settings.LLM_CACHE_MEMORY_SIZE, table='llm_cache',
+            stale_ttl=0, max_rows=settings.LLM_CACHE_MAX_ROWS,
+        )
+        self.chart_cache = chart_cache or ResponseCache(
+            memory_size=settings.LLM_CACHE_MEMORY_SIZE, table='chart_insights',
+            stale_ttl=0, max_rows=settings.LLM_CACHE_MAX_ROWS,
+        )
+        self._inflight = SingleFlight()
+
+    async def analyze_comments(
+        self,
+        comments: List[str],
+        video_id: Optional[str] = None,
+        map_reduce: bool = False,
+    ) -> Dict:
+        """댓글을 분석합니다.
 
-    async def analyze_comments(self, comments: List[str]) -> Dict:
+        결과는 (비디오, 정규화된 댓글 집합, 프롬프트 버전, 모드)의 해시로 캐시되며,
+        같은 입력으로 동시에 들어온 요청은 한 번의 LLM 호출로 합쳐집니다.
+        `map_reduce` 이면 샘플링 대신 모든 댓글을 토큰 예산 단위로 나눠 분석한 뒤 병합합니다.
+        `LLM_LOCAL_PREPASS` 이면 keywords/sentiment 는 전체 댓글로 로컬에서 계산하고,
+        LLM 은 categories/feedback 만 만듭니다.
+        """
         try:
-            if not comments:
+            unique_comments = self._normalize_comments(comments)
+            if not unique_comments:
                 return self._get_empty_analysis()
 
-            # 댓글 샘플링 및 전처리
-            sampled_comments = self._prepare_comments(comments)
-            
-            response = await self.client.chat.completions.create(
+            key = self._cache_key(video_id, unique_comments, map_reduce)
+            cached = self.cache.get(key)
+            if cached is not None and cached.is_fresh():
+                return cached.body
+
+            async def run() -> Dict:
+                failed = 0
+                if settings.LLM_LOCAL_PREPASS:
+                    result, failed = await self._analyze_with_prepass(unique_comments, map_reduce)
+                elif map_reduce:
+                    result, failed = await self._analyze_map_reduce(unique_comments, self._analyze_batch)
+                else:
+                    result = await self._analyze_batch(self._prepare_comments(unique_comments))
+                if failed:
+                    # 일부 묶음만 분석된 결과는 캐시하지 않고 부분 결과임을 표시
+                    return {**result, 'partial': True, 'failedChunks': failed}
+                self.cache.set(key, result, None, settings.LLM_CACHE_TTL)
+                return result
+
+            return await self._inflight.do(key, run)
+
+        except json.JSONDecodeError as e:
+            print(f"Failed to parse OpenAI response: {e.doc}")
+            return self._get_error_analysis("응답 형식 오류")
+        except Exception as e:
+            print(f"Error in analyze_comments: {str(e)}")
+            return self._get_error_analysis(str(e))
+
+    async def _create_completion(self, **kwargs):
+        """chat.completions.create 호출에 걸린 시간과 토큰 사용량을 기록합니다."""
+        model = kwargs['model']
+        started = time.perf_counter()
+        try:
+            response = await self.client.chat.completions.create(**kwargs)
+        except Exception:
+            record_upstream('openai', model, 'error', time.perf_counter() - started)
+            raise
+        record_upstream('openai', model, 'ok', time.perf_counter() - started)
+        record_tokens(model, response.usage)
+        return response
+
+    async def _analyze_batch(self, comment_block: str) -> Dict:
+        response = await self._create_completion(
+            model="gpt-3.5-turbo-16k",
+            messages=[
+                {
+                    "role": "system",
+                    "content": """You are a YouTube comment analyzer. 
+                    Analyze the comments and return a JSON response."""
+                },
+                {
+                    "role": "user",
+                    "content": COMMENT_ANALYSIS_PROMPT.format(comments=comment_block)
+                }
+            ],
+            temperature=0.5,
+            max_tokens=4000
+        )
+
+        content = response.choices[0].message.content
+        return json.loads(content)
+
+    async def _analyze_with_prepass(self, comments: List[str], map_reduce: bool) -> Tuple[Dict, int]:
+        # 전체 댓글 집계는 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        local = await asyncio.to_thread(self.comment_analyzer.analyze, comments)
+        summary = {
+            'total': len(comments),
+            **{label: local['sentiment'][label] for label in ('positive', 'negative', 'neutral')},
+            'keywords': ', '.join(f"{keyword['word']}({keyword['count']})" for keyword in local['keywords']),
+        }
+
+        async def analyze_insights(comment_block: str) -> Dict:
+            response = await self._create_completion(
                 model="gpt-3.5-turbo-16k",
                 messages=[
                     {
                         "role": "system",
-                        "content": """You are a YouTube comment analyzer. 
-                        Analyze the comments and return a JSON response."""
+                        "content": "You are a YouTube comment analyzer. Return a JSON response."
                     },
                     {
                         "role": "user",
-                        "content": f"""다음 유튜브 댓글들을 분석해주세요:
-
-                        {sampled_comments}
-
-                        다음 형식의 JSON으로 응답해주세요:
-                        {{
-                            "keywords": [
-                                {{"word": "키워드", "count": 출현횟수, "examples": ["예시 댓글1", "예시 댓글2"]}}
-                            ],
-                            "sentiment": {{
-                                "positive": 긍정비율(0-100),
-                                "negative": 부정비율(0-100),
-                                "neutral": 중립비율(0-100),
-                                "examples": {{
-                                    "positive": ["긍정 댓글1", "긍정 댓글2"],
-                                    "negative": ["부정 댓글1", "부정 댓글2"],
-                                    "neutral": ["중립 댓글1", "중립 댓글2"]
-                                }}
-                            }},
-                            "categories": [
-                                {{"name": "주제", "examples": ["관련 댓글1", "관련 댓글2"]}}
-                            ],
-                            "feedback": [
-                                {{"type": "피드백 유형", "content": "피드백 내용", "examples": ["관련 댓글1", "관련 댓글2"]}}
-                            ]
-                        }}"""
+                        "content": COMMENT_INSIGHT_PROMPT.format(comments=comment_block, **summary)
                     }
                 ],
                 temperature=0.5,
-                max_tokens=4000
+                max_tokens=1500
             )
+            return json.loads(response.choices[0].message.content)
 
-            content = response.choices[0].message.content
-            
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                print(f"Failed to parse OpenAI response: {content}")
-                return self._get_error_analysis("응답 형식 오류")
+        failed = 0
+        if map_reduce:
+            insights, failed = await self._analyze_map_reduce(comments, analyze_insights)
+        else:
+            examples = self.comment_analyzer.representative_examples(
+                comments, local, settings.LLM_EXAMPLE_COMMENTS
+            )
+            insights = await analyze_insights('\n'.join(self._truncate(comment) for comment in examples))
 
-        except Exception as e:
-            print(f"Error in analyze_comments: {str(e)}")
-            return self._get_error_analysis(str(e))
+        return {
+            'keywords': local['keywords'],
+            'sentiment': local['sentiment'],
+            'categories': insights.get('categories', []),
+            'feedback': insights.get('feedback', []),
+        }, failed
+
+    async def _analyze_map_reduce(
+        self,
+        comments: List[str],
+        analyze: Callable[[str], Awaitable[Dict]],
+    ) -> Tuple[Dict, int]:
+        """묶음별로 분석해 병합한 결과와 실패한 묶음 수를 반환합니다. 모두 실패하면 예외를 전달합니다."""
+        semaphore = asyncio.Semaphore(settings.LLM_MAP_CONCURRENCY)
+
+        async def analyze_chunk(chunk: List[str]) -> Dict:
+            async with semaphore:
+                return await analyze('\n'.join(chunk))
+
+        chunks = self._chunk_comments(comments, settings.LLM_CHUNK_TOKENS)
+        results = await asyncio.gather(*(analyze_chunk(chunk) for chunk in chunks), return_exceptions=True)
+
+        succeeded = [
+            (len(chunk), result) for chunk, result in zip(chunks, results)
+            if not isinstance(result, BaseException)
+        ]
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if not succeeded:
+            raise errors[0]
+        for error in errors:
+            print(f"Error in analyze_comments map-reduce chunk: {str(error)}")
+        return self._merge_analyses(succeeded), len(errors)
 
     async def analyze_chart_data(self, chart_type: str, data: dict) -> str:
         try:
-            prompts = {
-                'engagement': """
-                    다음은 유튜브 채널의 참여율 데이터입니다:
-                    평균 좋아요 비율: {like_ratio}%
-                    평균 댓글 비율: {comment_ratio}%
-                    평균 총 참여율: {total_engagement}%
-                    
-                    이 데이터를 바탕으로 채널의 시청자 참여도에 대해 한 문장으로 분석해주세요.
-                    전문적이고 통찰력 있게 작성해주세요.
-                """,
-                'growth': """
-                    다음은 유튜브 채널의 성장 지표입니다:
-                    총 조회수: {total_views}
-                    평균 조회수: {avg_views}
-                    조회수 증가율: {view_growth}%
-                    
-                    이 데이터를 바탕으로 채널의 성장세에 대해 한 문장으로 분석해주세요.
-                    전문적이고 통찰력 있게 작성해주세요.
-                """,
-                'upload': """
-                    다음은 유튜브 채널의 업로드 패턴 데이터입니다:
-                    가장 많이 업로드하는 요일: {top_day}
-                    가장 많이 업로드하는 시간대: {top_hour}
-                    평균 업로드 주기: {upload_interval}일
-                    
-                    이 데이터를 바탕으로 채널의 콘텐츠 업로드 전략에 대해 한 문장으로 분석해주세요.
-                    전문적이고 통찰력 있게 작성해주세요.
-                """,
-                'content_performance': """
-                    다음은 유튜브 채널의 영상 길이별 성과 데이터입니다:
-                    가장 성과가 좋은 길이: {best_duration}
-                    - 평균 조회수: {best_views}회
-                    - 평균 참여율: {best_engagement}%
-                    
-                    10분 미만 영상 평균 조회수: {short_views}회
-                    10-20분 영상 평균 조회수: {medium_views}회
-                    20분 이상 영상 평균 조회수: {long_views}회
-                    
-                    이 데이터를 바탕으로 최적의 영상 길이 전략에 대해 한 문장으로 분석해주세요.
-                    전문적이고 통찰력 있게 작성해주세요.
-                """,
-                'core_fans': """
-                    다음은 유튜브 채널의 핵심 팬 데이터입니다:
-                    핵심 팬 수: {total_core_fans}명
-                    최고 활동 팬:
-                    - 댓글 수: {top_fan_comments}개
-                    - 받은 좋아요: {top_fan_likes}개
-                    - 참여율: {top_fan_engagement}%
-                    
-                    핵심 팬 평균:
-                    - 팬당 평균 댓글 수: {avg_comments_per_fan:.1f}개
-                    - 평균 참여율: {avg_engagement_rate:.1f}%
-                    
-                    이 데이터를 바탕으로 채널의 팬 커뮤니티 특성에 대해 한 문장으로 분석해주세요.
-                    전문적이고 통찰력 있게 작성해주세요.
-                """
-            }
-
-            prompt = prompts[chart_type].format(**data)
-            
-            response = await self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "당신은 유튜브 채널 분석 전문가입니다. 데이터를 바탕으로 전문적이고 통찰력 있는 분석을 제공합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=100
-            )
-            
-            return response.choices[0].message.content
+            data = self._round_metrics(data)
+            key = self._chart_cache_key(chart_type, data)
+            cached = self.chart_cache.get(key)
+            if cached is not None and cached.is_fresh():
+                return cached.body['analysis']
+
+            async def run() -> str:
+                prompt = CHART_PROMPTS[chart_type].format(**data)
+                
+                response = await self._create_completion(
+                    model="gpt-4",
+                    messages=[
+                        {"role": "system", "content": CHART_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=100
+                )
+                
+                analysis = response.choices[0].message.content
+                self.chart_cache.set(key, {'analysis': analysis}, None, settings.CHART_INSIGHT_TTL)
+                return analysis
+
+            return await self._inflight.do(key, run)
             
         except Exception as e:
             print(f"Error in analyze_chart_data: {str(e)}")
             return None
 
+    async def analyze_charts(self, charts: Dict[str, dict]) -> Dict[str, Optional[str]]:
+        """여러 차트의 인사이트를 한 번의 구조화 출력 호출로 생성합니다.
+
+        차트별로 (차트 종류, 반올림한 입력값)에 대해 캐시하므로, 캐시에 없는 차트만
+        모아 한 번에 요청합니다. 모두 캐시에 있으면 LLM 을 호출하지 않습니다.
+        알 수 없는 차트나 입력값이 모자란 차트는 그 차트만 None 으로 반환합니다.
+        """
+        insights: Dict[str, Optional[str]] = {}
+        missing: Dict[str, Tuple[str, str]] = {}
+        for chart_type, data in charts.items():
+            data = self._round_metrics(data)
+            prompt = self._render_chart_prompt(chart_type, data)
+            if prompt is None:
+                insights[chart_type] = None
+                continue
+            key = self._chart_cache_key(chart_type, data)
+            cached = self.chart_cache.get(key)
+            if cached is not None and cached.is_fresh():
+                insights[chart_type] = cached.body['analysis']
+            else:
+                missing[chart_type] = (key, prompt)
+
+        if not missing:
+            return insights
+
+        try:
+            batch_key = "charts:" + ",".join(key for key, _ in missing.values())
+            generated = await self._inflight.do(batch_key, lambda: self._generate_chart_insights(missing))
+        except Exception as e:
+            print(f"Error in analyze_charts: {str(e)}")
+            generated = {}
+
+        for chart_type in missing:
+            insights[chart_type] = generated.get(chart_type)
+        return insights
+
+    @classmethod
+    def chart_input_errors(cls, charts: Dict[str, dict]) -> Dict[str, str]:
+        """차트별 입력 오류(알 수 없는 차트 종류, 누락되었거나 형식이 맞지 않는 값)를 반환합니다."""
+        errors = {}
+        for chart_type, data in charts.items():
+            if chart_type not in CHART_PROMPTS:
+                errors[chart_type] = f"Unknown chart type: {chart_type}"
+            elif cls._render_chart_prompt(chart_type, cls._round_metrics(data)) is None:
+                fields = sorted(set(re.findall(r'{(\w+)', CHART_PROMPTS[chart_type])))
+                errors[chart_type] = f"Invalid chart data, expected fields: {', '.join(fields)}"
+        return errors
+
+    @staticmethod
+    def _render_chart_prompt(chart_type: str, data: dict) -> Optional[str]:
+        if chart_type not in CHART_PROMPTS:
+            return None
+        try:
+            return textwrap.dedent(CHART_PROMPTS[chart_type].format(**data)).strip()
+        except (KeyError, IndexError, ValueError, TypeError):
+            return None
+
+    async def _generate_chart_insights(self, charts: Dict[str, Tuple[str, str]]) -> Dict[str, str]:
+        sections = "\n\n".join(f"[{chart_type}]\n{prompt}" for chart_type, (_, prompt) in charts.items())
+        response = await self._create_completion(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": CHART_SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"""아래 각 차트 데이터에 대해 요청된 분석을 작성하고,
+                    차트 이름을 키로, 분석 문장을 값으로 하는 JSON 으로 응답해주세요.
+
+                    {sections}"""
+                }
+            ],
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "chart_insights",
+                    "strict": True,
+                    "schema": {
+                        "type": "object",
+                        "properties": {chart_type: {"type": "string"} for chart_type in charts},
+                        "required": list(charts),
+                        "additionalProperties": False
+                    }
+                }
+            },
+            temperature=0.7,
+            max_tokens=150 * len(charts)
+        )
+
+        generated = json.loads(response.choices[0].message.content)
+        for chart_type, (key, _) in charts.items():
+            if generated.get(chart_type):
+                self.chart_cache.set(key, {'analysis': generated[chart_type]}, None, settings.CHART_INSIGHT_TTL)
+        return generated
+
+    @staticmethod
+    def _round_metrics(data: dict) -> dict:
+        """캐시 적중률을 높이도록 입력값을 반올림합니다 (실수는 소수 첫째 자리, 큰 정수는 유효숫자 3자리)."""
+        rounded = {}
+        for name, value in data.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                rounded[name] = value
+            elif isinstance(value, float):
+                rounded[name] = round(value, 1)
+            elif abs(value) >= 1000:
+                rounded[name] = round(value, 3 - len(str(abs(value))))
+            else:
+                rounded[name] = value
+        return rounded
+
+    @staticmethod
+    def _chart_cache_key(chart_type: str, data: dict) -> str:
+        payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+        return f"{CHART_PROMPT_VERSION}:{chart_type}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
     def _prepare_comments(self, comments: List[str]) -> str:
-        """댓글을 전처리하고 샘플링합니다."""
-        # 빈 댓글 제거
-        filtered_comments = [c for c in comments if c and len(c.strip()) > 0]
-        
-        # 중복 제거
-        unique_comments = list(set(filtered_comments))
-        
-        # 댓글이 너무 많으면 샘플링
-        if len(unique_comments) > 100:
-            sampled_comments = random.sample(unique_comments, 100)
+        """정규화된 댓글을 샘플링합니다. 같은 입력에는 항상 같은 표본을 고릅니다."""
+        # 댓글이 너무 많으면 해시 순서로 결정적 샘플링
+        if len(comments) > 100:
+            sampled_comments = sorted(comments, key=self._comment_digest)[:100]
         else:
-            sampled_comments = unique_comments
+            sampled_comments = comments
         
+        return '\n'.join(self._truncate(comment) for comment in sampled_comments)
+
+    @staticmethod
+    def _normalize_comments(comments: List[str]) -> List[str]:
+        """빈 댓글과 중복을 제거하고 공백을 정리해 정렬된 목록으로 만듭니다."""
+        normalized = {' '.join(c.split()) for c in comments if c and c.strip()}
+        return sorted(normalized)
+
+    @staticmethod
+    def _comment_digest(comment: str) -> str:
+        return hashlib.sha1(comment.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _truncate(comment: str) -> str:
         # 각 댓글의 길이 제한
-        processed_comments = [
-            comment[:200] + '...' if len(comment) > 200 else comment
-            for comment in sampled_comments
-        ]
-        
-        return '\n'.join(processed_comments)
+        return comment[:200] + '...' if len(comment) > 200 else comment
+
+    @staticmethod
+    def _cache_key(video_id: Optional[str], comments: List[str], map_reduce: bool) -> str:
+        digest = hashlib.sha256()
+        for comment in comments:
+            digest.update(comment.encode('utf-8'))
+            digest.update(b'\0')
+        mode = 'map_reduce' if map_reduce else 'sample'
+        if settings.LLM_LOCAL_PREPASS:
+            mode += '+local'
+        return f"{COMMENT_PROMPT_VERSION}:{mode}:{video_id or '-'}:{digest.hexdigest()}"
+
+    @classmethod
+    def _chunk_comments(cls, comments: List[str], token_budget: int) -> List[List[str]]:
+        """댓글을 추정 토큰 수가 `token_budget` 을 넘지 않는 묶음으로 나눕니다."""
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        used = 0
+        for comment in comments:
+            comment = cls._truncate(comment)
+            # 한국어는 대략 글자당 1토큰으로 보수적으로 추정
+            tokens = len(comment) + 1
+            if current and used + tokens > token_budget:
+                chunks.append(current)
+                current, used = [], 0
+            current.append(comment)
+            used += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    def _merge_analyses(results: List[Tuple[int, Dict]]) -> Dict:
+        """묶음별 분석 결과를 합칩니다. 감성 비율은 묶음의 댓글 수로 가중 평균합니다."""
+        keywords: Dict[str, Dict] = {}
+        categories: Dict[str, Dict] = {}
+        feedback: Dict[Tuple[str, str], Dict] = {}
+        sentiment = {'positive': 0.0, 'negative': 0.0, 'neutral': 0.0}
+        sentiment_examples: Dict[str, List[str]] = {'positive': [], 'negative': [], 'neutral': []}
+        total = sum(size for size, _ in results)
+
+        def add_examples(target: List[str], examples: List[str]) -> None:
+            for example in examples or []:
+                if len(target) < MAX_EXAMPLES and example not in target:
+                    target.append(example)
+
+        for size, result in results:
+            for keyword in result.get('keywords', []):
+                merged = keywords.setdefault(keyword['word'], {'word': keyword['word'], 'count': 0, 'examples': []})
+                merged['count'] += int(keyword.get('count') or 0)
+                add_examples(merged['examples'], keyword.get('examples'))
+
+            chunk_sentiment = result.get('sentiment', {})
+            for label in sentiment:
+                sentiment[label] += float(chunk_sentiment.get(label) or 0) * size / total
+                add_examples(sentiment_examples[label], chunk_sentiment.get('examples', {}).get(label))
+
+            for category in result.get('categories', []):
+                merged = categories.setdefault(category['name'], {'name': category['name'], 'examples': [], 'count': 0})
+                merged['count'] += 1
+                add_examples(merged['examples'], category.get('examples'))
+
+            for item in result.get('feedback', []):
+                merged = feedback.setdefault(
+                    (item.get('type', ''), item.get('content', '')),
+                    {'type': item.get('type', ''), 'content': item.get('content', ''), 'examples': []}
+                )
+                add_examples(merged['examples'], item.get('examples'))
+
+        top_categories = sorted(categories.values(), key=lambda c: c['count'], reverse=True)[:MAX_MERGED_ITEMS]
+        for category in top_categories:
+            del category['count']
+
+        return {
+            'keywords': sorted(keywords.values(), key=lambda k: k['count'], reverse=True)[:MAX_MERGED_ITEMS],
+            'sentiment': {
+                **{label: round(value) for label, value in sentiment.items()},
+                'examples': sentiment_examples,
+            },
+            'categories': top_categories,
+            'feedback': list(feedback.values())[:MAX_MERGED_ITEMS],
+        }
 
     def _get_empty_analysis(self) -> Dict:
         return {
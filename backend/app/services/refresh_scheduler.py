@@ -0,0 +1,308 @@
+import asyncio
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Set, Tuple
+from zoneinfo import ZoneInfo
+from ..db import get_connection
+from ..metrics import track_usage
+from .youtube_service import YouTubeService
+from .openai_service import OpenAIService
+from .analytics_service import AnalyticsService
+
+DAY = 24 * 60 * 60
+# 오래 방치된 채널이 접근 빈도와 무관하게 맨 앞을 차지하지 않도록 경과 시간 상한
+MAX_STALENESS = 7 * DAY
+# 갱신 기록도 저장된 비디오도 없는 채널의 예상 할당량
+DEFAULT_COST_ESTIMATE = 100
+# 비디오 통계를 한 번에 갱신하는 videos 호출당 비디오 수
+VIDEOS_PER_PAGE = 50
+
+
+class RefreshScheduler:
+    """추적 중인 채널의 비디오 목록과 차트 인사이트를 한가한 시간대에 미리 갱신합니다.
+
+    채널 정보를 조회할 때마다 접근 횟수(반감기 적용)를 기록하고, 갱신 창 안에서
+    `interval` 마다 우선순위(접근 빈도 x 경과 시간) 순으로 대화형 조회와 같은 증분
+    동기화(`sync_channel_videos`)를 돌립니다. 최근 창에서 갱신한 채널은 지표/인사이트
+    조회가 그 결과를 그대로 쓰도록 `sync_max_age` 로 유효 시간을 늘려 줍니다.
+    하루 예산은 창 전체에 고르게 나눠, 창 시작부터 지금까지의 몫에서 오늘 이미
+    쓴 할당량을 뺀 만큼만 씁니다. 실제 사용량은 채널별로 기록해 다음 예상치로
+    씁니다.
+    """
+
+    def __init__(
+        self,
+        youtube_service: YouTubeService,
+        openai_service: OpenAIService,
+        analytics_service: AnalyticsService,
+        daily_quota: int = 3000,
+        window: Tuple[int, int] = (1, 7),
+        interval: float = 300,
+        min_age: float = 6 * 60 * 60,
+        auto_track: bool = False,
+        access_half_life: float = 7 * DAY,
+        timezone: str = 'Asia/Seoul',
+        connection: Optional[sqlite3.Connection] = None,
+    ):
+        self.youtube_service = youtube_service
+        self.openai_service = openai_service
+        self.analytics_service = analytics_service
+        self.daily_quota = daily_quota
+        self.window_start, self.window_end = window
+        self.interval = interval
+        self.min_age = min_age
+        self.auto_track = auto_track
+        self.access_half_life = access_half_life
+        self.tz = ZoneInfo(timezone)
+        self.db = connection or get_connection()
+        self._task: Optional[asyncio.Task] = None
+        # 백그라운드로 돌리는 수동 갱신 (기다리지 않고 응답)
+        self._pending: Set[asyncio.Task] = set()
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS tracked_channels (
+                channel_id TEXT PRIMARY KEY,
+                tracked INTEGER NOT NULL,
+                accesses REAL NOT NULL,
+                last_access REAL,
+                last_attempt REAL,
+                last_refreshed REAL,
+                last_cost INTEGER,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS refresh_runs (
+                id INTEGER PRIMARY KEY,
+                channel_id TEXT NOT NULL,
+                job_id TEXT,
+                status TEXT NOT NULL,
+                quota_units INTEGER NOT NULL,
+                started_at REAL NOT NULL,
+                finished_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_refresh_runs_started ON refresh_runs (started_at);
+        """)
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        tasks = list(self._pending)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def record_access(self, channel_id: str, now: Optional[float] = None) -> None:
+        """채널이 열렸음을 기록합니다. `auto_track` 이면 처음 연 채널도 추적 목록에 넣습니다."""
+        now = now or time.time()
+        row = self.db.execute(
+            "SELECT accesses, last_access FROM tracked_channels WHERE channel_id = ?", (channel_id,)
+        ).fetchone()
+        if row is None:
+            if self.auto_track:
+                self.db.execute(
+                    "INSERT INTO tracked_channels (channel_id, tracked, accesses, last_access, created_at) "
+                    "VALUES (?, 1, 1, ?, ?)",
+                    (channel_id, now, now),
+                )
+            return
+        self.db.execute(
+            "UPDATE tracked_channels SET accesses = ?, last_access = ? WHERE channel_id = ?",
+            (self._decayed(row['accesses'], row['last_access'], now) + 1, now, channel_id),
+        )
+
+    def track(self, channel_id: str) -> Dict[str, Any]:
+        now = time.time()
+        self.db.execute(
+            "INSERT INTO tracked_channels (channel_id, tracked, accesses, created_at) VALUES (?, 1, 0, ?) "
+            "ON CONFLICT (channel_id) DO UPDATE SET tracked = 1",
+            (channel_id, now),
+        )
+        return self.get(channel_id, now)
+
+    def untrack(self, channel_id: str) -> bool:
+        # 접근 기록은 남겨두고 갱신 대상에서만 뺌 (다시 추적할 때 빈도를 이어서 씀)
+        cursor = self.db.execute(
+            "UPDATE tracked_channels SET tracked = 0 WHERE channel_id = ? AND tracked = 1", (channel_id,)
+        )
+        return cursor.rowcount > 0
+
+    def get(self, channel_id: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        row = self.db.execute("SELECT * FROM tracked_channels WHERE channel_id = ?", (channel_id,)).fetchone()
+        return self._to_dict(row, now or time.time()) if row is not None else None
+
+    def tracked_channels(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """추적 중인 채널을 갱신 우선순위 순으로 반환합니다."""
+        now = now or time.time()
+        rows = self.db.execute("SELECT * FROM tracked_channels WHERE tracked = 1").fetchall()
+        return sorted((self._to_dict(row, now) for row in rows), key=lambda channel: -channel['priority'])
+
+    def budget(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """현재 갱신 창과 오늘 예산 사용 현황."""
+        now = now or time.time()
+        window = self._window(now)
+        if window is None:
+            return {'inWindow': False, 'dailyQuota': self.daily_quota, 'spent': 0, 'available': 0}
+        start, length = window
+        spent = self.db.execute(
+            "SELECT COALESCE(SUM(quota_units), 0) FROM refresh_runs WHERE started_at >= ?", (start,)
+        ).fetchone()[0]
+        # 다음 주기까지의 몫을 미리 허용해 창이 열리자마자 첫 갱신을 할 수 있도록 함
+        share = self.daily_quota * min(1.0, (now - start + self.interval) / length)
+        return {
+            'inWindow': True,
+            'dailyQuota': self.daily_quota,
+            'spent': spent,
+            'available': max(0, int(share) - spent),
+        }
+
+    async def run_once(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """예산이 허락하는 만큼 우선순위가 높은 채널부터 갱신하고 실행 기록을 반환합니다.
+
+        맨 앞 채널의 예상 할당량이 남은 예산보다 크면 여기서 멈춥니다. 작은
+        채널이 계속 앞질러 큰 채널이 영영 갱신되지 않는 일을 막기 위해서입니다.
+        다만 하루 예산보다 큰 채널(`overBudget`)은 기다려도 갱신할 수 없으므로
+        자리를 막지 않도록 건너뜁니다. 이런 채널은 수동 갱신으로만 갱신됩니다.
+        """
+        now = now or time.time()
+        available = self.budget(now)['available']
+        runs = []
+        for channel in self.tracked_channels(now):
+            if not channel['due'] or channel['overBudget']:
+                continue
+            if channel['estimatedCost'] > available:
+                break
+            run = await self.refresh(channel['channelId'])
+            runs.append(run)
+            available -= run['quotaUnits']
+        return runs
+
+    async def refresh(self, channel_id: str) -> Dict[str, Any]:
+        """채널 정보와 비디오 목록을 증분 동기화하고 차트 인사이트를 미리 만들어 둡니다."""
+        return await self._refresh(channel_id, self._begin(channel_id))
+
+    def start_refresh(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        """갱신을 백그라운드에서 시작하고 바로 채널 상태를 반환합니다."""
+        task = asyncio.create_task(self._refresh(channel_id, self._begin(channel_id)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return self.get(channel_id)
+
+    def sync_max_age(self, channel_id: str, max_age: float, now: Optional[float] = None) -> float:
+        """대화형 조회가 저장된 비디오 목록을 재사용할 시간(초).
+
+        추적 중인 채널을 가장 최근 갱신 창이 시작된 뒤 갱신했다면 다음 창이 올
+        때까지 그 결과를 쓰고, 아니면 `max_age` 를 그대로 돌려줍니다.
+        """
+        now = now or time.time()
+        row = self.db.execute(
+            "SELECT last_refreshed FROM tracked_channels WHERE channel_id = ? AND tracked = 1", (channel_id,)
+        ).fetchone()
+        start = self._window_start(now)
+        if row is None or row['last_refreshed'] is None or row['last_refreshed'] < start:
+            return max_age
+        return max(max_age, now - start)
+
+    def _begin(self, channel_id: str) -> float:
+        started = time.time()
+        self.db.execute("UPDATE tracked_channels SET last_attempt = ? WHERE channel_id = ?", (started, channel_id))
+        return started
+
+    async def _refresh(self, channel_id: str, started: float) -> Dict[str, Any]:
+        """증분 동기화(스냅샷 포함)와 인사이트 생성을 돌리고 쓴 할당량과 함께 실행 기록을 남깁니다."""
+        status = 'failed'
+        with track_usage() as usage:
+            try:
+                youtube = self.youtube_service
+                channel = await youtube.get_channel_info(channel_id)
+                videos = await youtube.sync_channel_videos(channel_id) if channel else None
+                if videos:
+                    # /insights 와 같은 입력이므로 차트별 캐시에 남아 그대로 재사용됨
+                    charts = self.analytics_service.compute(videos)['chartInputs']
+                    core_fans = youtube.fan_index.chart_summary(channel_id)
+                    if core_fans:
+                        charts['core_fans'] = core_fans
+                    await self.openai_service.analyze_charts(charts)
+                if videos is not None:
+                    status = 'done'
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error refreshing channel {channel_id}: {str(e)}")
+        units = usage.quota_units
+        finished = time.time()
+
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.execute(
+                "INSERT INTO refresh_runs (channel_id, job_id, status, quota_units, started_at, finished_at) "
+                "VALUES (?, NULL, ?, ?, ?, ?)",
+                (channel_id, status, units, started, finished),
+            )
+            if status == 'done':
+                self.db.execute(
+                    "UPDATE tracked_channels SET last_refreshed = ?, last_cost = ? WHERE channel_id = ?",
+                    (finished, units, channel_id),
+                )
+        return {'channelId': channel_id, 'status': status, 'quotaUnits': units, 'seconds': finished - started}
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in refresh scheduler: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def _window(self, now: float) -> Optional[Tuple[float, float]]:
+        """`now` 가 갱신 창 안이면 (창 시작 시각, 창 길이 초), 밖이면 None."""
+        start = self._window_start(now)
+        # 22시-6시처럼 자정을 넘는 창도 처리
+        length = ((self.window_end - self.window_start) % 24 or 24) * 3600
+        if now - start >= length:
+            return None
+        return start, length
+
+    def _window_start(self, now: float) -> float:
+        """`now` 이전에 가장 최근 갱신 창이 시작된 시각."""
+        local = datetime.fromtimestamp(now, self.tz)
+        start = local.replace(hour=self.window_start, minute=0, second=0, microsecond=0)
+        if start > local:
+            start -= timedelta(days=1)
+        return start.timestamp()
+
+    def _decayed(self, accesses: float, last_access: Optional[float], now: float) -> float:
+        if not last_access:
+            return accesses
+        return accesses * 0.5 ** (max(0.0, now - last_access) / self.access_half_life)
+
+    def _estimate(self, row: sqlite3.Row) -> int:
+        if row['last_cost'] is not None:
+            return row['last_cost']
+        # 증분 동기화: 채널 정보 1 + 새 업로드 확인 playlistItems 1 + 기존 비디오 50개당 통계 1
+        videos = self.youtube_service.video_store.count_videos(row['channel_id'])
+        if not videos:
+            return DEFAULT_COST_ESTIMATE
+        return 2 + -(-videos // VIDEOS_PER_PAGE)
+
+    def _to_dict(self, row: sqlite3.Row, now: float) -> Dict[str, Any]:
+        accesses = self._decayed(row['accesses'], row['last_access'], now)
+        last = max(row['last_attempt'] or 0, row['last_refreshed'] or 0)
+        age = min(now - last, MAX_STALENESS) if last else MAX_STALENESS
+        estimated_cost = self._estimate(row)
+        return {
+            'channelId': row['channel_id'],
+            'tracked': bool(row['tracked']),
+            'accesses': round(accesses, 2),
+            'lastAccess': row['last_access'],
+            'lastRefreshed': row['last_refreshed'],
+            'lastAttempt': row['last_attempt'],
+            'estimatedCost': estimated_cost,
+            'overBudget': estimated_cost > self.daily_quota,
+            'due': age >= self.min_age,
+            'priority': round((1 + accesses) * age / DAY, 3),
+        }
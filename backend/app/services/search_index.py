@@ -0,0 +1,204 @@
+import sqlite3
+from collections import Counter
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+from ..db import get_connection
+from .tokenizer import tokenize
+
+
+class SearchIndex:
+    """수집한 댓글과 비디오 제목을 SQLite FTS5 로 색인합니다.
+
+    한국어 조사를 떼어낸 토큰을 공백으로 이어 FTS5(unicode61)에 넣으므로
+    "영상이", "영상을" 모두 "영상" 으로 검색됩니다. 채널/종류별 단어 빈도는
+    `search_terms` 에 증분으로 집계해 상위 단어를 바로 조회할 수 있습니다.
+    """
+
+    def __init__(self, connection: Optional[sqlite3.Connection] = None):
+        self.db = connection or get_connection()
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS search_documents (
+                id INTEGER PRIMARY KEY,
+                channel_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                author TEXT,
+                text TEXT NOT NULL,
+                tokens TEXT NOT NULL,
+                like_count INTEGER NOT NULL,
+                published_at TEXT NOT NULL,
+                UNIQUE (channel_id, kind, doc_id)
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+                tokens, content='search_documents', content_rowid='id', tokenize='unicode61'
+            );
+            CREATE TABLE IF NOT EXISTS search_terms (
+                channel_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                term TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                docs INTEGER NOT NULL,
+                PRIMARY KEY (channel_id, kind, term)
+            );
+            CREATE INDEX IF NOT EXISTS idx_search_terms_count
+                ON search_terms (channel_id, kind, count DESC);
+        """)
+
+    def add_comments(self, channel_id: str, comments: Iterable[Dict[str, Any]]) -> int:
+        """댓글을 색인하고 새로 추가된 수를 반환합니다. 이미 색인된 댓글은 건너뜁니다."""
+        return self._add(channel_id, 'comment', [
+            (comment['id'], comment.get('videoId', ''), comment.get('author'), comment['text'],
+             int(comment.get('likeCount') or 0), comment['publishedAt'])
+            for comment in comments if comment.get('id')
+        ])
+
+    def add_videos(self, channel_id: str, videos: Iterable[Dict[str, Any]]) -> int:
+        """비디오 제목을 색인합니다. 제목이 바뀐 비디오는 다시 색인합니다."""
+        return self._add(channel_id, 'video', [
+            (video['id'], video['id'], None, video.get('title', ''),
+             int(video.get('likeCount') or 0), video.get('publishedAt', ''))
+            for video in videos
+        ])
+
+    def _add(self, channel_id: str, kind: str, documents: List[Tuple]) -> int:
+        added = 0
+        terms: Counter = Counter()
+        docs: Counter = Counter()
+        with self.db:
+            self.db.execute("BEGIN")
+            for doc_id, video_id, author, text, like_count, published_at in documents:
+                tokens = tokenize(text)
+                previous = self.db.execute(
+                    "SELECT id, text, tokens FROM search_documents WHERE channel_id = ? AND kind = ? AND doc_id = ?",
+                    (channel_id, kind, doc_id),
+                ).fetchone()
+                if previous is not None:
+                    if previous['text'] == text:
+                        continue
+                    # 내용이 바뀐 문서는 이전 토큰을 색인과 빈도에서 빼고 다시 넣음
+                    self.db.execute(
+                        "INSERT INTO search_fts (search_fts, rowid, tokens) VALUES ('delete', ?, ?)",
+                        (previous['id'], previous['tokens']),
+                    )
+                    self.db.execute("DELETE FROM search_documents WHERE id = ?", (previous['id'],))
+                    old_tokens = previous['tokens'].split()
+                    terms.subtract(old_tokens)
+                    docs.subtract(set(old_tokens))
+                else:
+                    added += 1
+
+                rowid = self.db.execute(
+                    "INSERT INTO search_documents (channel_id, kind, doc_id, video_id, author, text, tokens, "
+                    "like_count, published_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (channel_id, kind, doc_id, video_id, author, text, ' '.join(tokens), like_count, published_at),
+                ).lastrowid
+                self.db.execute(
+                    "INSERT INTO search_fts (rowid, tokens) VALUES (?, ?)", (rowid, ' '.join(tokens))
+                )
+                terms.update(tokens)
+                docs.update(set(tokens))
+
+            self.db.executemany("""
+                INSERT INTO search_terms (channel_id, kind, term, count, docs)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (channel_id, kind, term) DO UPDATE SET
+                    count = count + excluded.count,
+                    docs = docs + excluded.docs
+            """, [
+                (channel_id, kind, term, count, docs[term])
+                for term, count in terms.items() if count or docs[term]
+            ])
+            self.db.execute(
+                "DELETE FROM search_terms WHERE channel_id = ? AND kind = ? AND count <= 0", (channel_id, kind)
+            )
+        return added
+
+    def has_channel(self, channel_id: str, kind: str = 'comment') -> bool:
+        row = self.db.execute(
+            "SELECT 1 FROM search_documents WHERE channel_id = ? AND kind = ? LIMIT 1", (channel_id, kind)
+        ).fetchone()
+        return row is not None
+
+    def search(
+        self,
+        channel_id: str,
+        query: str,
+        kind: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """모든 검색어(접두어 일치)를 포함하는 문서를 관련도 순으로 반환합니다."""
+        match = self._match_expression(query)
+        if match is None:
+            return {'total': 0, 'offset': offset, 'limit': limit, 'items': []}
+
+        where = "search_fts MATCH ? AND d.channel_id = ?"
+        params: List[Any] = [match, channel_id]
+        if kind:
+            where += " AND d.kind = ?"
+            params.append(kind)
+
+        # CROSS JOIN 으로 FTS 검색을 바깥 루프에 고정 (채널 행마다 MATCH 를 다시 돌지 않도록)
+        total = self.db.execute(
+            f"SELECT COUNT(*) FROM search_fts CROSS JOIN search_documents d ON d.id = search_fts.rowid WHERE {where}",
+            params,
+        ).fetchone()[0]
+        rows = self.db.execute(
+            f"SELECT d.* FROM search_fts CROSS JOIN search_documents d ON d.id = search_fts.rowid WHERE {where} "
+            f"ORDER BY search_fts.rank, d.like_count DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        ).fetchall()
+
+        return {
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'items': [
+                {
+                    'kind': row['kind'],
+                    'id': row['doc_id'],
+                    'videoId': row['video_id'],
+                    'author': row['author'],
+                    'text': row['text'],
+                    'likeCount': row['like_count'],
+                    'publishedAt': row['published_at'],
+                }
+                for row in rows
+            ],
+        }
+
+    def term_frequencies(self, channel_id: str, terms: Iterable[str], kind: str = 'comment') -> Dict[str, Dict[str, int]]:
+        """검색어별 등장 횟수와 등장한 문서 수. 검색어는 색인과 같은 방식으로 정규화합니다."""
+        result = {}
+        for term in terms:
+            tokens = tokenize(term)
+            row = self.db.execute(
+                "SELECT count, docs FROM search_terms WHERE channel_id = ? AND kind = ? AND term = ?",
+                (channel_id, kind, tokens[0]),
+            ).fetchone() if len(tokens) == 1 else None
+            result[term] = {'count': row['count'], 'docs': row['docs']} if row else {'count': 0, 'docs': 0}
+        return result
+
+    def top_terms(self, channel_id: str, kind: str = 'comment', limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        total = self.db.execute(
+            "SELECT COUNT(*) FROM search_terms WHERE channel_id = ? AND kind = ?", (channel_id, kind)
+        ).fetchone()[0]
+        rows = self.db.execute(
+            "SELECT term, count, docs FROM search_terms WHERE channel_id = ? AND kind = ? "
+            "ORDER BY count DESC, term LIMIT ? OFFSET ?",
+            (channel_id, kind, limit, offset),
+        ).fetchall()
+        return {
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'items': [{'term': row['term'], 'count': row['count'], 'docs': row['docs']} for row in rows],
+        }
+
+    @staticmethod
+    def _match_expression(query: str) -> Optional[str]:
+        # 토큰을 따옴표로 감싸 FTS5 문법 문자를 무력화하고, 접두어 일치로 남은 어미를 허용
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        return ' AND '.join(f'"{token}"*' for token in dict.fromkeys(tokens))
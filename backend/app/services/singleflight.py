@@ -0,0 +1,26 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 비동기 호출을 하나로 합칩니다.
+
+    첫 호출이 실제 작업을 실행하고, 작업이 끝나기 전에 들어온 호출들은 같은
+    결과(또는 예외)를 함께 받습니다. 작업이 끝나면 키는 바로 해제됩니다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # 한 호출자가 취소되어도 공유 작업은 계속되도록 보호
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(fn())
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
@@ -0,0 +1,274 @@
+import mmap
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Tuple
+from ..config import settings
+
+# 종류별 열 정의 (열 이름, array 타입코드). 모든 열은 같은 행 수를 가집니다.
+SCHEMAS: Dict[str, List[Tuple[str, str]]] = {
+    'channel': [('ts', 'q'), ('subscribers', 'q'), ('views', 'q'), ('videos', 'q')],
+    'videos': [('ts', 'q'), ('video', 'i'), ('views', 'q'), ('likes', 'q'), ('comments', 'q')],
+}
+
+_CHANNEL_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]+')
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class SnapshotStore:
+    """채널/비디오 통계 스냅샷을 열 지향 바이너리 파일로 쌓는 시계열 저장소.
+
+    `{root}/{channel_id}/{kind}/{YYYY-MM-DD}/{column}.bin` 형태로 채널과 날짜별로
+    파티션을 나누고, 각 열은 고정 폭 정수 배열로 덧붙입니다. 비디오 ID 는 채널별
+    사전(`videos.dict`)의 정수 코드로 저장합니다. 읽을 때는 파일을 메모리 매핑해
+    복사 없이 시간 범위를 이분 탐색합니다. 기록은 스레드에서 호출되므로(`asyncio.to_thread`)
+    쓰기와 사전 갱신은 잠금으로 직렬화합니다.
+    """
+
+    def __init__(self, root: Optional[str] = None, min_interval: Optional[float] = None):
+        self.root = root or settings.SNAPSHOT_DIR
+        self.min_interval = settings.SNAPSHOT_MIN_INTERVAL if min_interval is None else min_interval
+        self._dictionaries: Dict[str, Dict[str, int]] = {}
+        self._last_recorded: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def record_channel(self, channel: Dict[str, Any], ts: Optional[float] = None) -> bool:
+        ts = ts or time.time()
+        with self._lock:
+            if not self._due(channel['id'], 'channel', ts):
+                return False
+            self._append(channel['id'], 'channel', ts, {
+                'ts': [int(ts)],
+                'subscribers': [_to_int(channel.get('subscriberCount'))],
+                'views': [_to_int(channel.get('viewCount'))],
+                'videos': [_to_int(channel.get('videoCount'))],
+            })
+        return True
+
+    def record_videos(self, channel_id: str, videos: Iterable[Dict[str, Any]], ts: Optional[float] = None) -> bool:
+        ts = ts or time.time()
+        videos = list(videos)
+        if not videos:
+            return False
+        with self._lock:
+            if not self._due(channel_id, 'videos', ts):
+                return False
+            codes = self._encode(channel_id, [video['id'] for video in videos])
+            self._append(channel_id, 'videos', ts, {
+                'ts': [int(ts)] * len(videos),
+                'video': codes,
+                'views': [_to_int(video.get('viewCount')) for video in videos],
+                'likes': [_to_int(video.get('likeCount')) for video in videos],
+                'comments': [_to_int(video.get('commentCount')) for video in videos],
+            })
+        return True
+
+    def channel_history(
+        self,
+        channel_id: str,
+        start: float,
+        end: float,
+        bucket_seconds: int,
+    ) -> List[Dict[str, Any]]:
+        """채널 통계를 `bucket_seconds` 단위로 다운샘플링합니다 (구간의 마지막 값 사용)."""
+        buckets: Dict[int, Dict[str, int]] = {}
+        for columns, lo, hi in self._scan(channel_id, 'channel', start, end):
+            ts, subscribers, views, videos = (columns[name] for name, _ in SCHEMAS['channel'])
+            # 구간마다 마지막 행만 읽음 (행 수가 아니라 구간 수만큼 반복)
+            for bucket, _, last in self._bucket_ranges(ts, lo, hi, bucket_seconds):
+                buckets[bucket] = {'subscribers': subscribers[last], 'views': views[last], 'videos': videos[last]}
+        return self._series(buckets, bucket_seconds)
+
+    def video_history(
+        self,
+        channel_id: str,
+        start: float,
+        end: float,
+        bucket_seconds: int,
+        video_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """비디오 통계를 다운샘플링합니다. `video_id` 가 없으면 채널 전체 비디오 합계를 돌려줍니다."""
+        code = None
+        if video_id is not None:
+            code = self._load_dictionary(channel_id).get(video_id)
+            if code is None:
+                return []
+
+        # 구간마다 비디오별 마지막 값을 모은 뒤 합산. 구간의 열 조각을 dict 로 묶으면
+        # 같은 비디오는 뒤의 값이 남으므로 행마다 파이썬 분기를 돌지 않아도 됨
+        latest: Dict[int, Dict[int, Tuple[int, int, int]]] = {}
+        for columns, lo, hi in self._scan(channel_id, 'videos', start, end):
+            ts, video, views, likes, comments = (columns[name] for name, _ in SCHEMAS['videos'])
+            for bucket, first, last in self._bucket_ranges(ts, lo, hi, bucket_seconds):
+                end_row = last + 1
+                codes = video[first:end_row].tolist()
+                if code is not None:
+                    if code not in codes:
+                        continue
+                    i = first + len(codes) - 1 - codes[::-1].index(code)
+                    latest.setdefault(bucket, {})[code] = (views[i], likes[i], comments[i])
+                    continue
+                latest.setdefault(bucket, {}).update(zip(codes, zip(
+                    views[first:end_row].tolist(), likes[first:end_row].tolist(), comments[first:end_row].tolist()
+                )))
+
+        buckets = {
+            bucket: {
+                'views': sum(values[0] for values in per_video.values()),
+                'likes': sum(values[1] for values in per_video.values()),
+                'comments': sum(values[2] for values in per_video.values()),
+                'videoCount': len(per_video),
+            }
+            for bucket, per_video in latest.items()
+        }
+        return self._series(buckets, bucket_seconds)
+
+    @staticmethod
+    def _bucket_ranges(ts, lo: int, hi: int, bucket_seconds: int) -> Iterator[Tuple[int, int, int]]:
+        """정렬된 `ts[lo:hi]` 를 구간별로 나눠 (구간, 첫 행, 마지막 행)을 이분 탐색으로 찾습니다."""
+        i = lo
+        while i < hi:
+            bucket = ts[i] // bucket_seconds
+            j = bisect_left(ts, (bucket + 1) * bucket_seconds, i, hi)
+            yield bucket, i, j - 1
+            i = j
+
+    @staticmethod
+    def _series(buckets: Dict[int, Dict[str, int]], bucket_seconds: int) -> List[Dict[str, Any]]:
+        series = []
+        previous: Optional[Dict[str, int]] = None
+        for bucket in sorted(buckets):
+            values = buckets[bucket]
+            point: Dict[str, Any] = {
+                't': datetime.fromtimestamp(bucket * bucket_seconds, timezone.utc).isoformat(),
+                **values,
+            }
+            if previous is not None:
+                # 직전 구간 대비 증가량
+                point['delta'] = {name: value - previous.get(name, 0) for name, value in values.items()}
+            series.append(point)
+            previous = values
+        return series
+
+    def _scan(self, channel_id: str, kind: str, start: float, end: float):
+        """시간 범위에 걸치는 파티션마다 (메모리 매핑된 열, 시작 행, 끝 행)을 내보냅니다."""
+        kind_dir = os.path.join(self._channel_dir(channel_id), kind)
+        if not os.path.isdir(kind_dir):
+            return
+        first_day = datetime.fromtimestamp(start, timezone.utc).strftime('%Y-%m-%d')
+        last_day = datetime.fromtimestamp(end, timezone.utc).strftime('%Y-%m-%d')
+
+        for day in sorted(os.listdir(kind_dir)):
+            if not first_day <= day <= last_day:
+                continue
+            maps = []
+            views = []
+            columns = {}
+            try:
+                for name, typecode in SCHEMAS[kind]:
+                    path = os.path.join(kind_dir, day, f'{name}.bin')
+                    size = os.path.getsize(path) if os.path.exists(path) else 0
+                    # 쓰기 도중 중단된 경우를 대비해 완전한 값까지만 매핑
+                    size -= size % array(typecode).itemsize
+                    if not size:
+                        break
+                    with open(path, 'rb') as f:
+                        mm = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+                    maps.append(mm)
+                    views.append(memoryview(mm))
+                    columns[name] = views[-1].cast(typecode)
+                else:
+                    rows = min(len(column) for column in columns.values())
+                    ts = columns['ts']
+                    lo = bisect_left(ts, int(start), 0, rows)
+                    hi = bisect_right(ts, int(end), lo, rows)
+                    if lo < hi:
+                        yield columns, lo, hi
+            finally:
+                for view in [*columns.values(), *views]:
+                    view.release()
+                for mm in maps:
+                    mm.close()
+
+    def _append(self, channel_id: str, kind: str, ts: float, values: Dict[str, List[int]]) -> None:
+        day = datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d')
+        partition = os.path.join(self._channel_dir(channel_id), kind, day)
+        os.makedirs(partition, exist_ok=True)
+        # 열 파일을 하나씩 덧붙이므로 이전 쓰기가 중간에 끊겼다면 열마다 행 수가 다를 수 있음.
+        # 가장 짧은 열에 맞춰 잘라낸 뒤 덧붙여야 이후 행이 서로 어긋나지 않음
+        rows = self._rows(partition, kind)
+        for name, typecode in SCHEMAS[kind]:
+            with open(os.path.join(partition, f'{name}.bin'), 'ab') as f:
+                f.truncate(rows * array(typecode).itemsize)
+                array(typecode, values[name]).tofile(f)
+        self._last_recorded[(channel_id, kind)] = ts
+
+    @staticmethod
+    def _rows(partition: str, kind: str) -> int:
+        """파티션의 모든 열에 온전히 기록된 행 수 (가장 짧은 열 기준)."""
+        rows = []
+        for name, typecode in SCHEMAS[kind]:
+            path = os.path.join(partition, f'{name}.bin')
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            rows.append(size // array(typecode).itemsize)
+        return min(rows)
+
+    def _channel_dir(self, channel_id: str) -> str:
+        # 채널 ID 를 경로로 쓰므로 YouTube ID 형식만 허용
+        if not _CHANNEL_ID_PATTERN.fullmatch(channel_id):
+            raise ValueError(f"Invalid channel id: {channel_id}")
+        return os.path.join(self.root, channel_id)
+
+    def _due(self, channel_id: str, kind: str, ts: float) -> bool:
+        """마지막 기록 후 `min_interval` 이 지났는지 확인합니다."""
+        last = self._last_recorded.get((channel_id, kind))
+        if last is None:
+            last = self._last_ts_on_disk(channel_id, kind)
+            self._last_recorded[(channel_id, kind)] = last
+        return ts - last >= self.min_interval
+
+    def _last_ts_on_disk(self, channel_id: str, kind: str) -> float:
+        kind_dir = os.path.join(self._channel_dir(channel_id), kind)
+        if not os.path.isdir(kind_dir):
+            return 0.0
+        for day in sorted(os.listdir(kind_dir), reverse=True):
+            # 다른 열까지 모두 기록된 마지막 행의 시각
+            rows = self._rows(os.path.join(kind_dir, day), kind)
+            if rows:
+                with open(os.path.join(kind_dir, day, 'ts.bin'), 'rb') as f:
+                    f.seek((rows - 1) * 8)
+                    return float(array('q', f.read(8))[0])
+        return 0.0
+
+    def _load_dictionary(self, channel_id: str) -> Dict[str, int]:
+        dictionary = self._dictionaries.get(channel_id)
+        if dictionary is None:
+            dictionary = {}
+            path = os.path.join(self._channel_dir(channel_id), 'videos.dict')
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    for code, line in enumerate(f):
+                        dictionary[line.rstrip('\n')] = code
+            self._dictionaries[channel_id] = dictionary
+        return dictionary
+
+    def _encode(self, channel_id: str, video_ids: List[str]) -> List[int]:
+        dictionary = self._load_dictionary(channel_id)
+        new_ids = [video_id for video_id in dict.fromkeys(video_ids) if video_id not in dictionary]
+        if new_ids:
+            os.makedirs(self._channel_dir(channel_id), exist_ok=True)
+            with open(os.path.join(self._channel_dir(channel_id), 'videos.dict'), 'a', encoding='utf-8') as f:
+                for video_id in new_ids:
+                    dictionary[video_id] = len(dictionary)
+                    f.write(video_id + '\n')
+        return [dictionary[video_id] for video_id in video_ids]
@@ -0,0 +1,58 @@
+import html
+import re
+from typing import List
+
+# 한글/영문/숫자 연속 구간을 하나의 토큰으로 봅니다.
+_TOKEN_PATTERN = re.compile(r'[0-9a-zㄱ-ㆎ가-힣]+')
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_URL_PATTERN = re.compile(r'https?://\S+')
+
+# 명사 뒤에 붙는 흔한 조사/어미. 긴 것부터 떼어냅니다.
+KOREAN_SUFFIXES = sorted([
+    '이에요', '예요', '입니다', '이다', '에서', '에게', '한테', '께서', '으로', '부터', '까지',
+    '처럼', '보다', '이나', '이랑', '랑', '은', '는', '이', '가', '을', '를', '의', '에',
+    '로', '와', '과', '도', '만', '나', '요',
+], key=len, reverse=True)
+
+STOPWORDS = {
+    '그리고', '그런데', '그래서', '하지만', '정말', '진짜', '너무', '그냥', '이거', '저거',
+    '그거', '이번', '저는', '제가', '우리', '있는', '없는', '하는', '같은', '합니다', '있습니다',
+    'the', 'and', 'for', 'you', 'this', 'that', 'with', 'are', 'was', 'is', 'it', 'to', 'of', 'in',
+    'quot', 'amp', 'br',
+}
+
+
+def strip_markup(text: str) -> str:
+    """댓글 textDisplay 의 HTML 태그, 엔티티, URL 을 제거합니다."""
+    return html.unescape(_TAG_PATTERN.sub(' ', _URL_PATTERN.sub(' ', text or '')))
+
+
+def stem(token: str) -> str:
+    """한글 토큰 끝의 조사를 떼어냅니다. 두 글자 미만이 남으면 그대로 둡니다."""
+    if not token or not '가' <= token[-1] <= '힣':
+        return token
+    for suffix in KOREAN_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            return token[:-len(suffix)]
+    return token
+
+
+def words(text: str) -> List[str]:
+    """정규화 전의 단어 목록 (소문자, 마크업 제거). 부정어처럼 짧은 단어도 남습니다."""
+    return _TOKEN_PATTERN.findall(strip_markup(text).lower())
+
+
+def tokenize(text: str) -> List[str]:
+    """검색 색인과 키워드 집계에 공통으로 쓰는 토큰 목록을 만듭니다."""
+    return normalize(words(text))
+
+
+def normalize(raw_words: List[str]) -> List[str]:
+    """`words` 결과에서 조사를 떼고 짧은 단어, 불용어, 숫자를 뺍니다."""
+    tokens = []
+    for token in raw_words:
+        token = stem(token)
+        if len(token) < 2 or token in STOPWORDS or token.isdigit():
+            continue
+        tokens.append(token)
+    return tokens
@@ -0,0 +1,95 @@
+import json
+import sqlite3
+import time
+from typing import Optional, Dict, Any, List, Iterable
+from ..db import get_connection
+
+
+class VideoStore:
+    """채널별 비디오 상태를 SQLite 에 저장해 증분 동기화에 사용합니다."""
+
+    def __init__(self, connection: Optional[sqlite3.Connection] = None):
+        self.db = connection or get_connection()
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS channel_sync (
+                channel_id TEXT PRIMARY KEY,
+                uploads_playlist_id TEXT NOT NULL,
+                synced_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS channel_videos (
+                channel_id TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                published_at TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (channel_id, video_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_channel_videos_published
+                ON channel_videos (channel_id, published_at DESC);
+        """)
+
+    def get_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
+        row = self.db.execute(
+            "SELECT uploads_playlist_id FROM channel_sync WHERE channel_id = ?", (channel_id,)
+        ).fetchone()
+        return row['uploads_playlist_id'] if row else None
+
+    def get_synced_at(self, channel_id: str) -> Optional[float]:
+        row = self.db.execute(
+            "SELECT synced_at FROM channel_sync WHERE channel_id = ?", (channel_id,)
+        ).fetchone()
+        return row['synced_at'] if row else None
+
+    def count_videos(self, channel_id: str) -> int:
+        return self.db.execute(
+            "SELECT COUNT(*) FROM channel_videos WHERE channel_id = ?", (channel_id,)
+        ).fetchone()[0]
+
+    def get_videos(self, channel_id: str) -> List[Dict[str, Any]]:
+        """저장된 비디오를 최신순으로 반환합니다."""
+        rows = self.db.execute(
+            "SELECT data FROM channel_videos WHERE channel_id = ? ORDER BY published_at DESC",
+            (channel_id,),
+        ).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def add_videos(self, channel_id: str, videos: Iterable[Dict[str, Any]]) -> None:
+        """동기화 완료 표시 없이 비디오만 저장합니다 (수집 작업의 중간 결과용)."""
+        self.db.executemany(
+            "INSERT OR REPLACE INTO channel_videos (channel_id, video_id, published_at, data) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (channel_id, video['id'], video['publishedAt'], json.dumps(video, ensure_ascii=False))
+                for video in videos
+            ],
+        )
+
+    def save(
+        self,
+        channel_id: str,
+        uploads_playlist_id: str,
+        videos: Iterable[Dict[str, Any]],
+        removed_ids: Iterable[str] = (),
+    ) -> None:
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany(
+                "INSERT OR REPLACE INTO channel_videos (channel_id, video_id, published_at, data) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (channel_id, video['id'], video['publishedAt'], json.dumps(video, ensure_ascii=False))
+                    for video in videos
+                ],
+            )
+            self.db.executemany(
+                "DELETE FROM channel_videos WHERE channel_id = ? AND video_id = ?",
+                [(channel_id, video_id) for video_id in removed_ids],
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO channel_sync (channel_id, uploads_playlist_id, synced_at) "
+                "VALUES (?, ?, ?)",
+                (channel_id, uploads_playlist_id, time.time()),
+            )
+
+    def mark_synced(self, channel_id: str, uploads_playlist_id: str) -> None:
+        """`add_videos` 로 저장을 마친 채널을 동기화 완료로 표시합니다."""
+        self.save(channel_id, uploads_playlist_id, [])
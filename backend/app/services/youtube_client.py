@@ -0,0 +1,223 @@
+import httpx
+from typing import Optional, Dict, Any, Tuple
+import asyncio
+import os
+import random
+import time
+from urllib.parse import urlencode
+from dotenv import load_dotenv
+from ..config import settings
+from ..metrics import record_upstream, record_youtube_quota
+from .cache_service import CacheEntry, ResponseCache, RESOURCE_TTLS
+from .singleflight import SingleFlight
+
+load_dotenv()
+
+# 재시도할 403 사유 (속도 제한). 일일 할당량 초과(quotaExceeded)는 다음 날까지 풀리지
+# 않으므로 재시도하지 않고 바로 실패
+RETRYABLE_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+
+class YouTubeAPIError(Exception):
+    """YouTube Data API 가 오류 응답을 돌려준 경우 발생합니다."""
+
+    def __init__(self, status_code: int, reason: str = "", message: str = ""):
+        super().__init__(f"{status_code} {reason}: {message}")
+        self.status_code = status_code
+        self.reason = reason
+        self.message = message
+
+
+class TokenBucket:
+    """초당 `rate` 개씩 채워지는 토큰 버킷. 최대 `capacity` 개까지 버스트를 허용합니다."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class YouTubeClient:
+    """YouTube Data API v3 용 비동기 HTTP 클라이언트.
+
+    googleapiclient 의 동기 `.execute()` 대신 httpx.AsyncClient 를 사용하므로
+    네트워크 대기 중에도 이벤트 루프가 막히지 않습니다. 하나의 커넥션 풀을
+    공유하고 keep-alive 로 연결을 재사용합니다. API 키별 토큰 버킷으로 호출
+    속도를 제한하고, 403 속도 제한 오류와 5xx 오류는 지수 백오프로 재시도합니다.
+    `cache` 가 주어지면 응답을 TTL 동안 재사용하고, 만료된 응답은 ETag 로
+    조건부 요청을 보내 변경이 없으면(304) 그대로 다시 사용합니다. 같은 요청이
+    동시에 들어오면 한 번만 호출하고 결과를 공유합니다.
+    """
+
+    # 같은 API 키와 속도를 쓰는 모든 클라이언트가 하나의 버킷을 공유합니다.
+    # 속도가 다른 클라이언트는 각자의 버킷을 씁니다 (먼저 만든 클라이언트의 속도에 묶이지 않도록).
+    _buckets: Dict[Tuple[str, float], TokenBucket] = {}
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        timeout: float = 30.0,
+        requests_per_second: Optional[float] = None,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        cache: Optional[ResponseCache] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.api_key = api_key or os.getenv('YOUTUBE_API_KEY')
+        self.base_url = base_url or settings.YOUTUBE_API_BASE_URL
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._timeout = httpx.Timeout(timeout)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests_per_second = requests_per_second or settings.YOUTUBE_REQUESTS_PER_SECOND
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.cache = cache
+        self._inflight = SingleFlight()
+
+    @property
+    def bucket(self) -> TokenBucket:
+        key = (self.api_key, self.requests_per_second)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.requests_per_second)
+            self._buckets[key] = bucket
+        return bucket
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # 이벤트 루프 안에서 처음 사용할 때 생성해 모든 요청이 같은 풀을 공유하도록 합니다.
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self._limits,
+                timeout=self._timeout,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def get(self, resource: str, cache_ttl: Optional[float] = None, **params: Any) -> Dict[str, Any]:
+        """`resource`(channels, videos, ...) 의 list 엔드포인트를 호출합니다.
+
+        `cache_ttl` 을 생략하면 리소스별 기본 TTL 을 사용하고, 0 이면 캐시를 건너뜁니다.
+        """
+        query = {key: value for key, value in params.items() if value is not None}
+        ttl = RESOURCE_TTLS.get(resource, 0) if cache_ttl is None else cache_ttl
+        request_key = f"{resource}?{urlencode(sorted(query.items()))}"
+        if self.cache is None or ttl <= 0:
+            return await self._inflight.do(
+                ('live', request_key),
+                lambda: self._fetch_json(resource, query)
+            )
+
+        cached = self.cache.get(request_key)
+        if cached is not None and cached.is_fresh():
+            return cached.body
+
+        return await self._inflight.do(
+            ('cached', request_key),
+            lambda: self._fetch_cached(resource, query, request_key, cached, ttl)
+        )
+
+    async def _fetch_json(self, resource: str, query: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self._request(resource, query)
+        return response.json()
+
+    async def _fetch_cached(
+        self,
+        resource: str,
+        query: Dict[str, Any],
+        cache_key: str,
+        cached: Optional[CacheEntry],
+        ttl: float,
+    ) -> Dict[str, Any]:
+        headers = {'If-None-Match': cached.etag} if cached is not None and cached.etag else {}
+        response = await self._request(resource, query, headers)
+        if response.status_code == 304 and cached is not None:
+            self.cache.revalidated(cache_key, cached, ttl)
+            return cached.body
+
+        body = response.json()
+        self.cache.set(cache_key, body, response.headers.get('etag') or body.get('etag'), ttl)
+        return body
+
+    async def _request(
+        self,
+        resource: str,
+        query: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        query = dict(query, key=self.api_key)
+
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            started = time.perf_counter()
+            try:
+                response = await self.client.get(f"/{resource}", params=query, headers=headers)
+            except httpx.TransportError as e:
+                record_upstream('youtube', resource, 'error', time.perf_counter() - started)
+                if attempt >= self.max_retries:
+                    raise
+                print(f"Transport error on {resource}, retrying: {e}")
+            else:
+                record_upstream('youtube', resource, response.status_code, time.perf_counter() - started)
+                # 오류/304 응답도 할당량을 소모합니다.
+                record_youtube_quota(resource)
+                if response.status_code < 400:
+                    return response
+                error = self._to_error(response)
+                if attempt >= self.max_retries or not self._is_retryable(error):
+                    raise error
+                print(f"Retryable error on {resource} (attempt {attempt + 1}): {error}")
+
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _backoff(self, attempt: int) -> float:
+        # 지수 백오프 + 지터
+        delay = self.backoff_base * (2 ** attempt)
+        return delay + random.uniform(0, delay)
+
+    @staticmethod
+    def _is_retryable(error: YouTubeAPIError) -> bool:
+        if error.status_code >= 500 or error.status_code == 429:
+            return True
+        return error.status_code == 403 and error.reason in RETRYABLE_REASONS
+
+    @staticmethod
+    def _to_error(response: httpx.Response) -> YouTubeAPIError:
+        reason = ""
+        message = response.text
+        try:
+            error = response.json().get('error', {})
+            message = error.get('message', message)
+            errors = error.get('errors') or [{}]
+            reason = errors[0].get('reason', '')
+        except ValueError:
+            pass
+        return YouTubeAPIError(response.status_code, reason, message)
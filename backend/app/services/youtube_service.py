@@ -1,175 +1,688 @@
-from googleapiclient.discovery import build
-from typing import Optional, Dict, Any, List
-import os
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
 from dotenv import load_dotenv
 import asyncio
-from googleapiclient.errors import HttpError
+import time
+from ..config import settings
+from .cache_service import ResponseCache
+from .video_store import VideoStore
+from .fan_index import FanIndex
+from .snapshot_store import SnapshotStore
+from .search_index import SearchIndex
+from .youtube_client import YouTubeClient, YouTubeAPIError
 
 load_dotenv()
 
+# 채널 정보와 업로드 재생목록 조회가 같은 요청(캐시 키)을 쓰도록 공유
+CHANNEL_PARTS = 'snippet,statistics,contentDetails'
+
 class YouTubeService:
-    def __init__(self):
-        self.youtube = build('youtube', 'v3', 
-                           developerKey=os.getenv('YOUTUBE_API_KEY'))
+    def __init__(
+        self,
+        client: Optional[YouTubeClient] = None,
+        comment_concurrency: Optional[int] = None,
+        video_store: Optional[VideoStore] = None,
+        fan_index: Optional[FanIndex] = None,
+        snapshot_store: Optional[SnapshotStore] = None,
+        search_index: Optional[SearchIndex] = None,
+    ):
+        if client is None:
+            cache = ResponseCache(
+                memory_size=settings.CACHE_MEMORY_SIZE,
+                stale_ttl=settings.CACHE_STALE_TTL,
+                max_rows=settings.CACHE_MAX_ROWS,
+            ) if settings.CACHE_ENABLED else None
+            client = YouTubeClient(cache=cache)
+        self.youtube = client
+        self.video_store = video_store or VideoStore()
+        self.fan_index = fan_index or FanIndex()
+        self.snapshot_store = snapshot_store or SnapshotStore()
+        self.search_index = search_index or SearchIndex()
+        # 채널 댓글 수집 시 동시에 처리할 비디오 수
+        self.comment_concurrency = comment_concurrency or settings.YOUTUBE_COMMENT_CONCURRENCY
+
+    async def aclose(self) -> None:
+        await self.youtube.aclose()
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        if self.youtube.cache is None:
+            return None
+        return self.youtube.cache.get_stats()
     
     async def get_channel_info(self, channel_id: str) -> Optional[Dict[str, Any]]:
         try:
-            channel_response = self.youtube.channels().list(
-                part='snippet,statistics,contentDetails',
+            channel_response = await self.youtube.get(
+                'channels',
+                part=CHANNEL_PARTS,
                 id=channel_id
-            ).execute()
+            )
             
             if not channel_response['items']:
                 return None
                 
-            channel_data = channel_response['items'][0]
-            return {
-                'id': channel_id,
-                'title': channel_data['snippet']['title'],
-                'description': channel_data['snippet']['description'],
-                'subscriberCount': channel_data['statistics']['subscriberCount'],
-                'videoCount': channel_data['statistics']['videoCount'],
-                'viewCount': channel_data['statistics']['viewCount'],
-                'thumbnail': channel_data['snippet']['thumbnails']['default']['url'],
-                'customUrl': channel_data['snippet'].get('customUrl', ''),
-                'publishedAt': channel_data['snippet']['publishedAt']
-            }
+            channel = self._to_channel_info(channel_response['items'][0])
+            await self.record_snapshot(channel)
+            return channel
         except Exception as e:
             print(f"Error fetching channel info: {e}")
             return None
 
-    async def get_channel_videos(self, channel_id: str, max_results: int = None):
+    async def get_channels_info(self, channel_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """여러 채널 정보를 50개 단위의 channels().list 호출로 한 번에 가져옵니다."""
+        channel_ids = list(dict.fromkeys(channel_ids))
+        channels: Dict[str, Optional[Dict[str, Any]]] = {channel_id: None for channel_id in channel_ids}
+
+        async def fetch(batch: List[str]) -> None:
+            try:
+                response = await self.youtube.get('channels', part=CHANNEL_PARTS, id=','.join(batch))
+            except Exception as e:
+                print(f"Error fetching channel batch: {e}")
+                return
+            for item in response.get('items', []):
+                channels[item['id']] = self._to_channel_info(item)
+                await self.record_snapshot(channels[item['id']])
+
+        await asyncio.gather(*(
+            fetch(channel_ids[i:i + 50]) for i in range(0, len(channel_ids), 50)
+        ))
+        return channels
+
+    async def get_channels_videos(
+        self,
+        channels: Dict[str, Optional[Dict[str, Any]]],
+        max_results: int = 50,
+    ) -> Dict[str, List[Dict]]:
+        """여러 채널의 최근 비디오를 가져옵니다.
+
+        재생목록 조회는 채널마다 필요하지만, 비디오 상세 조회는 채널 구분 없이
+        50개 ID 씩 묶어 videos().list 호출 수를 줄입니다.
+        """
+        semaphore = asyncio.Semaphore(self.comment_concurrency)
+        playlist_items: List[Dict] = []
+        owners: Dict[str, str] = {}
+
+        async def collect(channel_id: str, uploads_playlist_id: str) -> None:
+            next_page_token = None
+            collected = 0
+            async with semaphore:
+                while collected < max_results:
+                    try:
+                        response = await self.youtube.get(
+                            'playlistItems',
+                            part='snippet,contentDetails',
+                            playlistId=uploads_playlist_id,
+                            maxResults=min(50, max_results - collected),
+                            pageToken=next_page_token
+                        )
+                    except Exception as e:
+                        print(f"Error fetching uploads of {channel_id}: {e}")
+                        return
+                    items = response['items'][:max_results - collected]
+                    for item in items:
+                        owners[item['contentDetails']['videoId']] = channel_id
+                    playlist_items.extend(items)
+                    collected += len(items)
+                    next_page_token = response.get('nextPageToken')
+                    if not next_page_token:
+                        return
+
+        await asyncio.gather(*(
+            collect(channel_id, info['uploadsPlaylistId'])
+            for channel_id, info in channels.items() if info
+        ))
+
+        async def build(batch: List[Dict]) -> List[Dict]:
+            async with semaphore:
+                return await self._build_videos(batch)
+
+        pages = await asyncio.gather(*(
+            build(playlist_items[i:i + 50]) for i in range(0, len(playlist_items), 50)
+        ), return_exceptions=True)
+
+        videos: Dict[str, List[Dict]] = {channel_id: [] for channel_id, info in channels.items() if info}
+        for page in pages:
+            if isinstance(page, BaseException):
+                print(f"Error fetching video batch: {page}")
+                continue
+            for video in page:
+                videos[owners[video['id']]].append(video)
+        return videos
+
+    @staticmethod
+    def _to_channel_info(channel_data: Dict) -> Dict[str, Any]:
+        return {
+            'id': channel_data['id'],
+            'title': channel_data['snippet']['title'],
+            'description': channel_data['snippet']['description'],
+            'subscriberCount': channel_data['statistics'].get('subscriberCount', '0'),
+            'videoCount': channel_data['statistics']['videoCount'],
+            'viewCount': channel_data['statistics']['viewCount'],
+            'thumbnail': channel_data['snippet']['thumbnails']['default']['url'],
+            'customUrl': channel_data['snippet'].get('customUrl', ''),
+            'publishedAt': channel_data['snippet']['publishedAt'],
+            'uploadsPlaylistId': channel_data['contentDetails']['relatedPlaylists']['uploads']
+        }
+
+    async def get_channel_videos(
+        self, channel_id: str, max_results: int = None, incremental: bool = False, max_age: float = 0
+    ):
+        if incremental:
+            # 마지막 동기화가 max_age 초 이내면 저장된 목록을 그대로 사용 (할당량 없이)
+            synced_at = self.video_store.get_synced_at(channel_id) if max_age else None
+            if synced_at is not None and time.time() - synced_at < max_age:
+                videos = self.video_store.get_videos(channel_id)
+            else:
+                videos = await self.sync_channel_videos(channel_id)
+            if videos and max_results:
+                videos = videos[:max_results]
+            return videos
+
         try:
-            # 채널의 업로드 재생목록 ID 가져오기
-            channel_response = self.youtube.channels().list(
-                part='contentDetails',
-                id=channel_id
-            ).execute()
-            
-            uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-            
             videos = []
-            next_page_token = None
-            
-            while True:
-                playlist_items = self.youtube.playlistItems().list(
-                    part='snippet,contentDetails',
-                    playlistId=uploads_playlist_id,
-                    maxResults=50,  # YouTube API의 한 번의 요청당 최대값
-                    pageToken=next_page_token
-                ).execute()
-                
-                # 비디오 ID 목록 생성
-                video_ids = [item['contentDetails']['videoId'] for item in playlist_items['items']]
-                
-                # 비디오 상세 정보 가져오기
-                video_response = self.youtube.videos().list(
-                    part='statistics,contentDetails',
-                    id=','.join(video_ids)
-                ).execute()
-                
-                # 비디오 정보 결합
-                for playlist_item, video_details in zip(playlist_items['items'], video_response['items']):
-                    videos.append({
-                        'id': playlist_item['contentDetails']['videoId'],
-                        'title': playlist_item['snippet']['title'],
-                        'description': playlist_item['snippet']['description'],
-                        'thumbnail': playlist_item['snippet']['thumbnails']['medium']['url'],
-                        'publishedAt': playlist_item['snippet']['publishedAt'],
-                        'viewCount': video_details['statistics'].get('viewCount', '0'),
-                        'likeCount': video_details['statistics'].get('likeCount', '0'),
-                        'commentCount': video_details['statistics'].get('commentCount', '0'),
-                        'duration': video_details['contentDetails']['duration']
-                    })
-                
-                next_page_token = playlist_items.get('nextPageToken')
+            async for page in self.iter_channel_videos(channel_id):
+                videos.extend(page)
                 
                 # max_results가 지정되 경우에만 체크
                 if max_results and len(videos) >= max_results:
                     videos = videos[:max_results]
                     break
                     
-                # 더 이상 가져올 비디오가 없다면 중단
-                if not next_page_token:
-                    break
-                    
             return videos
                 
         except Exception as e:
             print(f"Error fetching channel videos: {e}")
             return None
 
-    async def get_video_comments(self, video_id: str) -> List[Dict]:
+    async def iter_channel_videos(self, channel_id: str) -> AsyncIterator[List[Dict]]:
+        """업로드 재생목록을 한 페이지(최대 50개)씩 비디오 목록으로 내보냅니다."""
+        async for videos, _ in self.iter_video_pages(channel_id):
+            yield videos
+
+    async def iter_video_pages(
+        self,
+        channel_id: str,
+        page_token: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[List[Dict], Optional[str]]]:
+        """(비디오 목록, 다음 페이지 토큰)을 내보냅니다. `page_token` 부터 이어서 조회할 수 있습니다."""
+        uploads_playlist_id = await self.get_uploads_playlist_id(channel_id)
+        next_page_token = page_token
+
+        while True:
+            playlist_items = await self.youtube.get(
+                'playlistItems',
+                part='snippet,contentDetails',
+                playlistId=uploads_playlist_id,
+                maxResults=50,  # YouTube API의 한 번의 요청당 최대값
+                pageToken=next_page_token
+            )
+
+            next_page_token = playlist_items.get('nextPageToken')
+            videos = await self._build_videos(playlist_items['items'])
+            yield videos, next_page_token
+
+            # 더 이상 가져올 비디오가 없다면 중단
+            if not next_page_token:
+                break
+
+    async def ingest_video_comments(self, channel_id: str, videos: List[Dict]) -> Dict[str, int]:
+        """비디오 목록의 댓글을 동시에 가져와 핵심 팬 색인에 반영합니다. 실패한 비디오는 건너뜁니다."""
+        semaphore = asyncio.Semaphore(self.comment_concurrency)
+        stats = {'comments': 0, 'failed': 0}
+
+        async def ingest(video: Dict) -> None:
+            async with semaphore:
+                try:
+                    comments = await self._fetch_video_comments(
+                        video['id'], comment_count=self._comment_count(video)
+                    )
+                except Exception as e:
+                    stats['failed'] += 1
+                    print(f"Error fetching comments for video {video['id']}: {str(e)}")
+                    return
+            for comment in comments:
+                comment['videoId'] = video['id']
+                comment['videoTitle'] = video['title']
+                comment['videoPublishedAt'] = video['publishedAt']
+            self.index_comments(channel_id, comments)
+            stats['comments'] += len(comments)
+
+        await asyncio.gather(*(ingest(video) for video in videos))
+        return stats
+
+    async def sync_channel_videos(self, channel_id: str) -> Optional[List[Dict]]:
+        """저장된 비디오 상태를 기준으로 채널을 증분 동기화합니다.
+
+        업로드 재생목록은 최신순이므로 이미 알고 있는 비디오 ID 를 만나면 페이지
+        탐색을 멈춥니다. 새 비디오만 상세 정보를 가져오고, 기존 비디오는 50개씩
+        묶어 통계만 갱신합니다.
+        """
         try:
-            response = await self.youtube.commentThreads().list(
-                part='snippet',
-                videoId=video_id,
-                maxResults=100,
-                textFormat='plainText'
-            ).execute()
-            
-            return [
-                {
-                    'author': item['snippet']['topLevelComment']['snippet']['authorDisplayName'],
-                    'text': item['snippet']['topLevelComment']['snippet']['textDisplay'],
-                    'publishedAt': item['snippet']['topLevelComment']['snippet']['publishedAt'],
-                    'likeCount': item['snippet']['topLevelComment']['snippet']['likeCount'],
-                    'authorChannelId': item['snippet']['topLevelComment']['snippet'].get('authorChannelId', {}),
-                }
-                for item in response.get('items', [])
-            ]
-        except HttpError as e:
-            if 'commentsDisabled' in str(e):
-                # 댓글이 비활성화된 경우 빈 리스트 반환
-                return []
-            else:
-                # 다른 에러의 경우 로그 기록 후 빈 리스트 반환
-                print(f"Error fetching comments: {str(e)}")
-                return []
+            # 동기화를 끝까지 마친 적이 없으면(중단된 수집 등) 전체 탐색
+            known = (
+                {video['id']: video for video in self.video_store.get_videos(channel_id)}
+                if self.video_store.get_synced_at(channel_id) is not None else {}
+            )
+            uploads_playlist_id = await self.get_uploads_playlist_id(channel_id)
+
+            # 1. 알려진 비디오에 도달할 때까지 새 업로드만 수집
+            new_items = []
+            next_page_token = None
+            while True:
+                playlist_items = await self.youtube.get(
+                    'playlistItems',
+                    cache_ttl=0,  # 새 업로드 감지를 위해 항상 최신 목록 조회
+                    part='snippet,contentDetails',
+                    playlistId=uploads_playlist_id,
+                    maxResults=50,
+                    pageToken=next_page_token
+                )
+                reached_known = False
+                for item in playlist_items['items']:
+                    if item['contentDetails']['videoId'] in known:
+                        reached_known = True
+                        break
+                    new_items.append(item)
+
+                next_page_token = playlist_items.get('nextPageToken')
+                if reached_known or not next_page_token:
+                    break
+
+            new_videos = []
+            for i in range(0, len(new_items), 50):
+                new_videos.extend(await self._build_videos(new_items[i:i + 50]))
+            self.search_index.add_videos(channel_id, new_videos)
+
+            # 2. 기존 비디오는 통계만 50개 단위로 갱신
+            known_ids = list(known)
+            removed_ids = []
+            for i in range(0, len(known_ids), 50):
+                batch = known_ids[i:i + 50]
+                response = await self.youtube.get(
+                    'videos',
+                    cache_ttl=0,
+                    part='statistics',
+                    id=','.join(batch)
+                )
+                stats = {item['id']: item['statistics'] for item in response.get('items', [])}
+                for video_id in batch:
+                    if video_id not in stats:
+                        # 삭제되었거나 비공개로 전환된 비디오
+                        removed_ids.append(video_id)
+                        continue
+                    known[video_id].update(self._video_stats(stats[video_id]))
+
+            for video_id in removed_ids:
+                del known[video_id]
+
+            self.video_store.save(
+                channel_id,
+                uploads_playlist_id,
+                new_videos + list(known.values()),
+                removed_ids
+            )
+            videos = self.video_store.get_videos(channel_id)
+            await self.record_snapshot(channel_id=channel_id, videos=videos)
+            return videos
+
+        except Exception as e:
+            print(f"Error syncing channel videos: {e}")
+            return None
+
+    def index_comments(self, channel_id: str, comments: List[Dict]) -> None:
+        self.fan_index.add_comments(channel_id, comments)
+        self.search_index.add_comments(channel_id, comments)
+
+    async def record_snapshot(
+        self,
+        channel: Optional[Dict[str, Any]] = None,
+        channel_id: Optional[str] = None,
+        videos: Optional[List[Dict]] = None,
+    ) -> None:
+        """조회한 통계를 시계열 스냅샷으로 남깁니다. 기록 실패가 응답을 막지 않도록 예외는 출력만 합니다.
+
+        파일 쓰기는 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        """
+        try:
+            if channel is not None:
+                await asyncio.to_thread(self.snapshot_store.record_channel, channel)
+            if videos:
+                await asyncio.to_thread(self.snapshot_store.record_videos, channel_id, videos)
+        except Exception as e:
+            print(f"Error recording snapshot: {e}")
+
+    async def get_uploads_playlist_id(self, channel_id: str) -> str:
+        # 채널의 업로드 재생목록 ID 가져오기
+        # 저장된 값이 없으면 get_channel_info 와 같은 요청을 써서 캐시/동시 요청을 공유
+        uploads_playlist_id = self.video_store.get_uploads_playlist_id(channel_id)
+        if uploads_playlist_id:
+            return uploads_playlist_id
+        channel_response = await self.youtube.get(
+            'channels',
+            part=CHANNEL_PARTS,
+            id=channel_id
+        )
+        return channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+
+    async def _build_videos(self, playlist_items: List[Dict]) -> List[Dict]:
+        """재생목록 항목(최대 50개)에 비디오 통계와 길이를 결합합니다."""
+        if not playlist_items:
+            return []
+
+        # 비디오 상세 정보 가져오기
+        video_ids = [item['contentDetails']['videoId'] for item in playlist_items]
+        video_response = await self.youtube.get(
+            'videos',
+            part='statistics,contentDetails',
+            id=','.join(video_ids)
+        )
+        details = {item['id']: item for item in video_response.get('items', [])}
+
+        # 비디오 정보 결합 (삭제/비공개 비디오는 제외)
+        videos = []
+        for playlist_item in playlist_items:
+            video_details = details.get(playlist_item['contentDetails']['videoId'])
+            if video_details is None:
+                continue
+            videos.append({
+                'id': playlist_item['contentDetails']['videoId'],
+                'title': playlist_item['snippet']['title'],
+                'description': playlist_item['snippet']['description'],
+                'thumbnail': playlist_item['snippet']['thumbnails']['medium']['url'],
+                'publishedAt': playlist_item['snippet']['publishedAt'],
+                **self._video_stats(video_details['statistics']),
+                'duration': video_details['contentDetails']['duration']
+            })
+        return videos
+
+    @staticmethod
+    def _video_stats(statistics: Dict) -> Dict[str, str]:
+        return {
+            'viewCount': statistics.get('viewCount', '0'),
+            'likeCount': statistics.get('likeCount', '0'),
+            'commentCount': statistics.get('commentCount', '0'),
+        }
+
+    async def get_video_comments(
+        self,
+        video_id: str,
+        max_comments: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        report: Optional[Dict[str, Any]] = None,
+        comment_count: Optional[int] = None,
+    ) -> List[Dict]:
+        try:
+            return await self._fetch_video_comments(
+                video_id, max_comments, max_pages, time_budget, report, comment_count
+            )
+        except YouTubeAPIError as e:
+            # 로그 기록 후 빈 리스트 반환
+            print(f"Error fetching comments: {str(e)}")
+            return []
         except Exception as e:
             print(f"Unexpected error fetching comments: {str(e)}")
             return []
 
-    async def get_channel_comments(self, channel_id: str) -> List[Dict]:
+    async def _fetch_video_comments(
+        self,
+        video_id: str,
+        max_comments: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        report: Optional[Dict[str, Any]] = None,
+        comment_count: Optional[int] = None,
+    ) -> List[Dict]:
+        """댓글을 모두 모아 반환합니다. 댓글 비활성화 외의 오류는 호출자에게 전달합니다."""
+        comments = []
+        async for page in self.iter_video_comments(
+            video_id, max_comments, max_pages, time_budget, report, comment_count
+        ):
+            comments.extend(page)
+        return comments
+
+    async def iter_video_comments(
+        self,
+        video_id: str,
+        max_comments: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        report: Optional[Dict[str, Any]] = None,
+        comment_count: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict]]:
+        """commentThreads 를 nextPageToken 을 따라가며 페이지 단위로 내보냅니다.
+
+        답글도 함께 가져오며, 스레드에 포함되지 않은 나머지 답글은 comments().list 로
+        스레드당 `COMMENT_MAX_REPLY_PAGES` 페이지까지 추가 조회합니다. 댓글 수 한도에
+        도달했거나 시간 예산을 넘기면 답글 추가 조회를 멈춥니다. 한도(댓글 수, 페이지
+        수, 시간)는 생략 시 설정값을 쓰고 0 이면 제한하지 않습니다. `report` 가 주어지면
+        수집/건너뛴 댓글 수와 중단 사유를 기록합니다. 건너뛴 수는 호출자가 가진 비디오의
+        `comment_count` 로 계산하고, 없을 때만 비디오 통계를 따로 조회합니다.
+        """
+        count_skipped = report is not None or comment_count is not None
+        max_comments = settings.COMMENT_MAX_PER_VIDEO if max_comments is None else max_comments
+        max_pages = settings.COMMENT_MAX_PAGES if max_pages is None else max_pages
+        time_budget = settings.COMMENT_TIME_BUDGET if time_budget is None else time_budget
+        include_replies = settings.COMMENT_INCLUDE_REPLIES
+        max_reply_pages = settings.COMMENT_MAX_REPLY_PAGES
+
+        report = report if report is not None else {}
+        report.update(fetched=0, skipped=0, pages=0, stopped=None)
+        started = time.monotonic()
+        next_page_token = None
+        partial = False  # 한도 때문에 버리거나 조회하지 않은 댓글/답글이 있는지
+
+        def over_time_budget() -> bool:
+            return bool(time_budget) and time.monotonic() - started >= time_budget
+
+        def limit_reached() -> Optional[str]:
+            if max_comments and report['fetched'] >= max_comments:
+                return 'max_comments'
+            if max_pages and report['pages'] >= max_pages:
+                return 'max_pages'
+            if over_time_budget():
+                return 'time_budget'
+            return None
+
+        while True:
+            try:
+                response = await self.youtube.get(
+                    'commentThreads',
+                    part='snippet,replies' if include_replies else 'snippet',
+                    videoId=video_id,
+                    maxResults=100,
+                    textFormat='plainText',
+                    pageToken=next_page_token
+                )
+            except YouTubeAPIError as e:
+                if e.reason == 'commentsDisabled':
+                    # 댓글이 비활성화된 경우 빈 결과
+                    return
+                raise
+            report['pages'] += 1
+
+            page = []
+            for item in response.get('items', []):
+                if max_comments and report['fetched'] + len(page) >= max_comments:
+                    partial = True
+                    break
+                top_level = item['snippet']['topLevelComment']
+                page.append(self._to_comment(top_level))
+                if not include_replies:
+                    continue
+
+                replies = item.get('replies', {}).get('comments', [])
+                if len(replies) < item['snippet'].get('totalReplyCount', 0):
+                    # 한도에 닿았거나 시간이 지났으면 나머지 답글은 조회하지 않음
+                    if (max_comments and report['fetched'] + len(page) + len(replies) >= max_comments) \
+                            or over_time_budget():
+                        partial = True
+                    else:
+                        replies, complete = await self._fetch_replies(top_level['id'], max_reply_pages)
+                        partial = partial or not complete
+                page.extend(self._to_comment(reply) for reply in replies)
+
+            if max_comments and len(page) > max_comments - report['fetched']:
+                page = page[:max_comments - report['fetched']]
+                partial = True
+            report['fetched'] += len(page)
+            if page:
+                yield page
+
+            next_page_token = response.get('nextPageToken')
+            reason = limit_reached() if next_page_token or partial else None
+            if reason or not next_page_token:
+                report['stopped'] = reason
+                # 마지막 페이지라도 한도 때문에 잘랐다면 건너뛴 수를 계산
+                if (reason or partial) and count_skipped:
+                    if comment_count is None:
+                        comment_count = await self._get_comment_count(video_id)
+                    report['skipped'] = max(comment_count - report['fetched'], 0)
+                return
+
+    async def _fetch_replies(self, parent_id: str, max_pages: int = 0) -> Tuple[List[Dict], bool]:
+        """답글을 최대 `max_pages` 페이지(0 이면 제한 없음)까지 가져와 (답글, 전부 가져왔는지) 를 반환합니다."""
+        replies = []
+        next_page_token = None
+        pages = 0
+        while True:
+            response = await self.youtube.get(
+                'comments',
+                part='snippet',
+                parentId=parent_id,
+                maxResults=100,
+                textFormat='plainText',
+                pageToken=next_page_token
+            )
+            replies.extend(response.get('items', []))
+            pages += 1
+            next_page_token = response.get('nextPageToken')
+            if not next_page_token:
+                return replies, True
+            if max_pages and pages >= max_pages:
+                return replies, False
+
+    async def _get_comment_count(self, video_id: str) -> int:
+        # 비디오 통계의 전체 댓글 수(답글 포함). 건너뛴 수를 추정하는 데만 씀
+        try:
+            response = await self.youtube.get('videos', part='statistics', id=video_id)
+            return int(response['items'][0]['statistics'].get('commentCount', 0))
+        except (YouTubeAPIError, LookupError, ValueError):
+            return 0
+
+    @staticmethod
+    def _comment_count(video: Dict) -> Optional[int]:
         try:
-            # 1. 먼저 채널의 모든 비디오 ID 가져오기
-            videos = await self.get_channel_videos(channel_id)
-            if not videos:
-                return []
+            return int(video['commentCount'])
+        except (KeyError, TypeError, ValueError):
+            return None
 
+    @staticmethod
+    def _to_comment(comment: Dict) -> Dict:
+        snippet = comment['snippet']
+        return {
+            'id': comment.get('id'),
+            'parentId': snippet.get('parentId'),
+            'author': snippet['authorDisplayName'],
+            'text': snippet['textDisplay'],
+            'publishedAt': snippet['publishedAt'],
+            'likeCount': snippet['likeCount'],
+            'authorChannelId': snippet.get('authorChannelId', {}),
+        }
+
+    async def get_channel_comments(self, channel_id: str) -> List[Dict]:
+        try:
             all_comments = []
-            
-            # 2. 각 비디오의 댓글 가져오기
-            for video in videos:
-                try:
-                    comments = await self.get_video_comments(video['id'])
-                    if comments:
-                        # 비디오 정보 추가
-                        for comment in comments:
-                            comment['videoId'] = video['id']
-                            comment['videoTitle'] = video['title']
-                            comment['videoPublishedAt'] = video['publishedAt']
-                        all_comments.extend(comments)
-                    
-                    # API 할당량 초과 방지를 위한 짧은 대기
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as e:
-                    print(f"Error fetching comments for video {video['id']}: {str(e)}")
-                    continue
-            
+            async for comments in self.iter_channel_comments(channel_id):
+                all_comments.extend(comments)
             return all_comments
             
         except Exception as e:
             print(f"Error in get_channel_comments: {str(e)}")
             return []
 
+    async def iter_channel_comments(self, channel_id: str, index_videos: bool = False) -> AsyncIterator[List[Dict]]:
+        """채널의 비디오별 댓글 목록을 가져오는 대로 내보냅니다.
+
+        비디오 페이지를 받는 즉시 `comment_concurrency` 개의 작업자가 댓글을
+        가져옵니다. 큐 크기를 제한해 소비자가 느리면 수집도 멈추므로 메모리
+        사용량이 채널 크기와 무관하게 일정합니다. 실패한 비디오는 건너뜁니다.
+        `index_videos` 이면 비디오 제목도 검색 색인에 넣습니다 (색인 작업용).
+        """
+        workers = self.comment_concurrency
+        pending_videos: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        results: asyncio.Queue = asyncio.Queue(maxsize=workers)
+        done = object()
+        stats = {'videos': 0, 'failed': 0}
+
+        async def produce() -> None:
+            try:
+                async for page in self.iter_channel_videos(channel_id):
+                    if index_videos:
+                        self.search_index.add_videos(channel_id, page)
+                    for video in page:
+                        stats['videos'] += 1
+                        await pending_videos.put(video)
+            finally:
+                for _ in range(workers):
+                    await pending_videos.put(done)
+
+        async def work() -> None:
+            while True:
+                video = await pending_videos.get()
+                if video is done:
+                    await results.put(done)
+                    return
+                try:
+                    comments = await self._fetch_video_comments(
+                        video['id'], comment_count=self._comment_count(video)
+                    )
+                except Exception as e:
+                    stats['failed'] += 1
+                    print(f"Error fetching comments for video {video['id']}: {str(e)}")
+                    continue
+                # 비디오 정보 추가
+                for comment in comments:
+                    comment['videoId'] = video['id']
+                    comment['videoTitle'] = video['title']
+                    comment['videoPublishedAt'] = video['publishedAt']
+                # 수집하는 즉시 핵심 팬/검색 색인에 반영
+                self.index_comments(channel_id, comments)
+                await results.put(comments)
+
+        producer = asyncio.create_task(produce())
+        tasks = [asyncio.create_task(work()) for _ in range(workers)]
+        try:
+            finished = 0
+            while finished < workers:
+                comments = await results.get()
+                if comments is done:
+                    finished += 1
+                elif comments:
+                    yield comments
+            # 비디오 목록 조회 자체가 실패한 경우 예외 전달
+            await producer
+        finally:
+            for task in [producer, *tasks]:
+                task.cancel()
+            await asyncio.gather(producer, *tasks, return_exceptions=True)
+
+        if stats['failed']:
+            print(f"iter_channel_comments: {stats['failed']}/{stats['videos']} videos failed, returning partial results")
+
+    async def index_channel_comments(self, channel_id: str) -> int:
+        """채널 댓글을 수집해 핵심 팬/검색 색인을 갱신하고 수집한 댓글 수를 반환합니다."""
+        count = 0
+        async for comments in self.iter_channel_comments(channel_id, index_videos=True):
+            count += len(comments)
+        self.fan_index.mark_indexed(channel_id)
+        return count
+
     async def get_video_details(self, video_id: str) -> Dict:
         try:
-            response = await self.youtube.videos().list(
+            response = await self.youtube.get(
+                'videos',
                 part='snippet,statistics,contentDetails',
                 id=video_id
-            ).execute()
+            )
 
             if not response['items']:
                 return None
@@ -0,0 +1,284 @@
+"""`/api` 전체 라우트 벤치마크.
+
+가짜 YouTube/OpenAI(`benchmarks.fakes`)를 상대로 `app/api/channel.py` 의 모든
+라우트를 차례로 호출하고, 라우트별 p50/p99 지연 시간, 처리량, 최대 메모리,
+업스트림 호출 수를 표로 출력합니다. 데이터베이스와 스냅샷은 임시 디렉터리에
+만들어지므로 실행할 때마다 같은 조건(빈 캐시)에서 시작합니다.
+
+최대 메모리는 기본적으로 프로세스 최대 RSS(누적)이고, `--tracemalloc` 을 주면
+시나리오별 파이썬 할당 최대치를 잽니다 (대신 전체가 몇 배 느려집니다).
+
+    python -m benchmarks.api_bench --channels 5 --videos 200 --comments 50
+    python -m benchmarks.api_bench --only channel_info,search --requests 500 --json result.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from .fakes import FakeYouTube, FakeOpenAI, channel_id
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def build_scenarios(youtube: FakeYouTube) -> Dict[str, Any]:
+    channels = youtube.channels
+
+    def ch(i: int) -> str:
+        return channel_id(i % channels)
+
+    def video(i: int) -> str:
+        return youtube.video_id(i % channels, i % youtube.videos_per_channel)
+
+    def get(path: Callable[[int], str], **params: Any) -> Request:
+        return lambda client, i: client.get(path(i), params=params)
+
+    async def consume(client: httpx.AsyncClient, url: str) -> httpx.Response:
+        async with client.stream('GET', url) as response:
+            async for _ in response.aiter_bytes():
+                pass
+        return response
+
+    async def wait_for_job(client: httpx.AsyncClient, response: httpx.Response) -> httpx.Response:
+        job_id = response.json()['id']
+        while True:
+            job = await client.get(f'/api/jobs/{job_id}')
+            if job.json()['status'] in ('done', 'failed'):
+                return job
+            await asyncio.sleep(0.01)
+
+    async def ingest(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        # 작업 제출부터 완료까지를 한 요청으로 측정
+        return await wait_for_job(client, await client.post(f'/api/channel/{ch(i)}/ingest'))
+
+    async def refresh_tracked(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        # 갱신 시작부터 lastRefreshed 가 찍힐 때까지를 한 요청으로 측정
+        response = await client.post(f'/api/tracked-channels/{ch(i)}/refresh')
+        if response.status_code >= 400:
+            return response
+        started = response.json()['lastAttempt']
+        while True:
+            tracked = await client.get('/api/tracked-channels')
+            channel = next(item for item in tracked.json()['channels'] if item['channelId'] == ch(i))
+            if (channel['lastRefreshed'] or 0) >= started:
+                return tracked
+            await asyncio.sleep(0.01)
+
+    async def job_events(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        response = await client.post(f'/api/channel/{ch(i)}/ingest', params={'analyze': False})
+        return await consume(client, f"/api/jobs/{response.json()['id']}/events?interval=0.2")
+
+    chart_data = {'like_ratio': 3.2, 'comment_ratio': 0.4, 'total_engagement': 3.6}
+    all_channels = [channel_id(i) for i in range(channels)]
+
+    # 시나리오 이름 -> (요청 함수, 채널 전체를 훑는 무거운 시나리오 여부)
+    # 의존 순서대로 나열 (색인이 필요한 라우트는 수집 이후)
+    return {
+        'channel_info': (get(lambda i: f'/api/channel/{ch(i)}'), False),
+        'channels_batch': (lambda client, i: client.post('/api/channels/batch', json={
+            'channel_ids': all_channels, 'include_videos': True, 'max_videos': 50,
+        }), False),
+        'channel_videos': (get(lambda i: f'/api/channel/{ch(i)}/videos'), True),
+        'channel_videos_incremental': (get(lambda i: f'/api/channel/{ch(i)}/videos', incremental=True), True),
+        'videos_stream': (lambda client, i: consume(client, f'/api/channel/{ch(i)}/videos/stream'), True),
+        'channel_metrics': (get(lambda i: f'/api/channel/{ch(i)}/metrics'), False),
+        'channel_history': (get(lambda i: f'/api/channel/{ch(i)}/history', bucket='hour'), False),
+        'video_comments': (get(lambda i: f'/api/videos/{video(i)}/comments'), False),
+        'video_analysis': (get(lambda i: f'/api/videos/{video(i)}/analysis'), False),
+        'video_analysis_full': (get(lambda i: f'/api/videos/{video(i)}/analysis', full=True), False),
+        'channel_comments': (get(lambda i: f'/api/channel/{ch(i)}/comments'), True),
+        'channel_comments_compact': (get(lambda i: f'/api/channel/{ch(i)}/comments', compact=True), True),
+        'comments_stream': (lambda client, i: consume(client, f'/api/channel/{ch(i)}/comments/stream'), True),
+        'ingest_job': (ingest, True),
+        'job_events': (job_events, True),
+        # 핵심 팬/검색 색인은 수집 작업이 끝난 채널만 바로 응답 (아니면 202 와 작업을 돌려줌)
+        'core_fans': (get(lambda i: f'/api/channel/{ch(i)}/core-fans'), False),
+        'core_fan_comments': (get(
+            lambda i: f'/api/channel/{ch(i)}/core-fans/{youtube.author_id(i % channels, i % youtube.fans_per_channel)}/comments'
+        ), False),
+        'search': (get(lambda i: f'/api/channel/{ch(i)}/search', q='브이로그 영상'), False),
+        'top_terms': (get(lambda i: f'/api/channel/{ch(i)}/terms'), False),
+        'term_frequency': (get(lambda i: f'/api/channel/{ch(i)}/terms/frequency', terms=['영상', '여행']), False),
+        # 추적은 YouTube 를 호출하지 않으므로 요청마다 다른 채널을 추적해 목록 크기도 요청 수만큼 늘림.
+        # 앞쪽 채널은 가짜 YouTube 에 있는 채널이라 갱신 시나리오에서 그대로 씀
+        'track_channel': (lambda client, i: client.put(f'/api/tracked-channels/{channel_id(i)}'), False),
+        'tracked_channels': (get(lambda i: '/api/tracked-channels'), False),
+        'refresh_tracked': (refresh_tracked, True),
+        'untrack_channel': (lambda client, i: client.delete(f'/api/tracked-channels/{channel_id(i)}'), False),
+        'analysis_chart': (lambda client, i: client.post('/api/analysis/chart', params={'chart_type': 'engagement'},
+                                                         json=dict(chart_data, like_ratio=i % 10)), False),
+        'analysis_charts': (lambda client, i: client.post('/api/analysis/charts', json={
+            'charts': {'engagement': dict(chart_data, like_ratio=i % 10)},
+        }), False),
+        'channel_insights': (get(lambda i: f'/api/channel/{ch(i)}/insights'), False),
+        'cache_stats': (get(lambda i: '/api/cache/stats'), False),
+    }
+
+
+def peak_memory_mb(trace_memory: bool) -> float:
+    if trace_memory:
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    # 리눅스에서 ru_maxrss 는 KB 단위
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    request: Request,
+    count: int,
+    concurrency: int,
+    upstream: Callable[[], Counter],
+    trace_memory: bool,
+) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await request(client, i)
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception as e:
+                errors += 1
+                print(f"  request {i} failed: {e}")
+            latencies.append(time.perf_counter() - started)
+
+    before = upstream()
+    if trace_memory:
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    elapsed = time.perf_counter() - started
+    calls = upstream() - before
+
+    return {
+        'requests': count,
+        'errors': errors,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'throughput': count / elapsed if elapsed else 0.0,
+        'peak_mb': peak_memory_mb(trace_memory),
+        'upstream_calls': sum(calls.values()) - calls['injected_errors'],
+        'upstream': dict(calls),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    # 설정을 읽기 전에 앱을 가져오지 않도록 여기서 import
+    from app.api import channel
+    from app.services.youtube_client import YouTubeClient
+
+    youtube = FakeYouTube(
+        channels=args.channels,
+        videos_per_channel=args.videos,
+        comments_per_video=args.comments,
+        replies_per_comment=args.replies,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    openai = FakeOpenAI(latency=args.openai_latency, error_rate=args.openai_error_rate)
+    channel.youtube_service.youtube = YouTubeClient(
+        api_key='bench',
+        transport=youtube.transport(),
+        cache=channel.youtube_service.youtube.cache,
+        backoff_base=0.01,
+    )
+    channel.openai_service.client = openai
+
+    def upstream() -> Counter:
+        return Counter(youtube.calls) + Counter({f'openai:{model}': n for model, n in openai.calls.items()}) \
+            + Counter({'injected_errors': youtube.errors + openai.errors})
+
+    scenarios = build_scenarios(youtube)
+    selected = args.only.split(',') if args.only else list(scenarios)
+    unknown = set(selected) - set(scenarios)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    from app.main import app
+    results: Dict[str, Dict[str, Any]] = {}
+    await channel.job_service.start()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=None) as client:
+            for name in selected:
+                request, heavy = scenarios[name]
+                count = args.heavy_requests if heavy else args.requests
+                results[name] = await run_scenario(
+                    client, request, count, args.concurrency, upstream, args.tracemalloc
+                )
+                print_row(name, results[name])
+    finally:
+        await channel.job_service.stop()
+        await channel.youtube_service.aclose()
+    return results
+
+
+def print_header() -> None:
+    print(f"{'scenario':<28}{'reqs':>6}{'err':>5}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}{'peak MB':>9}{'upstream':>10}")
+
+
+def print_row(name: str, result: Dict[str, Any]) -> None:
+    print(f"{name:<28}{result['requests']:>6}{result['errors']:>5}{result['p50_ms']:>10.1f}"
+          f"{result['p99_ms']:>10.1f}{result['throughput']:>10.1f}{result['peak_mb']:>9.1f}{result['upstream_calls']:>10}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--channels', type=int, default=2, help='합성 채널 수')
+    parser.add_argument('--videos', type=int, default=60, help='채널당 비디오 수')
+    parser.add_argument('--comments', type=int, default=20, help='비디오당 최상위 댓글 수')
+    parser.add_argument('--replies', type=int, default=2, help='댓글당 답글 수')
+    parser.add_argument('--latency', type=float, default=0.01, help='가짜 YouTube 응답 지연(초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='가짜 YouTube 5xx 비율 (0-1)')
+    parser.add_argument('--openai-latency', type=float, default=0.05, help='가짜 OpenAI 응답 지연(초)')
+    parser.add_argument('--openai-error-rate', type=float, default=0.0)
+    parser.add_argument('--requests', type=int, default=50, help='가벼운 시나리오의 요청 수')
+    parser.add_argument('--heavy-requests', type=int, default=3, help='채널 전체를 훑는 시나리오의 요청 수')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--rps', type=float, default=10_000, help='YouTube 클라이언트 초당 요청 한도')
+    parser.add_argument('--only', help='쉼표로 구분한 시나리오 이름')
+    parser.add_argument('--tracemalloc', action='store_true', help='시나리오별 파이썬 할당 최대치 측정 (느림)')
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='api-bench-')
+    os.environ.update({
+        'YOUTUBE_API_KEY': 'bench',
+        'OPENAI_API_KEY': 'bench',
+        'DATABASE_URL': f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        'SNAPSHOT_DIR': os.path.join(workdir, 'snapshots'),
+        'YOUTUBE_REQUESTS_PER_SECOND': str(args.rps),
+    })
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    print_header()
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"work dir: {workdir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+"""벤치마크용 가짜 YouTube Data API v3 / OpenAI chat completions.
+
+모든 데이터는 (채널 번호, 비디오 번호, 댓글 번호)에서 결정적으로 만들어지므로
+같은 설정이면 항상 같은 응답을 돌려줍니다. 지연 시간과 오류 비율을 주입할 수
+있고, 리소스별 호출 수를 `calls`, 주입한 오류 수를 `errors` 에 셉니다.
+`upcoming` 을 줄이면 새 업로드가, `stat_overrides` 를 바꾸면 통계 변화가 생긴
+것처럼 동작합니다 (증분 동기화 테스트용).
+
+    youtube = FakeYouTube(channels=3, videos_per_channel=200, comments_per_video=50)
+    client = YouTubeClient(api_key='bench', transport=youtube.transport())
+"""
+import asyncio
+import hashlib
+import json
+import re
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Optional, Dict, Any, List
+
+import httpx
+
+CHANNEL_PREFIX = 'UCbench'
+DURATIONS = ['PT45S', 'PT4M10S', 'PT8M30S', 'PT12M', 'PT18M40S', 'PT25M', 'PT1H2M']
+TITLE_WORDS = ['브이로그', '리뷰', '먹방', '여행', '게임', '일상', '챌린지', '꿀팁', '언박싱', '하이라이트']
+COMMENT_PHRASES = [
+    '영상 정말 좋아요 최고', '편집이 너무 재밌어요 ㅋㅋㅋ', '오늘도 잘 보고 갑니다', '다음 영상도 기대할게요',
+    '음질이 좀 아쉽네요', '광고가 너무 길어요 별로', '이 부분 설명 감사합니다', '구독하고 갑니다 응원해요',
+    '처음부터 끝까지 지루했어요', '여행 브이로그 더 올려주세요',
+]
+BASE_TIME = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def channel_id(index: int) -> str:
+    return f'{CHANNEL_PREFIX}{index:04d}'
+
+
+def _digest(*parts: Any) -> int:
+    return int.from_bytes(hashlib.blake2b('|'.join(map(str, parts)).encode(), digest_size=8).digest(), 'big')
+
+
+def _timestamp(value: datetime) -> str:
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class FakeYouTube:
+    """channels / playlistItems / videos / commentThreads / comments 를 흉내 냅니다."""
+
+    def __init__(
+        self,
+        channels: int = 5,
+        videos_per_channel: int = 100,
+        comments_per_video: int = 30,
+        replies_per_comment: int = 2,
+        fans_per_channel: int = 50,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+    ):
+        self.channels = channels
+        self.videos_per_channel = videos_per_channel
+        self.comments_per_video = comments_per_video
+        self.replies_per_comment = replies_per_comment
+        self.fans_per_channel = fans_per_channel
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls: Counter = Counter()
+        self.errors = 0
+        # 아직 업로드되지 않은 것으로 취급할 최신 비디오 수 (번호 0..upcoming-1)
+        self.upcoming = 0
+        # 비디오 ID -> statistics 덮어쓰기
+        self.stat_overrides: Dict[str, Dict[str, str]] = {}
+        self._attempts: Counter = Counter()
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def video_id(self, channel: int, n: int) -> str:
+        return f'vid{channel:04d}{n:06d}'
+
+    def author_id(self, channel: int, fan: int) -> str:
+        return f'UCfan{channel:04d}{fan:04d}'
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        resource = request.url.path.rsplit('/', 1)[-1]
+        self.calls[resource] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        # 같은 요청의 n 번째 시도마다 오류 여부가 정해지므로 재시도하면 대부분 성공
+        request_key = str(request.url)
+        self._attempts[request_key] += 1
+        if self.error_rate and _digest(request_key, self._attempts[request_key]) % 10_000 < self.error_rate * 10_000:
+            self.errors += 1
+            return httpx.Response(500, json={'error': {'message': 'injected', 'errors': [{'reason': 'backendError'}]}})
+
+        params = request.url.params
+        handler = {
+            'channels': self._channels,
+            'playlistItems': self._playlist_items,
+            'videos': self._videos,
+            'commentThreads': self._comment_threads,
+            'comments': self._comments,
+        }.get(resource)
+        if handler is None:
+            return httpx.Response(404, json={'error': {'message': 'not found', 'errors': [{'reason': 'notFound'}]}})
+        body = handler(params)
+
+        etag = hashlib.md5(json.dumps(body, sort_keys=True).encode()).hexdigest()
+        if request.headers.get('if-none-match') == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json={**body, 'etag': etag}, headers={'etag': etag})
+
+    def _channel_index(self, value: str) -> Optional[int]:
+        match = re.fullmatch(rf'(?:{CHANNEL_PREFIX}|UUbench)(\d+)', value)
+        if not match or int(match.group(1)) >= self.channels:
+            return None
+        return int(match.group(1))
+
+    def _channels(self, params) -> Dict[str, Any]:
+        items = []
+        for value in params.get('id', '').split(','):
+            index = self._channel_index(value)
+            if index is None:
+                continue
+            items.append({
+                'id': channel_id(index),
+                'snippet': {
+                    'title': f'벤치 채널 {index}',
+                    'description': '합성 데이터 채널',
+                    'thumbnails': {'default': {'url': f'https://example.com/{index}.jpg'}},
+                    'customUrl': f'@bench{index}',
+                    'publishedAt': '2018-01-01T00:00:00Z',
+                },
+                'statistics': {
+                    'subscriberCount': str(10_000 + index * 1_234),
+                    'videoCount': str(self.videos_per_channel),
+                    'viewCount': str(1_000_000 + index * 98_765),
+                },
+                'contentDetails': {'relatedPlaylists': {'uploads': f'UUbench{index:04d}'}},
+            })
+        return {'items': items}
+
+    def _playlist_items(self, params) -> Dict[str, Any]:
+        index = self._channel_index(params.get('playlistId', ''))
+        if index is None:
+            return {'items': []}
+        start = int(params.get('pageToken') or self.upcoming)
+        end = min(start + int(params.get('maxResults') or 5), self.videos_per_channel)
+        items = [
+            {
+                'snippet': {
+                    'title': self._title(index, n),
+                    'description': '',
+                    'thumbnails': {'medium': {'url': f'https://example.com/{index}/{n}.jpg'}},
+                    'publishedAt': self._published_at(n),
+                },
+                'contentDetails': {'videoId': self.video_id(index, n)},
+            }
+            for n in range(start, end)
+        ]
+        body: Dict[str, Any] = {'items': items, 'pageInfo': {'totalResults': self.videos_per_channel - self.upcoming}}
+        if end < self.videos_per_channel:
+            body['nextPageToken'] = str(end)
+        return body
+
+    def _videos(self, params) -> Dict[str, Any]:
+        items = []
+        for video_id in params.get('id', '').split(','):
+            match = re.fullmatch(r'vid(\d{4})(\d{6})', video_id)
+            if not match:
+                continue
+            index, n = int(match.group(1)), int(match.group(2))
+            if index >= self.channels or n >= self.videos_per_channel:
+                continue
+            seed = _digest(video_id)
+            views = 1_000 + seed % 200_000
+            items.append({
+                'id': video_id,
+                'snippet': {
+                    'title': self._title(index, n),
+                    'description': '',
+                    'publishedAt': self._published_at(n),
+                    'thumbnails': {'medium': {'url': f'https://example.com/{index}/{n}.jpg'}},
+                },
+                'statistics': {
+                    'viewCount': str(views),
+                    'likeCount': str(views // (20 + seed % 30)),
+                    'commentCount': str(self.comments_per_video * (1 + self.replies_per_comment)),
+                    **self.stat_overrides.get(video_id, {}),
+                },
+                'contentDetails': {'duration': DURATIONS[seed % len(DURATIONS)], 'definition': 'hd'},
+            })
+        return {'items': items}
+
+    def _comment_threads(self, params) -> Dict[str, Any]:
+        video_id = params.get('videoId', '')
+        match = re.fullmatch(r'vid(\d{4})(\d{6})', video_id)
+        if not match:
+            return {'items': []}
+        index = int(match.group(1))
+        start = int(params.get('pageToken') or 0)
+        end = min(start + int(params.get('maxResults') or 20), self.comments_per_video)
+        include_replies = 'replies' in params.get('part', '')
+        items = []
+        for j in range(start, end):
+            thread_id = f'{video_id}.c{j}'
+            # 스레드에는 답글 일부만 담아 나머지는 comments().list 로 조회하게 함
+            inline = min(self.replies_per_comment, 1)
+            item = {
+                'id': thread_id,
+                'snippet': {
+                    'videoId': video_id,
+                    'totalReplyCount': self.replies_per_comment,
+                    'topLevelComment': self._comment(index, thread_id, j),
+                },
+            }
+            if include_replies and self.replies_per_comment:
+                item['replies'] = {'comments': [
+                    self._comment(index, f'{thread_id}.r{k}', j + k + 1, parent_id=thread_id) for k in range(inline)
+                ]}
+            items.append(item)
+        body: Dict[str, Any] = {'items': items}
+        if end < self.comments_per_video:
+            body['nextPageToken'] = str(end)
+        return body
+
+    def _comments(self, params) -> Dict[str, Any]:
+        parent_id = params.get('parentId', '')
+        match = re.fullmatch(r'vid(\d{4})\d{6}\.c(\d+)', parent_id)
+        if not match:
+            return {'items': []}
+        index, j = int(match.group(1)), int(match.group(2))
+        return {'items': [
+            self._comment(index, f'{parent_id}.r{k}', j + k + 1, parent_id=parent_id)
+            for k in range(self.replies_per_comment)
+        ]}
+
+    def _comment(self, index: int, comment_id: str, n: int, parent_id: Optional[str] = None) -> Dict[str, Any]:
+        seed = _digest(comment_id)
+        fan = seed % self.fans_per_channel
+        snippet = {
+            'authorDisplayName': f'팬{fan}',
+            'authorChannelId': {'value': self.author_id(index, fan)},
+            'textDisplay': f'{COMMENT_PHRASES[seed % len(COMMENT_PHRASES)]} {TITLE_WORDS[n % len(TITLE_WORDS)]}',
+            'publishedAt': _timestamp(BASE_TIME - timedelta(minutes=seed % 100_000)),
+            'likeCount': seed % 50,
+        }
+        if parent_id:
+            snippet['parentId'] = parent_id
+        return {'id': comment_id, 'snippet': snippet}
+
+    @staticmethod
+    def _title(index: int, n: int) -> str:
+        seed = _digest(index, n)
+        words = [TITLE_WORDS[(seed >> shift) % len(TITLE_WORDS)] for shift in (0, 8, 16)]
+        return f'{words[0]} {words[1]} {n}화 - {words[2]}'
+
+    @staticmethod
+    def _published_at(n: int) -> str:
+        # 업로드 재생목록은 최신순이므로 번호가 클수록 오래된 영상
+        return _timestamp(BASE_TIME - timedelta(hours=37 * n))
+
+
+class FakeOpenAI:
+    """`AsyncOpenAI` 대신 넣는 가짜 클라이언트. `client.chat.completions.create` 만 흉내 냅니다."""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls: Counter = Counter()
+        self.errors = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model: str, messages: List[Dict[str, str]], **kwargs: Any):
+        self.calls[model] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        prompt = messages[-1]['content']
+        if self.error_rate and _digest(prompt, self.calls[model]) % 10_000 < self.error_rate * 10_000:
+            self.errors += 1
+            raise RuntimeError('injected OpenAI error')
+
+        response_format = kwargs.get('response_format') or {}
+        if response_format.get('type') == 'json_schema':
+            properties = response_format['json_schema']['schema']['properties']
+            content = json.dumps({name: f'{name} 지표가 안정적인 흐름을 보입니다.' for name in properties}, ensure_ascii=False)
+        elif '"categories"' in prompt:
+            content = json.dumps(self._comment_analysis(prompt), ensure_ascii=False)
+        else:
+            content = '채널 지표가 꾸준한 성장세를 보이고 있습니다.'
+
+        # 한국어 기준 대략 글자당 1토큰으로 추정
+        usage = SimpleNamespace(prompt_tokens=len(prompt), completion_tokens=len(content))
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    @staticmethod
+    def _comment_analysis(prompt: str) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            'categories': [{'name': '편집', 'examples': []}, {'name': '콘텐츠 요청', 'examples': []}],
+            'feedback': [{'type': '요청', 'content': '여행 브이로그를 더 원합니다', 'examples': []}],
+        }
+        if '"keywords"' in prompt:
+            result['keywords'] = [{'word': '영상', 'count': 10, 'examples': []}]
+            result['sentiment'] = {
+                'positive': 60, 'negative': 20, 'neutral': 20,
+                'examples': {'positive': [], 'negative': [], 'neutral': []},
+            }
+        return result
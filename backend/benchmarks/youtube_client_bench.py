@@ -0,0 +1,93 @@
+"""YouTube 클라이언트 처리량 벤치마크.
+
+로컬 가짜 Data API(httpx.MockTransport)를 상대로 `/api/channel/{id}` 를
+동시에 호출해 초당 요청 수를 측정합니다. `--blocking` 옵션은 예전
+`.execute()` 처럼 이벤트 루프를 막는 업스트림을 흉내 내어 비교 기준을 줍니다.
+
+    python -m benchmarks.youtube_client_bench --requests 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+
+os.environ.setdefault('YOUTUBE_API_KEY', 'bench')
+os.environ.setdefault('OPENAI_API_KEY', 'bench')
+# 실제 데이터베이스와 스냅샷을 건드리지 않도록 임시 디렉터리에서 실행
+_workdir = tempfile.mkdtemp(prefix='client-bench-')
+os.environ.update({
+    'DATABASE_URL': f"sqlite:///{os.path.join(_workdir, 'bench.db')}",
+    'SNAPSHOT_DIR': os.path.join(_workdir, 'snapshots'),
+})
+
+from app.main import app  # noqa: E402
+from app.api import channel  # noqa: E402
+from app.services.youtube_client import YouTubeClient  # noqa: E402
+
+
+def make_fake_transport(latency: float, blocking: bool) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if blocking:
+            time.sleep(latency)
+        else:
+            await asyncio.sleep(latency)
+        channel_id = request.url.params.get('id', 'UC_bench')
+        return httpx.Response(200, json={
+            'items': [{
+                'id': channel_id,
+                'snippet': {
+                    'title': 'Bench channel',
+                    'description': '',
+                    'thumbnails': {'default': {'url': 'https://example.com/t.jpg'}},
+                    'publishedAt': '2020-01-01T00:00:00Z',
+                },
+                'statistics': {'subscriberCount': '1000', 'videoCount': '10', 'viewCount': '100000'},
+                'contentDetails': {'relatedPlaylists': {'uploads': 'UU_bench'}},
+            }]
+        })
+
+    return httpx.MockTransport(handler)
+
+
+async def run(total: int, concurrency: int, latency: float, blocking: bool) -> float:
+    # 기본 초당 요청 한도(토큰 버킷)에 막히지 않도록 한도를 충분히 높게 둠
+    channel.youtube_service.youtube = YouTubeClient(
+        api_key='bench',
+        transport=make_fake_transport(latency, blocking),
+        requests_per_second=10_000,
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench') as client:
+        async def one(i: int) -> None:
+            async with semaphore:
+                response = await client.get(f'/api/channel/UC{i}')
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    await channel.youtube_service.aclose()
+    return total / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.05, help='가짜 API 응답 지연(초)')
+    parser.add_argument('--blocking', action='store_true', help='이벤트 루프를 막는 업스트림으로 측정')
+    args = parser.parse_args()
+
+    rps = asyncio.run(run(args.requests, args.concurrency, args.latency, args.blocking))
+    mode = 'blocking' if args.blocking else 'async'
+    print(f"{mode}: {args.requests} requests, concurrency {args.concurrency}, "
+          f"latency {args.latency * 1000:.0f}ms -> {rps:.1f} req/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+# 설정은 import 시점에 읽히므로 앱 모듈보다 먼저 테스트용 환경을 잡습니다.
+_workdir = tempfile.mkdtemp(prefix='youtube-analyzer-test-')
+os.environ.update({
+    'YOUTUBE_API_KEY': 'test',
+    'OPENAI_API_KEY': 'test',
+    'DATABASE_URL': f"sqlite:///{os.path.join(_workdir, 'test.db')}",
+    'SNAPSHOT_DIR': os.path.join(_workdir, 'snapshots'),
+    'REFRESH_ENABLED': 'false',
+})
+
+from app.services.analytics_service import AnalyticsService  # noqa: E402
+from app.services.cache_service import ResponseCache  # noqa: E402
+from app.services.fan_index import FanIndex  # noqa: E402
+from app.services.job_service import JobService  # noqa: E402
+from app.services.openai_service import OpenAIService  # noqa: E402
+from app.services.search_index import SearchIndex  # noqa: E402
+from app.services.snapshot_store import SnapshotStore  # noqa: E402
+from app.services.video_store import VideoStore  # noqa: E402
+from app.services.youtube_client import YouTubeClient  # noqa: E402
+from app.services.youtube_service import YouTubeService  # noqa: E402
+from benchmarks.fakes import FakeOpenAI, FakeYouTube  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """테스트마다 새로 만드는 메모리 DB (앱의 공유 연결과 같은 설정)."""
+    connection = sqlite3.connect(':memory:', check_same_thread=False, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def fake_youtube():
+    return FakeYouTube(channels=2, videos_per_channel=120, comments_per_video=5, replies_per_comment=2)
+
+
+@pytest.fixture
+def youtube_service(db, fake_youtube, tmp_path):
+    client = YouTubeClient(
+        api_key='test', transport=fake_youtube.transport(), requests_per_second=10_000, backoff_base=0.01
+    )
+    return YouTubeService(
+        client=client,
+        video_store=VideoStore(db),
+        fan_index=FanIndex(db),
+        snapshot_store=SnapshotStore(str(tmp_path / 'snapshots'), min_interval=0),
+        search_index=SearchIndex(db),
+    )
+
+
+@pytest.fixture
+def fake_openai():
+    return FakeOpenAI()
+
+
+@pytest.fixture
+def openai_service(db, fake_openai):
+    service = OpenAIService(
+        cache=ResponseCache(db, table='llm_cache'),
+        chart_cache=ResponseCache(db, table='chart_insights'),
+    )
+    service.client = fake_openai
+    return service
+
+
+@pytest.fixture
+def job_service(db, youtube_service, openai_service):
+    return JobService(youtube_service, openai_service, AnalyticsService(), connection=db)
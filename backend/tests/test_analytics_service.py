@@ -0,0 +1,150 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.analytics_service import AnalyticsService, parse_duration
+from app.services.openai_service import OpenAIService
+
+NOW = datetime(2024, 3, 31, tzinfo=timezone.utc)
+
+
+def video(n, published_at, views=1000, likes=50, comments=10, duration='PT5M', title='', width=None, height=None):
+    return {
+        'id': f'v{n}',
+        'title': title or f'영상 {n}',
+        'publishedAt': published_at,
+        'viewCount': str(views),
+        'likeCount': str(likes),
+        'commentCount': str(comments),
+        'duration': duration,
+        'width': width,
+        'height': height,
+    }
+
+
+@pytest.fixture
+def service():
+    return AnalyticsService()
+
+
+@pytest.mark.parametrize('duration, seconds', [
+    ('PT1H2M3S', 3723), ('PT45S', 45), ('P1DT1M', 86460), ('PT', 0), ('', 0), (None, 0), ('5 minutes', 0),
+])
+def test_parse_duration(duration, seconds):
+    assert parse_duration(duration) == seconds
+
+
+def test_engagement_excludes_zero_view_videos(service):
+    metrics = service.compute([
+        video(1, '2024-03-02T00:00:00Z', views=1000, likes=50, comments=10),
+        video(2, '2024-03-01T00:00:00Z', views=2000, likes=20, comments=20),
+        video(3, '2024-03-03T00:00:00Z', views=0, likes=0, comments=0),
+    ], now=NOW)['engagement']
+
+    assert metrics['likeRatio'] == pytest.approx((5 + 1) / 2)
+    assert metrics['commentRatio'] == pytest.approx((1 + 1) / 2)
+    assert metrics['totalEngagement'] == pytest.approx((6 + 2) / 2)
+    assert metrics['excludedCount'] == 1
+    # 게시일 순 (서울 시간 기준 날짜)
+    assert [row['title'] for row in metrics['trend']] == ['영상 2', '영상 1']
+    assert metrics['trend'][0]['date'] == '2024-03-01'
+
+
+def test_growth_compares_recent_window_with_older_videos(service):
+    metrics = service.compute([
+        video(1, '2024-03-20T00:00:00Z', views=3000, likes=300, comments=0),
+        video(2, '2024-01-10T00:00:00Z', views=1000, likes=50, comments=50),
+        video(3, '2024-01-05T00:00:00Z', views=1000, likes=50, comments=50),
+    ], now=NOW)['growth']
+
+    assert metrics['totalViews'] == 5000
+    assert metrics['avgViews'] == pytest.approx(5000 / 3)
+    assert metrics['recentCount'] == 1
+    assert metrics['viewGrowth'] == pytest.approx(200.0)
+    assert metrics['engagementGrowth'] == pytest.approx(0.0)
+
+
+def test_growth_is_none_without_older_videos(service):
+    metrics = service.compute([video(1, '2024-03-20T00:00:00Z')], now=NOW)['growth']
+
+    assert metrics['viewGrowth'] is None
+    assert metrics['engagementGrowth'] is None
+
+
+def test_upload_pattern_uses_analytics_timezone(service):
+    # 2024-03-03 15:30 UTC = 3월 4일(월) 00:30 서울
+    metrics = service.compute([
+        video(1, '2024-03-03T15:30:00Z'),
+        video(2, '2024-03-10T15:30:00Z'),
+        video(3, '2024-03-13T03:00:00Z'),
+    ], now=NOW)['upload']
+
+    assert metrics['topDay'] == '월'
+    assert metrics['topHour'] == 0
+    assert metrics['byDay'][1] == {'name': '월', 'count': 2}
+    assert metrics['uploadInterval'] == pytest.approx((7 + 2 + 11.5 / 24) / 2)
+
+
+def test_upload_pattern_of_empty_channel(service):
+    metrics = service.compute([], now=NOW)
+
+    assert metrics['upload']['topDay'] is None
+    assert metrics['upload']['uploadInterval'] is None
+    assert metrics['chartInputs']['upload']['upload_interval'] == 0
+
+
+def test_shorts_require_vertical_video(service):
+    categories = service.compute([
+        video(1, '2024-03-01T00:00:00Z', duration='PT30S', width=1080, height=1920),
+        video(2, '2024-03-01T00:00:00Z', duration='PT30S', width=1920, height=1080),
+        video(3, '2024-03-01T00:00:00Z', duration='PT30S'),
+        video(4, '2024-03-01T00:00:00Z', duration='PT2M', width=1080, height=1920),
+    ], now=NOW)['contentPerformance']['categories']
+
+    assert categories['shorts']['count'] == 1
+    assert categories['short']['count'] == 3
+    assert categories['short']['verticalCount'] == 1
+
+
+def test_duration_categories_and_best_category(service):
+    performance = service.compute([
+        video(1, '2024-03-01T00:00:00Z', duration='PT9M59S', views=100, likes=10, comments=0),
+        video(2, '2024-03-01T00:00:00Z', duration='PT10M', views=500),
+        video(3, '2024-03-01T00:00:00Z', duration='PT20M', views=300),
+        video(4, '2024-03-01T00:00:00Z', duration='PT1H', views=0),
+    ], now=NOW)['contentPerformance']
+
+    categories = performance['categories']
+    assert [categories[name]['count'] for name in ('shorts', 'short', 'medium', 'long')] == [0, 1, 1, 1]
+    assert categories['short']['avgEngagement'] == pytest.approx(0.1)
+    assert categories['medium']['avgDuration'] == 600
+    assert performance['bestCategory'] == 'medium'
+    assert performance['excludedCount'] == 1
+
+
+def test_title_lengths_and_keywords(service):
+    metrics = service.compute([
+        video(1, '2024-03-01T00:00:00Z', title='여행 브이로그', views=100),
+        video(2, '2024-03-01T00:00:00Z', title='제주 여행 브이로그 1일차 맛집 투어와 바다 풍경 가득', views=300),
+        video(3, '2024-03-01T00:00:00Z', title='A 요리', views=50),
+    ], now=NOW)['titles']
+
+    assert metrics['lengthPerformance']['short']['count'] == 2
+    assert metrics['lengthPerformance']['short']['avgViews'] == 75
+    assert metrics['lengthPerformance']['medium']['count'] == 1
+    keywords = {keyword['word']: keyword for keyword in metrics['topKeywords']}
+    assert keywords['여행'] == {'word': '여행', 'count': 2, 'totalViews': 400}
+    assert 'a' not in keywords
+    assert len(metrics['topKeywords']) == 5
+
+
+def test_chart_inputs_fill_every_prompt(service):
+    metrics = service.compute([
+        video(1, '2024-03-20T00:00:00Z', duration='PT30S', width=1080, height=1920),
+        video(2, '2024-01-10T00:00:00Z', duration='PT15M'),
+    ], now=NOW)
+
+    charts = metrics['chartInputs']
+    assert OpenAIService.chart_input_errors(charts) == {}
+    assert charts['engagement'] == {'like_ratio': 5.0, 'comment_ratio': 1.0, 'total_engagement': 6.0}
+    assert charts['content_performance']['shorts_views'] == 1000
@@ -0,0 +1,47 @@
+import asyncio
+
+ENGAGEMENT = {'like_ratio': 4.2, 'comment_ratio': 0.3, 'total_engagement': 4.5}
+
+
+def test_valid_charts_share_one_call(openai_service, fake_openai):
+    insights = asyncio.run(openai_service.analyze_charts({
+        'engagement': ENGAGEMENT,
+        'growth': {'total_views': 120000, 'avg_views': 4000, 'view_growth': 12.5},
+    }))
+
+    assert insights['engagement'] and insights['growth']
+    assert sum(fake_openai.calls.values()) == 1
+
+
+def test_invalid_chart_is_null_without_failing_batch(openai_service):
+    insights = asyncio.run(openai_service.analyze_charts({
+        'engagement': ENGAGEMENT,
+        'growth': {'total_views': 120000},
+        'unknown': {'value': 1},
+    }))
+
+    assert insights['engagement']
+    assert insights['growth'] is None
+    assert insights['unknown'] is None
+
+
+def test_only_invalid_charts_skip_llm(openai_service, fake_openai):
+    insights = asyncio.run(openai_service.analyze_charts({'engagement': {'like_ratio': 1}}))
+
+    assert insights == {'engagement': None}
+    assert sum(fake_openai.calls.values()) == 0
+
+
+def test_chart_input_errors(openai_service):
+    errors = openai_service.chart_input_errors({
+        'engagement': {'like_ratio': 1},
+        'growth': {'total_views': 1, 'avg_views': 1, 'view_growth': 1},
+        'core_fans': {
+            'total_core_fans': 1, 'top_fan_comments': 1, 'top_fan_likes': 1, 'top_fan_engagement': 1,
+            'avg_comments_per_fan': 'many', 'avg_engagement_rate': 1,
+        },
+        'unknown': {},
+    })
+
+    assert set(errors) == {'engagement', 'core_fans', 'unknown'}
+    assert 'comment_ratio' in errors['engagement']
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+
+COMMENTS = [f'영상 {n}번 정말 재미있어요 다음 편도 기대됩니다' for n in range(200)]
+
+
+@pytest.fixture(params=[True, False], ids=['prepass', 'llm-only'])
+def small_chunks(request, monkeypatch):
+    monkeypatch.setattr(settings, 'LLM_CHUNK_TOKENS', 500)
+    monkeypatch.setattr(settings, 'LLM_MAP_CONCURRENCY', 1)
+    monkeypatch.setattr(settings, 'LLM_LOCAL_PREPASS', request.param)
+
+
+def fail_call(fake_openai, failing_call):
+    create = fake_openai.create
+    count = {'n': 0}
+
+    async def flaky(model, messages, **kwargs):
+        count['n'] += 1
+        if count['n'] == failing_call:
+            raise RuntimeError('transient OpenAI error')
+        return await create(model, messages, **kwargs)
+
+    fake_openai.chat.completions.create = flaky
+
+
+def analyze(openai_service):
+    return asyncio.run(openai_service.analyze_comments(COMMENTS, video_id='v1', map_reduce=True))
+
+
+def test_partial_map_reduce_is_marked_and_not_cached(small_chunks, openai_service, fake_openai):
+    fail_call(fake_openai, failing_call=2)
+
+    result = analyze(openai_service)
+
+    assert result['partial'] is True
+    assert result['failedChunks'] == 1
+    calls = sum(fake_openai.calls.values())
+    # 다음 요청은 캐시가 아니라 다시 분석해 완전한 결과를 얻음
+    retried = analyze(openai_service)
+    assert 'partial' not in retried
+    assert sum(fake_openai.calls.values()) > calls
+
+
+def test_complete_map_reduce_is_cached(small_chunks, openai_service, fake_openai):
+    first = analyze(openai_service)
+    calls = sum(fake_openai.calls.values())
+
+    assert calls > 1
+    assert 'partial' not in first
+    assert analyze(openai_service) == first
+    assert sum(fake_openai.calls.values()) == calls
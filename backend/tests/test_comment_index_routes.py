@@ -0,0 +1,71 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import channel
+from app.main import app
+from app.services.youtube_client import YouTubeClient
+from benchmarks.fakes import FakeYouTube, channel_id
+
+CHANNEL = channel_id(0)
+
+
+@pytest.fixture
+def fake_youtube():
+    # 댓글이 하나도 없는 채널
+    return FakeYouTube(channels=1, videos_per_channel=3, comments_per_video=0)
+
+
+@pytest.fixture
+def client(fake_youtube, monkeypatch):
+    monkeypatch.setattr(channel.youtube_service, 'youtube', YouTubeClient(
+        api_key='routes', transport=fake_youtube.transport(), requests_per_second=10_000, backoff_base=0.01
+    ))
+    db = channel.job_service.db
+    db.execute("DELETE FROM comment_index_state WHERE channel_id = ?", (CHANNEL,))
+    db.execute("DELETE FROM jobs WHERE channel_id = ?", (CHANNEL,))
+    with TestClient(app) as client:
+        yield client
+
+
+def wait_for_job(client, job_id):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        job = client.get(f'/api/jobs/{job_id}').json()
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.02)
+    raise AssertionError('job did not finish')
+
+
+def test_cold_channel_is_indexed_by_job(client):
+    response = client.get(f'/api/channel/{CHANNEL}/core-fans')
+
+    assert response.status_code == 202
+    assert response.json()['status'] == 'indexing'
+    assert wait_for_job(client, response.json()['job']['id'])['status'] == 'done'
+
+    fans = client.get(f'/api/channel/{CHANNEL}/core-fans')
+    assert fans.status_code == 200
+    assert fans.json()['total'] == 0
+
+
+def test_empty_channel_is_not_recrawled(client, fake_youtube):
+    wait_for_job(client, client.get(f'/api/channel/{CHANNEL}/search', params={'q': '영상'}).json()['job']['id'])
+    fake_youtube.calls.clear()
+
+    for path, params in [('core-fans', {}), ('search', {'q': '영상'}), ('terms', {})]:
+        response = client.get(f'/api/channel/{CHANNEL}/{path}', params=params)
+        assert response.status_code == 200, path
+
+    assert sum(fake_youtube.calls.values()) == 0
+
+
+def test_refresh_submits_a_new_job(client):
+    wait_for_job(client, client.get(f'/api/channel/{CHANNEL}/core-fans').json()['job']['id'])
+
+    response = client.get(f'/api/channel/{CHANNEL}/core-fans', params={'refresh': True})
+
+    assert response.status_code == 202
+    wait_for_job(client, response.json()['job']['id'])
@@ -0,0 +1,69 @@
+import pytest
+
+from app.services.fan_index import FanIndex
+
+CHANNEL = 'UC-owner'
+
+
+@pytest.fixture
+def fan_index(db):
+    return FanIndex(db)
+
+
+def comment(comment_id, author='fan', video_id='v1', likes=0, published_at='2024-01-01T00:00:00Z'):
+    return {
+        'id': comment_id,
+        'author': author,
+        'authorChannelId': {'value': f'UC-{author}'},
+        'videoId': video_id,
+        'videoTitle': f'title {video_id}',
+        'text': f'comment {comment_id}',
+        'likeCount': likes,
+        'publishedAt': published_at,
+    }
+
+
+def fan(fan_index, author='fan'):
+    items = fan_index.top_fans(CHANNEL, min_comments=1)['items']
+    return next(item for item in items if item['author'] == author)
+
+
+def test_readding_comment_applies_like_delta(fan_index):
+    fan_index.add_comments(CHANNEL, [comment('c1', likes=5), comment('c2', likes=1)])
+
+    added = fan_index.add_comments(CHANNEL, [comment('c1', likes=8)])
+
+    assert added == 0
+    stats = fan(fan_index)
+    assert stats['commentCount'] == 2
+    assert stats['totalLikes'] == 9
+    likes = {item['id']: item['likeCount'] for item in fan_index.fan_comments(CHANNEL, 'UC-fan')}
+    assert likes == {'c1': 8, 'c2': 1}
+
+
+def test_like_delta_can_decrease(fan_index):
+    fan_index.add_comments(CHANNEL, [comment('c1', likes=5)])
+
+    fan_index.add_comments(CHANNEL, [comment('c1', likes=2)])
+
+    assert fan(fan_index)['totalLikes'] == 2
+
+
+def test_unchanged_comment_is_not_counted_twice(fan_index):
+    batch = [comment('c1', likes=3), comment('c2', video_id='v2', likes=4)]
+    fan_index.add_comments(CHANNEL, batch)
+
+    fan_index.add_comments(CHANNEL, batch)
+
+    stats = fan(fan_index)
+    assert stats['commentCount'] == 2
+    assert stats['totalLikes'] == 7
+    assert stats['uniqueVideos'] == 2
+
+
+def test_owner_comments_are_excluded(fan_index):
+    owner = comment('c1', author='owner')
+    owner['authorChannelId'] = {'value': CHANNEL}
+
+    assert fan_index.add_comments(CHANNEL, [owner, comment('c2')]) == 1
+    assert [item['author'] for item in fan_index.top_fans(CHANNEL, min_comments=1)['items']] == ['fan']
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from app.services.job_service import ACTIVE_STATUSES
+from benchmarks.fakes import channel_id
+
+CHANNEL = channel_id(0)
+
+
+async def run_job(job_service, channel):
+    await job_service.start()
+    try:
+        job = await job_service.submit(channel, analyze=False)
+        while job['status'] in ACTIVE_STATUSES:
+            await asyncio.sleep(0.01)
+            job = job_service.get(job['id'])
+        return job
+    finally:
+        await job_service.stop()
+
+
+def test_submit_before_start_leaves_no_job(job_service, db):
+    with pytest.raises(RuntimeError):
+        asyncio.run(job_service.submit(CHANNEL))
+
+    assert db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 0
+
+
+def test_job_crawls_channel_and_records_quota(job_service):
+    job = asyncio.run(run_job(job_service, CHANNEL))
+
+    assert job['status'] == 'done'
+    assert job['progress']['videos'] == 120
+    assert job['progress']['quotaUnits'] > 0
+
+
+def test_job_indexes_video_titles(job_service, youtube_service):
+    asyncio.run(run_job(job_service, CHANNEL))
+
+    assert youtube_service.search_index.has_channel(CHANNEL, 'video')
+    assert youtube_service.search_index.has_channel(CHANNEL, 'comment')
@@ -0,0 +1,143 @@
+import asyncio
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.services.analytics_service import AnalyticsService
+from app.services.refresh_scheduler import DAY, RefreshScheduler
+from benchmarks.fakes import channel_id
+
+BIG, SMALL = channel_id(0), channel_id(1)
+
+
+@pytest.fixture
+def scheduler(db, youtube_service, openai_service):
+    # 종일 창 + 하루 주기: 창 안 어느 시각이든 하루 예산 전체를 쓸 수 있음
+    return RefreshScheduler(
+        youtube_service, openai_service, AnalyticsService(), daily_quota=1000, window=(0, 0), interval=DAY,
+        connection=db,
+    )
+
+
+def track(scheduler, channel, accesses=0, last_cost=None):
+    scheduler.track(channel)
+    for _ in range(accesses):
+        scheduler.record_access(channel)
+    if last_cost is not None:
+        scheduler.db.execute("UPDATE tracked_channels SET last_cost = ? WHERE channel_id = ?", (last_cost, channel))
+
+
+def run_once(scheduler, now=None):
+    return asyncio.run(scheduler.run_once(now))
+
+
+def test_channel_over_daily_quota_does_not_starve_others(scheduler):
+    track(scheduler, BIG, accesses=5, last_cost=5000)
+    track(scheduler, SMALL)
+
+    runs = run_once(scheduler)
+
+    assert scheduler.get(BIG)['overBudget']
+    assert [run['channelId'] for run in runs] == [SMALL]
+    assert runs[0]['status'] == 'done'
+
+
+def test_top_channel_within_quota_holds_back_cheaper_ones(scheduler):
+    track(scheduler, BIG, accesses=5, last_cost=900)
+    track(scheduler, SMALL)
+    scheduler.db.execute(
+        "INSERT INTO refresh_runs (channel_id, job_id, status, quota_units, started_at, finished_at) "
+        "VALUES ('other', NULL, 'done', 200, ?, ?)", (time.time(), time.time()),
+    )
+
+    assert run_once(scheduler) == []
+    assert scheduler.get(SMALL)['lastAttempt'] is None
+
+
+def test_spent_units_reduce_available_budget(scheduler):
+    track(scheduler, SMALL)
+
+    runs = run_once(scheduler)
+
+    budget = scheduler.budget()
+    assert runs[0]['quotaUnits'] > 0
+    assert budget['spent'] == runs[0]['quotaUnits']
+    assert budget['available'] == 1000 - runs[0]['quotaUnits']
+    # 실제 사용량이 다음 예상치가 됨
+    assert scheduler.get(SMALL)['estimatedCost'] == runs[0]['quotaUnits']
+
+
+def test_refreshed_channel_is_not_due_again(scheduler):
+    track(scheduler, SMALL)
+    run_once(scheduler)
+
+    assert not scheduler.get(SMALL)['due']
+    assert run_once(scheduler) == []
+
+
+def test_no_refresh_outside_window(scheduler):
+    hour = datetime.now(ZoneInfo('Asia/Seoul')).hour
+    scheduler.window_start, scheduler.window_end = (hour + 2) % 24, (hour + 3) % 24
+    track(scheduler, SMALL)
+
+    assert scheduler.budget()['available'] == 0
+    assert run_once(scheduler) == []
+
+
+def test_estimate_from_stored_videos(scheduler, youtube_service, fake_youtube):
+    asyncio.run(youtube_service.sync_channel_videos(SMALL))
+    track(scheduler, SMALL)
+
+    # 채널 정보 1 + 새 업로드 확인 1 + 비디오 120개 통계 3
+    assert scheduler.get(SMALL)['estimatedCost'] == 2 + 3
+
+
+def test_refresh_syncs_incrementally_and_warms_insights(scheduler, youtube_service, fake_youtube, fake_openai):
+    track(scheduler, SMALL)
+    run_once(scheduler)
+    fake_youtube.calls.clear()
+    fake_openai.calls.clear()
+
+    run = asyncio.run(scheduler.refresh(SMALL))
+
+    assert run['status'] == 'done'
+    assert fake_youtube.calls['playlistItems'] == 1
+    assert fake_youtube.calls['videos'] == 3
+    assert fake_youtube.calls['commentThreads'] == 0
+    # 비디오가 그대로면 차트 입력도 같아 인사이트는 캐시에서 나옴
+    assert sum(fake_openai.calls.values()) == 0
+    assert run['quotaUnits'] <= scheduler.get(SMALL)['estimatedCost']
+
+
+def test_recent_window_refresh_extends_sync_max_age(scheduler):
+    track(scheduler, SMALL)
+    now = time.time()
+    start = scheduler._window_start(now)
+
+    assert scheduler.sync_max_age(SMALL, 60, now) == 60
+    scheduler.db.execute("UPDATE tracked_channels SET last_refreshed = ? WHERE channel_id = ?", (start + 1, SMALL))
+    assert scheduler.sync_max_age(SMALL, 60, now) == max(60, now - start)
+    # 다음 창이 시작되면 다시 기본값
+    assert scheduler.sync_max_age(SMALL, 60, now + DAY) == 60
+    scheduler.untrack(SMALL)
+    assert scheduler.sync_max_age(SMALL, 60, now) == 60
+
+
+def test_start_refresh_returns_channel_and_records_run_when_done(scheduler, db):
+    track(scheduler, SMALL)
+
+    async def run():
+        channel = scheduler.start_refresh(SMALL)
+        recorded_before = db.execute("SELECT COUNT(*) FROM refresh_runs").fetchone()[0]
+        await asyncio.gather(*scheduler._pending)
+        return channel, recorded_before
+
+    channel, recorded_before = asyncio.run(run())
+
+    assert channel['lastAttempt'] is not None
+    assert recorded_before == 0
+    row = db.execute("SELECT status, quota_units FROM refresh_runs").fetchone()
+    assert row['status'] == 'done'
+    assert scheduler.get(SMALL)['lastRefreshed'] >= channel['lastAttempt']
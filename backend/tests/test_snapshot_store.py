@@ -0,0 +1,94 @@
+import asyncio
+import os
+import threading
+from array import array
+
+import pytest
+
+from app.services.snapshot_store import SnapshotStore
+
+CHANNEL = 'UCsnapshot'
+TS = 1_700_000_000  # 2023-11-14 UTC
+DAY = '2023-11-14'
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path), min_interval=0)
+
+
+def channel(subscribers):
+    return {'id': CHANNEL, 'subscriberCount': str(subscribers), 'viewCount': '10', 'videoCount': '1'}
+
+
+def column(store, name, typecode='q'):
+    with open(os.path.join(store.root, CHANNEL, 'channel', DAY, f'{name}.bin'), 'rb') as f:
+        return array(typecode, f.read()).tolist()
+
+
+def test_append_realigns_columns_after_interrupted_write(store):
+    store.record_channel(channel(100), ts=TS)
+    # ts 열만 기록되고 나머지 열은 쓰기 전에 중단된 상태
+    with open(os.path.join(store.root, CHANNEL, 'channel', DAY, 'ts.bin'), 'ab') as f:
+        array('q', [TS + 60]).tofile(f)
+        f.write(b'\x01\x02')
+
+    store.record_channel(channel(200), ts=TS + 120)
+
+    assert column(store, 'ts') == [TS, TS + 120]
+    assert column(store, 'subscribers') == [100, 200]
+    history = store.channel_history(CHANNEL, TS, TS + 3600, bucket_seconds=60)
+    assert [point['subscribers'] for point in history] == [100, 200]
+
+
+def test_last_timestamp_ignores_partial_row(tmp_path):
+    store = SnapshotStore(str(tmp_path), min_interval=3600)
+    store.record_channel(channel(100), ts=TS)
+    with open(os.path.join(store.root, CHANNEL, 'channel', DAY, 'ts.bin'), 'ab') as f:
+        array('q', [TS + 7200]).tofile(f)
+
+    reopened = SnapshotStore(str(tmp_path), min_interval=3600)
+
+    assert reopened.record_channel(channel(200), ts=TS + 3600)
+    assert column(reopened, 'subscribers') == [100, 200]
+
+
+def videos(views_by_id):
+    return [{'id': video_id, 'viewCount': str(views), 'likeCount': '1', 'commentCount': '2'}
+            for video_id, views in views_by_id.items()]
+
+
+def test_channel_history_keeps_last_value_per_bucket(store):
+    for minute, subscribers in [(0, 100), (10, 110), (59, 120), (60, 130), (185, 150)]:
+        store.record_channel(channel(subscribers), ts=TS - TS % 3600 + minute * 60)
+
+    history = store.channel_history(CHANNEL, TS - 3600, TS + 6 * 3600, bucket_seconds=3600)
+
+    assert [point['subscribers'] for point in history] == [120, 130, 150]
+    assert history[1]['delta']['subscribers'] == 10
+
+
+def test_video_history_sums_latest_value_per_video(store):
+    hour = TS - TS % 3600
+    store.record_videos(CHANNEL, videos({'a': 10, 'b': 20}), ts=hour)
+    store.record_videos(CHANNEL, videos({'a': 15}), ts=hour + 60)
+    store.record_videos(CHANNEL, videos({'a': 30, 'b': 40, 'c': 5}), ts=hour + 3600)
+
+    history = store.video_history(CHANNEL, hour, hour + 7200, bucket_seconds=3600)
+    single = store.video_history(CHANNEL, hour, hour + 7200, bucket_seconds=3600, video_id='b')
+
+    assert [(point['views'], point['videoCount']) for point in history] == [(35, 2), (75, 3)]
+    assert history[0]['comments'] == 4
+    assert [point['views'] for point in single] == [20, 40]
+    assert store.video_history(CHANNEL, hour, hour + 7200, bucket_seconds=3600, video_id='zzz') == []
+
+
+def test_record_snapshot_writes_off_the_event_loop(youtube_service, monkeypatch):
+    threads = []
+    record = youtube_service.snapshot_store.record_channel
+    monkeypatch.setattr(youtube_service.snapshot_store, 'record_channel',
+                        lambda *args: threads.append(threading.current_thread()) or record(*args))
+
+    asyncio.run(youtube_service.record_snapshot(channel(100)))
+
+    assert threads and threads[0] is not threading.main_thread()
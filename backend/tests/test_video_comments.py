@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fakes import FakeYouTube, channel_id
+
+
+@pytest.fixture
+def fake_youtube():
+    # 스레드마다 답글 3개 중 1개만 포함되어 나머지는 comments().list 로 조회해야 함
+    return FakeYouTube(channels=1, videos_per_channel=1, comments_per_video=60, replies_per_comment=3)
+
+
+def fetch(youtube_service, fake_youtube, **limits):
+    report = {}
+    comments = asyncio.run(youtube_service.get_video_comments(
+        fake_youtube.video_id(0, 0), report=report, **{'max_pages': 0, 'time_budget': 0, **limits}
+    ))
+    return comments, report
+
+
+def test_max_comments_stops_reply_fetches(youtube_service, fake_youtube):
+    comments, report = fetch(youtube_service, fake_youtube, max_comments=10)
+
+    assert len(comments) == 10
+    assert fake_youtube.calls['commentThreads'] == 1
+    # 한도를 채우는 데 필요한 스레드의 답글만 조회
+    assert fake_youtube.calls['comments'] <= 3
+
+
+def test_skipped_is_reported_on_last_page(youtube_service, fake_youtube):
+    comments, report = fetch(youtube_service, fake_youtube, max_comments=10)
+
+    assert report['fetched'] == 10
+    assert report['stopped'] == 'max_comments'
+    assert report['skipped'] == 60 * 4 - 10
+
+
+def test_unlimited_fetch_collects_all_replies(youtube_service, fake_youtube):
+    comments, report = fetch(youtube_service, fake_youtube, max_comments=0)
+
+    assert len(comments) == 60 * 4
+    assert len({comment['id'] for comment in comments}) == 60 * 4
+    assert report['skipped'] == 0
+    assert report['stopped'] is None
+
+
+def test_max_pages_reports_skipped(youtube_service, fake_youtube):
+    fake_youtube.comments_per_video = 250
+
+    comments, report = fetch(youtube_service, fake_youtube, max_comments=0, max_pages=1)
+
+    assert fake_youtube.calls['commentThreads'] == 1
+    assert len(comments) == 100 * 4
+    assert report['stopped'] == 'max_pages'
+    assert report['skipped'] == 250 * 4 - 400
+
+
+def test_exhausted_time_budget_skips_reply_fetches(youtube_service, fake_youtube):
+    comments, report = fetch(youtube_service, fake_youtube, max_comments=0, time_budget=1e-9)
+
+    assert fake_youtube.calls['comments'] == 0
+    # 스레드에 포함된 답글까지는 그대로 반환
+    assert len(comments) == 60 * 2
+    assert report['skipped'] == 60 * 4 - 120
+
+
+def test_skipped_uses_callers_comment_count(youtube_service, fake_youtube):
+    report = {}
+    asyncio.run(youtube_service.get_video_comments(
+        fake_youtube.video_id(0, 0), max_comments=10, max_pages=0, time_budget=0, report=report,
+        comment_count=500,
+    ))
+
+    assert fake_youtube.calls['videos'] == 0
+    assert report['skipped'] == 490
+
+
+def test_capped_fetch_without_report_skips_stats_call(youtube_service, fake_youtube):
+    comments = asyncio.run(youtube_service.get_video_comments(
+        fake_youtube.video_id(0, 0), max_comments=10, max_pages=0, time_budget=0,
+    ))
+
+    assert len(comments) == 10
+    assert fake_youtube.calls['videos'] == 0
+
+
+def test_channel_fan_out_does_not_fetch_video_stats_per_video(youtube_service, fake_youtube, monkeypatch):
+    monkeypatch.setattr('app.services.youtube_service.settings.COMMENT_MAX_PER_VIDEO', 10)
+
+    async def collect():
+        return [page async for page in youtube_service.iter_channel_comments(channel_id(0))]
+
+    pages = asyncio.run(collect())
+
+    assert sum(len(page) for page in pages) == 10
+    # 채널 비디오 목록의 통계 조회(50개 단위 1회)만 발생
+    assert fake_youtube.calls['videos'] == 1
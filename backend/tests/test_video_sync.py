@@ -0,0 +1,97 @@
+import asyncio
+
+from benchmarks.fakes import channel_id
+
+CHANNEL = channel_id(0)
+
+
+def sync(youtube_service):
+    return asyncio.run(youtube_service.sync_channel_videos(CHANNEL))
+
+
+def test_first_sync_walks_whole_playlist(youtube_service, fake_youtube):
+    videos = sync(youtube_service)
+
+    assert len(videos) == 120
+    assert fake_youtube.calls['playlistItems'] == 3
+    assert youtube_service.video_store.get_synced_at(CHANNEL) is not None
+
+
+def test_incremental_sync_stops_at_known_video(youtube_service, fake_youtube):
+    fake_youtube.upcoming = 3
+    sync(youtube_service)
+    fake_youtube.calls.clear()
+
+    fake_youtube.upcoming = 0
+    videos = sync(youtube_service)
+
+    # 첫 페이지에서 이미 알고 있는 비디오를 만나 멈춤
+    assert fake_youtube.calls['playlistItems'] == 1
+    assert [video['id'] for video in videos[:3]] == [fake_youtube.video_id(0, n) for n in range(3)]
+    assert len(videos) == 120
+
+
+def test_incremental_sync_refreshes_known_video_stats(youtube_service, fake_youtube):
+    sync(youtube_service)
+    fake_youtube.calls.clear()
+    video_id = fake_youtube.video_id(0, 5)
+    fake_youtube.stat_overrides[video_id] = {'viewCount': '999999', 'likeCount': '4242'}
+
+    videos = {video['id']: video for video in sync(youtube_service)}
+
+    assert videos[video_id]['viewCount'] == '999999'
+    assert videos[video_id]['likeCount'] == '4242'
+    # 통계는 50개 단위로 묶어서 갱신
+    assert fake_youtube.calls['videos'] == 3
+
+
+def test_incremental_sync_drops_removed_videos(youtube_service, fake_youtube):
+    sync(youtube_service)
+    fake_youtube.videos_per_channel = 100
+
+    videos = sync(youtube_service)
+
+    assert len(videos) == 100
+    assert fake_youtube.video_id(0, 119) not in {video['id'] for video in videos}
+
+
+def test_interrupted_crawl_falls_back_to_full_sync(youtube_service, fake_youtube):
+    # 동기화 완료 표시 없이 일부만 저장된 상태 (중단된 수집 작업)
+    youtube_service.video_store.add_videos(CHANNEL, [{'id': fake_youtube.video_id(0, 0), 'publishedAt': ''}])
+
+    videos = sync(youtube_service)
+
+    assert fake_youtube.calls['playlistItems'] == 3
+    assert len(videos) == 120
+
+
+def test_recent_sync_is_served_from_store(youtube_service, fake_youtube):
+    sync(youtube_service)
+    fake_youtube.calls.clear()
+
+    videos = asyncio.run(youtube_service.get_channel_videos(CHANNEL, incremental=True, max_age=60))
+
+    assert len(videos) == 120
+    assert sum(fake_youtube.calls.values()) == 0
+
+
+def test_stale_sync_is_refreshed(youtube_service, fake_youtube):
+    sync(youtube_service)
+    fake_youtube.calls.clear()
+    youtube_service.video_store.db.execute("UPDATE channel_sync SET synced_at = synced_at - 3600")
+
+    asyncio.run(youtube_service.get_channel_videos(CHANNEL, incremental=True, max_age=60))
+
+    assert fake_youtube.calls['playlistItems'] == 1
+
+
+def test_listing_videos_does_not_write_search_index(youtube_service):
+    asyncio.run(youtube_service.get_channel_videos(CHANNEL))
+
+    assert not youtube_service.search_index.has_channel(CHANNEL, 'video')
+
+
+def test_sync_indexes_new_video_titles(youtube_service):
+    sync(youtube_service)
+
+    assert youtube_service.search_index.has_channel(CHANNEL, 'video')
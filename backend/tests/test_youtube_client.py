@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.youtube_client import YouTubeAPIError, YouTubeClient
+
+
+def error_transport(reason, calls):
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(403, json={'error': {'message': reason, 'errors': [{'reason': reason}]}})
+    return httpx.MockTransport(handler)
+
+
+def get(client):
+    async def run():
+        try:
+            return await client.get('channels', cache_ttl=0, id='UC1')
+        finally:
+            await client.aclose()
+    return asyncio.run(run())
+
+
+def test_daily_quota_error_fails_fast():
+    calls = []
+    client = YouTubeClient(api_key='quota', transport=error_transport('quotaExceeded', calls),
+                           requests_per_second=10_000, backoff_base=0.001)
+
+    with pytest.raises(YouTubeAPIError) as error:
+        get(client)
+
+    assert error.value.reason == 'quotaExceeded'
+    assert len(calls) == 1
+
+
+def test_rate_limit_error_is_retried():
+    calls = []
+    client = YouTubeClient(api_key='rate', transport=error_transport('rateLimitExceeded', calls),
+                           requests_per_second=10_000, max_retries=2, backoff_base=0.001)
+
+    with pytest.raises(YouTubeAPIError):
+        get(client)
+
+    assert len(calls) == 3
+
+
+def test_bucket_is_shared_per_key_and_rate():
+    slow = YouTubeClient(api_key='shared', requests_per_second=5)
+    fast = YouTubeClient(api_key='shared', requests_per_second=10_000)
+    slow_again = YouTubeClient(api_key='shared', requests_per_second=5)
+
+    assert slow.bucket is slow_again.bucket
+    assert fast.bucket is not slow.bucket
+    assert fast.bucket.rate == 10_000
@@ -1,24 +1,21 @@
-import { getVideoComments, getChannelComments } from '@/lib/api';
+import { getCoreFans, getCoreFanComments, getJob } from '@/lib/api';
 import { useEffect, useState } from 'react';
 
 interface Comment {
-  author: string;
+  id: string;
   text: string;
   publishedAt: string;
   likeCount: number;
   videoId: string;
   videoTitle: string;
-  videoPublishedAt: string;
-  authorChannelId?: {
-    value: string;
-  };
 }
 
+// 서버의 핵심 팬 색인(/core-fans)이 집계한 팬 통계
 interface CoreFan {
+  authorChannelId: string;
   author: string;
   commentCount: number;
   totalLikes: number;
-  comments: Comment[];
   uniqueVideos: number;
   lastComment: string;
   firstActivityDate: string;
@@ -32,18 +29,44 @@ interface CoreFansAnalysisProps {
 }
 
 interface FanCommentsModalProps {
+  channelId: string;
   fan: CoreFan;
   onClose: () => void;
 }
 
-function FanCommentsModal({ fan, onClose }: FanCommentsModalProps) {
+const FAN_COMMENTS_PAGE_SIZE = 20;
+// 댓글 색인 작업 완료를 확인하는 간격 (ms)
+const INDEX_POLL_INTERVAL = 2000;
+
+function FanCommentsModal({ channelId, fan, onClose }: FanCommentsModalProps) {
+  const [comments, setComments] = useState<Comment[]>([]);
+  const [isLoading, setIsLoading] = useState(false);
+
+  // 팬의 댓글은 모달을 열 때 최신순으로 한 페이지씩 가져옵니다.
+  const loadMore = async (offset: number) => {
+    try {
+      setIsLoading(true);
+      const page: Comment[] = await getCoreFanComments(channelId, fan.authorChannelId, offset);
+      setComments(prev => (offset === 0 ? page : [...prev, ...page]));
+    } catch (err) {
+      console.error(err);
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
+  useEffect(() => {
+    loadMore(0);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [channelId, fan.authorChannelId]);
+
   return (
     <div className="fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center z-50">
       <div className="bg-white rounded-lg w-full max-w-3xl max-h-[80vh] overflow-hidden">
         <div className="p-6 border-b">
           <div className="flex justify-between items-center">
             <h3 className="text-xl font-semibold">
-              {fan.author}님의 모든 댓글 ({fan.comments.length}개)
+              {fan.author}님의 모든 댓글 ({fan.commentCount}개)
             </h3>
             <button
               onClick={onClose}
@@ -56,10 +79,8 @@ function FanCommentsModal({ fan, onClose }: FanCommentsModalProps) {
           </div>
         </div>
         <div className="p-6 overflow-y-auto max-h-[calc(80vh-120px)]">
-          {fan.comments.sort((a, b) => 
-            new Date(b.publishedAt).getTime() - new Date(a.publishedAt).getTime()
-          ).map((comment, index) => (
-            <div key={index} className="mb-6 last:mb-0">
+          {comments.map((comment) => (
+            <div key={comment.id} className="mb-6 last:mb-0">
               <div className="flex justify-between items-start mb-2">
                 <div>
                   <h4 className="font-medium text-blue-600 hover:underline">
@@ -87,95 +108,70 @@ function FanCommentsModal({ fan, onClose }: FanCommentsModalProps) {
               <p className="text-gray-700 bg-gray-50 p-3 rounded-lg">{comment.text}</p>
             </div>
           ))}
+          {isLoading && <p className="text-sm text-gray-500">불러오는 중...</p>}
+          {!isLoading && comments.length < fan.commentCount && comments.length % FAN_COMMENTS_PAGE_SIZE === 0 && (
+            <button
+              onClick={() => loadMore(comments.length)}
+              className="mt-2 text-sm text-blue-600 hover:text-blue-800 font-medium"
+            >
+              더 보기
+            </button>
+          )}
         </div>
       </div>
     </div>
   );
 }
 
-export default function CoreFansAnalysis({ channelId, channelTitle }: CoreFansAnalysisProps) {
-  const [comments, setComments] = useState<Comment[]>([]);
+export default function CoreFansAnalysis({ channelId }: CoreFansAnalysisProps) {
   const [coreFans, setCoreFans] = useState<CoreFan[]>([]);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [selectedFan, setSelectedFan] = useState<CoreFan | null>(null);
 
   useEffect(() => {
-    const fetchComments = async () => {
+    let cancelled = false;
+
+    // 팬 집계는 서버 색인에서 계산하므로 채널 전체 댓글을 내려받지 않습니다.
+    // (채널 주인의 댓글은 서버에서 제외)
+    // 아직 색인되지 않은 채널은 서버가 수집 작업을 돌려주므로(202) 끝날 때까지 기다린 뒤 다시 요청합니다.
+    const fetchCoreFans = async () => {
       try {
         setIsLoading(true);
-        const channelComments: Comment[] = await getChannelComments(channelId);
-        
-        // 채널 주인의 댓글 제외
-        const filteredComments = channelComments.filter((comment: Comment) => 
-          comment.author.toLowerCase() !== channelTitle.toLowerCase() &&
-          !comment.authorChannelId?.value?.includes(channelId)
-        );
-
-        setComments(filteredComments);
-        
-        // 팬 분석 로직
-        const fansMap = new Map<string, {
-          commentCount: number;
-          totalLikes: number;
-          comments: Comment[];
-          videoIds: Set<string>;
-        }>();
-
-        filteredComments.forEach(comment => {
-          const fanData = fansMap.get(comment.author) || {
-            commentCount: 0,
-            totalLikes: 0,
-            comments: [],
-            videoIds: new Set()
-          };
-
-          fanData.commentCount += 1;
-          fanData.totalLikes += comment.likeCount;
-          fanData.comments.push(comment);
-          fanData.videoIds.add(comment.videoId);
-
-          fansMap.set(comment.author, fanData);
-        });
-
-        // 핵심 팬 선별 (날짜 정렬 로직 추가)
-        const coreFansData = Array.from(fansMap.entries())
-          .map(([author, data]) => {
-            // 댓글을 날짜순으로 정렬
-            const sortedComments = data.comments.sort((a, b) => 
-              new Date(a.publishedAt).getTime() - new Date(b.publishedAt).getTime()
-            );
-
-            return {
-              author,
-              commentCount: data.commentCount,
-              totalLikes: data.totalLikes,
-              comments: sortedComments,
-              uniqueVideos: data.videoIds.size,
-              lastComment: sortedComments[sortedComments.length - 1].text,
-              firstActivityDate: sortedComments[0].publishedAt,
-              lastActivityDate: sortedComments[sortedComments.length - 1].publishedAt,
-              engagementRate: data.videoIds.size / channelComments.length
-            };
-          })
-          .filter(fan => fan.commentCount >= 3)
-          .sort((a, b) => b.commentCount - a.commentCount)
-          .slice(0, 10);
-
-        setCoreFans(coreFansData);
-        
+        let response = await getCoreFans(channelId, { limit: 10, min_comments: 3 });
+        while (response.job && !cancelled) {
+          let job = response.job;
+          while (job.status !== 'done' && job.status !== 'failed' && !cancelled) {
+            await new Promise(resolve => setTimeout(resolve, INDEX_POLL_INTERVAL));
+            job = await getJob(job.id);
+          }
+          if (job.status === 'failed') {
+            throw new Error(job.error || 'Comment indexing failed');
+          }
+          response = await getCoreFans(channelId, { limit: 10, min_comments: 3 });
+        }
+        if (!cancelled) {
+          setCoreFans(response.items);
+        }
       } catch (err) {
-        setError('댓글을 불러오는데 실패했습니다.');
+        if (!cancelled) {
+          setError('댓글을 불러오는데 실패했습니다.');
+        }
         console.error(err);
       } finally {
-        setIsLoading(false);
+        if (!cancelled) {
+          setIsLoading(false);
+        }
       }
     };
 
     if (channelId) {
-      fetchComments();
+      fetchCoreFans();
     }
-  }, [channelId, channelTitle]);
+    return () => {
+      cancelled = true;
+    };
+  }, [channelId]);
 
   if (isLoading) {
     return (
@@ -203,7 +199,7 @@ export default function CoreFansAnalysis({ channelId, channelTitle }: CoreFansAn
       <h2 className="text-lg font-semibold mb-4">핵심 팬 분석</h2>
       <div className="space-y-6">
         {coreFans.map((fan, index) => (
-          <div key={fan.author} className="border-b last:border-b-0 pb-4">
+          <div key={fan.authorChannelId} className="border-b last:border-b-0 pb-4">
             <div className="flex items-start justify-between">
               <div>
                 <div className="flex items-center space-x-2">
@@ -246,6 +242,7 @@ export default function CoreFansAnalysis({ channelId, channelTitle }: CoreFansAn
 
       {selectedFan && (
         <FanCommentsModal
+          channelId={channelId}
           fan={selectedFan}
           onClose={() => setSelectedFan(null)}
         />
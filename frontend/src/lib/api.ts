@@ -44,10 +44,20 @@ export const analyzeVideoComments = async (videoId: string) => {
   }
 };
 
+// compact 응답은 비디오 정보를 videos 에 한 번만 싣고 댓글은 videoId 로 참조하므로
+// 기존 컴포넌트가 쓰는 형태(videoTitle/videoPublishedAt 포함)로 다시 펼쳐서 반환합니다.
 export const getChannelComments = async (channelId: string) => {
   try {
-    const response = await api.get(`/channel/${channelId}/comments`);
-    return response.data;
+    const response = await api.get(`/channel/${channelId}/comments`, {
+      params: { compact: true }
+    });
+    const { videos, comments } = response.data;
+    return comments.map((comment: any) => ({
+      ...comment,
+      videoTitle: videos[comment.videoId]?.title,
+      videoPublishedAt: videos[comment.videoId]?.publishedAt,
+      authorChannelId: comment.authorChannelId ? { value: comment.authorChannelId } : undefined,
+    }));
   } catch (error) {
     console.error('Error fetching channel comments:', error);
     throw error;
@@ -66,3 +76,134 @@ export const getChartAnalysis = async (chartType: string, data: any) => {
     throw error;
   }
 };
+
+// NDJSON 스트리밍 엔드포인트를 읽으며 도착한 항목들을 onItems 로 전달합니다.
+const streamNdjson = async (path: string, onItems: (items: any[]) => void) => {
+  const response = await fetch(`${api.defaults.baseURL}${path}`);
+  if (!response.ok || !response.body) {
+    throw new Error(`Stream request failed: ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop() || '';
+    const items = lines.filter(line => line.trim()).map(line => JSON.parse(line));
+    const error = items.find(item => item.error);
+    if (error) throw new Error(error.error);
+    if (items.length) onItems(items);
+  }
+};
+
+export const streamChannelVideos = (channelId: string, onVideos: (videos: any[]) => void) =>
+  streamNdjson(`/channel/${channelId}/videos/stream`, onVideos);
+
+export const streamChannelComments = (channelId: string, onComments: (comments: any[]) => void) =>
+  streamNdjson(`/channel/${channelId}/comments/stream`, onComments);
+
+export const getChannelMetrics = async (channelId: string) => {
+  try {
+    const response = await api.get(`/channel/${channelId}/metrics`);
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching channel metrics:', error);
+    throw error;
+  }
+};
+
+// 핵심 팬/검색/용어 API 는 채널 댓글이 아직 색인되지 않았으면 202 와 함께
+// { status: 'indexing', job } 을 돌려줍니다. getJob 으로 작업이 끝난 뒤 다시 요청하세요.
+export const getCoreFans = async (
+  channelId: string,
+  params: { limit?: number; offset?: number; sort?: string; min_comments?: number } = {}
+) => {
+  try {
+    const response = await api.get(`/channel/${channelId}/core-fans`, { params });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching core fans:', error);
+    throw error;
+  }
+};
+
+export const getCoreFanComments = async (channelId: string, authorChannelId: string, offset = 0) => {
+  try {
+    // 채널 ID 가 없는 작성자는 'name:<표시 이름>' 키를 쓰므로 경로에 넣기 전에 인코딩
+    const response = await api.get(`/channel/${channelId}/core-fans/${encodeURIComponent(authorChannelId)}/comments`, {
+      params: { offset }
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching core fan comments:', error);
+    throw error;
+  }
+};
+
+export const searchChannel = async (
+  channelId: string,
+  q: string,
+  options: { kind?: 'comment' | 'video'; limit?: number; offset?: number } = {}
+) => {
+  try {
+    const response = await api.get(`/channel/${channelId}/search`, {
+      params: { q, ...options }
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Error searching channel:', error);
+    throw error;
+  }
+};
+
+export const getTopTerms = async (
+  channelId: string,
+  kind: 'comment' | 'video' = 'comment',
+  limit = 20,
+  offset = 0
+) => {
+  try {
+    const response = await api.get(`/channel/${channelId}/terms`, {
+      params: { kind, limit, offset }
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching top terms:', error);
+    throw error;
+  }
+};
+
+export const getChannelInsights = async (channelId: string) => {
+  try {
+    const response = await api.get(`/channel/${channelId}/insights`);
+    return response.data.insights;
+  } catch (error) {
+    console.error('Error getting channel insights:', error);
+    throw error;
+  }
+};
+
+export const submitIngestJob = async (channelId: string, analyze = true) => {
+  try {
+    const response = await api.post(`/channel/${channelId}/ingest`, null, { params: { analyze } });
+    return response.data;
+  } catch (error) {
+    console.error('Error submitting ingest job:', error);
+    throw error;
+  }
+};
+
+export const getJob = async (jobId: string) => {
+  try {
+    const response = await api.get(`/jobs/${jobId}`);
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching job:', error);
+    throw error;
+  }
+};